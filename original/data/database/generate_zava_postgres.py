@@ -19,13 +19,23 @@ FEATURES:
 - Product description embeddings population from product_data.json
 - Vector similarity indexing with pgvector
 - Performance-optimized indexes
+- Embeddings streamed with binary COPY (pgvector codec, NumPy float32 arrays)
+- Binary COPY bulk loading with per-table timing report
+- Optional monthly / yearly range partitioning of orders and order_items
 - Comprehensive statistics and verification
 
 USAGE:
     python generate_zava_postgres.py                     # Generate complete database
     python generate_zava_postgres.py --show-stats        # Show database statistics
+    python generate_zava_postgres.py --show-stats --json > stats.json  # Diagnostics as JSON for diffing
     python generate_zava_postgres.py --embeddings-only   # Populate embeddings only
     python generate_zava_postgres.py --verify-embeddings # Verify embeddings table
+    python generate_zava_postgres.py --build-vector-indexes # Rebuild vector indexes, report recall@10
+    python generate_zava_postgres.py --loader executemany # Compare against row-batched INSERTs
+    python generate_zava_postgres.py --num-customers 1000000 --workers 8 --seed 42  # Parallel order load
+    python generate_zava_postgres.py --benchmark-indexes  # Compare btree vs brin index profiles
+    python generate_zava_postgres.py --benchmark-rls      # Compare session vs per-row EXISTS RLS policies
+    python generate_zava_postgres.py --refresh-summaries  # Refresh the monthly sales summary views
     python generate_zava_postgres.py --help              # Show all options
 """
 
@@ -33,15 +43,37 @@ import argparse
 import asyncio
 import json
 import logging
+import math
+import multiprocessing
 import os
 import random
 import sys
-from datetime import date
-from typing import Dict, List, Optional, Tuple
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import asyncpg
+import numpy as np
 from dotenv import load_dotenv
 from faker import Faker
+from pgvector.asyncpg import register_vector
+
+from zava_rules import (
+    DISCOUNT_PERCENTS,
+    DISCOUNT_RATE,
+    INVENTORY_BASE_STOCK,
+    INVENTORY_STOCK_VARIATION,
+    ITEM_QUANTITY,
+    ITEMS_PER_ORDER,
+    ORDER_YEARS,
+    ORDERS_PER_CUSTOMER,
+    PRICE_VARIATION,
+    SEASONAL_CATEGORY_RATE,
+    SEASONAL_PRODUCT_RATE,
+    product_sku,
+    selling_price,
+)
 
 # Load environment variables
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -77,6 +109,15 @@ SCHEMA_NAME = 'retail'
 # Super Manager UUID - has access to all rows regardless of RLS policies
 SUPER_MANAGER_UUID = '00000000-0000-0000-0000-000000000000'
 
+# Bulk loaders for the large tables (customers, inventory, orders, order_items)
+# copy:        asyncpg binary COPY (copy_records_to_table), streamed from generators
+# executemany: batched parameterized INSERTs (original path, kept for comparison)
+BULK_LOADERS = ('copy', 'executemany')
+DEFAULT_LOADER = 'copy'
+
+# Per-table load timings for the current build: table -> {'rows', 'seconds', 'calls'}
+load_timings: Dict[str, Dict[str, float]] = {}
+
 # Load reference data from JSON file
 def load_reference_data():
     """Load reference data from JSON file"""
@@ -88,37 +129,76 @@ def load_reference_data():
         logging.error(f"Failed to load reference data: {e}")
         raise
 
-def load_product_data():
-    """Load product data from JSON file"""
+# Per-product keys holding embedding arrays (the bulk of product_data.json)
+EMBEDDING_KEYS = ('image_embedding', 'description_embedding')
+
+def strip_embeddings(obj: Dict) -> Dict:
+    """json object_hook dropping embedding arrays as each object is decoded"""
+    for key in EMBEDDING_KEYS:
+        obj.pop(key, None)
+    return obj
+
+def load_product_data(include_embeddings: bool = True):
+    """Load product data from JSON file (optionally without the embedding arrays)"""
     try:
         json_path = os.path.join(os.path.dirname(__file__), 'product_data.json')
         with open(json_path, 'r') as f:
-            return json.load(f)
+            if include_embeddings:
+                return json.load(f)
+            return json.load(f, object_hook=strip_embeddings)
     except Exception as e:
         logging.error(f"Failed to load product data: {e}")
         raise
 
-# Load the reference data
-reference_data = load_reference_data()
-product_data = load_product_data()
-
-# Get reference data from loaded JSON
-main_categories = product_data['main_categories']
-stores = reference_data['stores']
-
-# Check if seasonal trends are available
-seasonal_categories = []
-for category_name, category_data in main_categories.items():
-    if 'washington_seasonal_multipliers' in category_data:
-        seasonal_categories.append(category_name)
-
-if seasonal_categories:
-    logging.info(f"🗓️  Washington State seasonal trends active for {len(seasonal_categories)} categories: {', '.join(seasonal_categories)}")
-else:
-    logging.info("⚠️  No seasonal trends found - using equal weights for all categories")
+# The JSON data files are loaded on first use, so subcommands that only query the
+# database (--show-stats, RLS demos, benchmarks) never read them, and the embedding
+# arrays are only held in memory when an embeddings phase runs
+_reference_data: Optional[Dict] = None
+_product_data: Optional[Dict] = None
+_product_catalog: Optional[Dict] = None
+_seasonal_categories: Optional[List[str]] = None
+
+def get_reference_data() -> Dict:
+    """Store configuration and year weights from reference_data.json"""
+    global _reference_data
+    if _reference_data is None:
+        _reference_data = load_reference_data()
+    return _reference_data
+
+def get_product_data() -> Dict:
+    """Full product_data.json, including embeddings (for the embeddings phases)"""
+    global _product_data
+    if _product_data is None:
+        _product_data = load_product_data()
+    return _product_data
+
+def get_stores() -> Dict:
+    return get_reference_data()['stores']
+
+def get_main_categories() -> Dict:
+    """Categories, product types and products, without embeddings unless already loaded"""
+    global _product_catalog
+    if _product_data is not None:
+        return _product_data['main_categories']
+    if _product_catalog is None:
+        _product_catalog = load_product_data(include_embeddings=False)
+    return _product_catalog['main_categories']
+
+def get_seasonal_categories() -> List[str]:
+    """Categories with Washington State seasonal multipliers"""
+    global _seasonal_categories
+    if _seasonal_categories is None:
+        _seasonal_categories = [name for name, data in get_main_categories().items()
+                                if 'washington_seasonal_multipliers' in data]
+        if _seasonal_categories:
+            logging.info(f"🗓️  Washington State seasonal trends active for {len(_seasonal_categories)} categories: {', '.join(_seasonal_categories)}")
+        else:
+            logging.info("⚠️  No seasonal trends found - using equal weights for all categories")
+    return _seasonal_categories
 
 def weighted_store_choice():
     """Choose a store based on weighted distribution"""
+    stores = get_stores()
     store_names = list(stores.keys())
     weights = [stores[store]['customer_distribution_weight'] for store in store_names]
     return random.choices(store_names, weights=weights, k=1)[0]
@@ -137,8 +217,189 @@ async def create_connection():
         logging.error(f"Failed to connect to PostgreSQL: {e}")
         raise
 
-async def create_database_schema(conn):
-    """Create database schema, tables and indexes"""
+# Performance indexes, built in parallel after the bulk load: (index_name, table, column list)
+PERFORMANCE_INDEXES = [
+    # Category and type indexes
+    ('idx_categories_name', 'categories', 'category_name'),
+    ('idx_product_types_category', 'product_types', 'category_id'),
+    ('idx_product_types_name', 'product_types', 'type_name'),
+    
+    # Product indexes
+    ('idx_products_sku', 'products', 'sku'),
+    ('idx_products_category', 'products', 'category_id'),
+    ('idx_products_type', 'products', 'type_id'),
+    ('idx_products_price', 'products', 'base_price'),
+    ('idx_products_cost', 'products', 'cost'),
+    ('idx_products_margin', 'products', 'gross_margin_percent'),
+    
+    # Inventory indexes
+    ('idx_inventory_store_product', 'inventory', 'store_id, product_id'),
+    ('idx_inventory_product', 'inventory', 'product_id'),
+    ('idx_inventory_store', 'inventory', 'store_id'),
+    
+    # Store indexes
+    ('idx_stores_name', 'stores', 'store_name'),
+    
+    # Order indexes
+    ('idx_orders_customer', 'orders', 'customer_id'),
+    ('idx_orders_store', 'orders', 'store_id'),
+    ('idx_orders_date', 'orders', 'order_date'),
+    ('idx_orders_customer_date', 'orders', 'customer_id, order_date'),
+    ('idx_orders_store_date', 'orders', 'store_id, order_date'),
+    ('idx_orders_totals_covering', 'orders', 'store_id, order_date, total_amount, item_count, discount_total, customer_id'),
+    
+    # Order items indexes
+    ('idx_order_items_order', 'order_items', 'order_id'),
+    ('idx_order_items_store', 'order_items', 'store_id'),
+    ('idx_order_items_product', 'order_items', 'product_id'),
+    ('idx_order_items_total', 'order_items', 'total_amount'),
+    
+    # Product image embeddings indexes
+    ('idx_product_image_embeddings_product', 'product_image_embeddings', 'product_id'),
+    ('idx_product_image_embeddings_url', 'product_image_embeddings', 'image_url'),
+    
+    # Covering indexes for aggregation queries
+    ('idx_order_items_covering', 'order_items', 'order_id, store_id, product_id, total_amount, quantity'),
+    ('idx_products_covering', 'products', 'category_id, type_id, product_id, sku, cost, base_price'),
+    ('idx_products_sku_covering', 'products', 'sku, product_id, product_name, cost, base_price'),
+    
+    # Customer indexes
+    ('idx_customers_email', 'customers', 'email'),
+    ('idx_customers_primary_store', 'customers', 'primary_store_id'),
+]
+
+# Index profiles (--index-profile)
+# btree: PERFORMANCE_INDEXES as above
+# brin:  the append-only order tables swap their large single-column B-trees for
+#        BRIN block-range indexes, and full indexes on hot predicates for partial ones
+#        Order IDs follow insertion order, but order dates are spread over every
+#        flush, so order_date BRINs only pay off with --partition-orders (each
+#        partition covers one date range); unpartitioned, idx_orders_date is kept
+INDEX_PROFILES = ('btree', 'brin')
+DEFAULT_INDEX_PROFILE = 'btree'
+HIGH_VALUE_ITEM_AMOUNT = 500
+LOW_STOCK_LEVEL = 10
+
+# B-tree indexes the brin profile drops
+BRIN_REPLACED_INDEXES = {'idx_orders_date', 'idx_order_items_order', 'idx_order_items_total'}
+
+# brin profile indexes on order_date, and the B-trees they replace, used only with partitioned order tables
+BRIN_DATE_INDEXES = {'brin_orders_date', 'brin_order_items_date'}
+BRIN_PARTITIONED_ONLY_REPLACED_INDEXES = {'idx_orders_date'}
+
+# brin profile additions: (index_name, table, definition following "ON <table>")
+BRIN_PROFILE_INDEXES = [
+    ('brin_orders_date', 'orders', 'USING brin (order_date date_minmax_multi_ops) WITH (pages_per_range = 32)'),
+    ('brin_orders_order_id', 'orders', 'USING brin (order_id) WITH (pages_per_range = 32)'),
+    ('brin_order_items_order_id', 'order_items', 'USING brin (order_id) WITH (pages_per_range = 32)'),
+    ('brin_order_items_date', 'order_items', 'USING brin (order_date date_minmax_multi_ops) WITH (pages_per_range = 32)'),
+    ('idx_order_items_discounted', 'order_items', '(store_id, product_id) WHERE discount_percent > 0'),
+    ('idx_order_items_high_value', 'order_items', f'(store_id, total_amount) WHERE total_amount >= {HIGH_VALUE_ITEM_AMOUNT}'),
+    ('idx_inventory_low_stock', 'inventory', f'(store_id, product_id) WHERE stock_level < {LOW_STOCK_LEVEL}'),
+]
+
+# Vector similarity indexes, sized from the loaded row count by build_vector_indexes():
+# (index_name, table, column)
+VECTOR_INDEXES = [
+    ('idx_product_image_embeddings_vector', 'product_image_embeddings', 'image_embedding'),
+    ('idx_product_description_embeddings_vector', 'product_description_embeddings', 'description_embedding'),
+]
+
+# Primary keys and unique constraints, added after the bulk load: (table, constraint_name, definition)
+KEY_CONSTRAINTS = [
+    ('stores', 'stores_pkey', 'PRIMARY KEY (store_id)'),
+    ('stores', 'stores_store_name_key', 'UNIQUE (store_name)'),
+    ('customers', 'customers_pkey', 'PRIMARY KEY (customer_id)'),
+    ('customers', 'customers_email_key', 'UNIQUE (email)'),
+    ('categories', 'categories_pkey', 'PRIMARY KEY (category_id)'),
+    ('categories', 'categories_category_name_key', 'UNIQUE (category_name)'),
+    ('product_types', 'product_types_pkey', 'PRIMARY KEY (type_id)'),
+    ('products', 'products_pkey', 'PRIMARY KEY (product_id)'),
+    ('products', 'products_sku_key', 'UNIQUE (sku)'),
+    ('inventory', 'inventory_pkey', 'PRIMARY KEY (store_id, product_id)'),
+    ('orders', 'orders_pkey', 'PRIMARY KEY (order_id)'),
+    ('order_items', 'order_items_pkey', 'PRIMARY KEY (order_item_id)'),
+    ('product_image_embeddings', 'product_image_embeddings_pkey', 'PRIMARY KEY (product_id)'),
+    ('product_description_embeddings', 'product_description_embeddings_pkey', 'PRIMARY KEY (product_id)'),
+]
+
+# Foreign keys, added once keys exist: (table, columns, referenced table, referenced columns)
+FOREIGN_KEYS = [
+    ('customers', 'primary_store_id', 'stores', 'store_id'),
+    ('product_types', 'category_id', 'categories', 'category_id'),
+    ('products', 'category_id', 'categories', 'category_id'),
+    ('products', 'type_id', 'product_types', 'type_id'),
+    ('inventory', 'store_id', 'stores', 'store_id'),
+    ('inventory', 'product_id', 'products', 'product_id'),
+    ('orders', 'customer_id', 'customers', 'customer_id'),
+    ('orders', 'store_id', 'stores', 'store_id'),
+    ('order_items', 'order_id', 'orders', 'order_id'),
+    ('order_items', 'store_id', 'stores', 'store_id'),
+    ('order_items', 'product_id', 'products', 'product_id'),
+    ('product_image_embeddings', 'product_id', 'products', 'product_id'),
+    ('product_description_embeddings', 'product_id', 'products', 'product_id'),
+]
+
+# Order history partitioning (--partition-orders): orders and order_items are
+# range-partitioned on order_date the same way; every unique key must include
+# the partition key, so these keys replace the unpartitioned ones
+ORDER_PARTITIONING_MODES = ('none', 'month', 'year')
+PARTITIONED_KEY_CONSTRAINTS = {
+    'orders_pkey': 'PRIMARY KEY (order_id, order_date)',
+    'order_items_pkey': 'PRIMARY KEY (order_item_id, order_date)',
+}
+PARTITIONED_FOREIGN_KEYS = {
+    ('order_items', 'order_id'): ('order_items', 'order_id, order_date', 'orders', 'order_id, order_date'),
+}
+
+RETAIL_TABLES = [
+    'stores', 'customers', 'categories', 'product_types', 'products', 'inventory',
+    'orders', 'order_items', 'product_image_embeddings', 'product_description_embeddings',
+]
+
+# Post-load build tuning (per index-build connection)
+DEFAULT_INDEX_WORKERS = 4
+DEFAULT_MAINTENANCE_WORK_MEM = '512MB'
+PARALLEL_MAINTENANCE_WORKERS = 2
+
+# Elapsed seconds per build phase for the current build
+phase_timings: Dict[str, float] = {}
+
+async def timed_phase(name: str, coro):
+    """Await a build phase and record how long it took"""
+    logging.info(f"\n⏳ {name}...")
+    start = time.perf_counter()
+    result = await coro
+    phase_timings[name] = time.perf_counter() - start
+    logging.info(f"✓ {name} completed in {phase_timings[name]:.2f}s")
+    return result
+
+def log_phase_timings():
+    """Log the elapsed time of every build phase"""
+    if not phase_timings:
+        return
+    
+    total = sum(phase_timings.values())
+    logging.info("\n⏱️  BUILD PHASE TIMINGS:")
+    logging.info("   Phase                              Seconds    Share")
+    logging.info("   " + "-" * 52)
+    for name, seconds in phase_timings.items():
+        share = 100.0 * seconds / total if total > 0 else 0
+        logging.info(f"   {name:<34} {seconds:>8.2f}   {share:>5.1f}%")
+    logging.info("   " + "-" * 52)
+    logging.info(f"   {'Total':<34} {total:>8.2f}")
+
+async def create_database_schema(conn, order_partitioning: str = 'none'):
+    """
+    Create the schema and bare tables.
+    
+    With order_partitioning 'month' or 'year', orders and order_items are
+    range-partitioned on order_date with one partition per period.
+    
+    Tables are created without keys, indexes, foreign keys or RLS so the bulk
+    load does not pay per-row index and constraint maintenance; those are added
+    afterwards by build_post_load_objects().
+    """
     try:
         # Create schema if it doesn't exist
         await conn.execute(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA_NAME}")
@@ -154,8 +415,8 @@ async def create_database_schema(conn):
         # Create stores table
         await conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.stores (
-                store_id SERIAL PRIMARY KEY,
-                store_name TEXT UNIQUE NOT NULL,
+                store_id SERIAL,
+                store_name TEXT NOT NULL,
                 rls_user_id UUID NOT NULL,
                 is_online BOOLEAN NOT NULL DEFAULT false
             )
@@ -164,49 +425,45 @@ async def create_database_schema(conn):
         # Create customers table
         await conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.customers (
-                customer_id SERIAL PRIMARY KEY,
+                customer_id SERIAL,
                 first_name TEXT NOT NULL,
                 last_name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
+                email TEXT NOT NULL,
                 phone TEXT,
                 primary_store_id INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (primary_store_id) REFERENCES {SCHEMA_NAME}.stores (store_id)
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
         
         # Create categories table
         await conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.categories (
-                category_id SERIAL PRIMARY KEY,
-                category_name TEXT NOT NULL UNIQUE
+                category_id SERIAL,
+                category_name TEXT NOT NULL
             )
         """)
         
         # Create product_types table
         await conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.product_types (
-                type_id SERIAL PRIMARY KEY,
+                type_id SERIAL,
                 category_id INTEGER NOT NULL,
-                type_name TEXT NOT NULL,
-                FOREIGN KEY (category_id) REFERENCES {SCHEMA_NAME}.categories (category_id)
+                type_name TEXT NOT NULL
             )
         """)
         
         # Create products table with cost and selling price for 33% gross margin
         await conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.products (
-                product_id SERIAL PRIMARY KEY,
-                sku TEXT UNIQUE NOT NULL,
+                product_id SERIAL,
+                sku TEXT NOT NULL,
                 product_name TEXT NOT NULL,
                 category_id INTEGER NOT NULL,
                 type_id INTEGER NOT NULL,
                 cost DECIMAL(10,2) NOT NULL,
                 base_price DECIMAL(10,2) NOT NULL,
                 gross_margin_percent DECIMAL(5,2) DEFAULT 33.00,
-                product_description TEXT NOT NULL,
-                FOREIGN KEY (category_id) REFERENCES {SCHEMA_NAME}.categories (category_id),
-                FOREIGN KEY (type_id) REFERENCES {SCHEMA_NAME}.product_types (type_id)
+                product_description TEXT NOT NULL
             )
         """)
         
@@ -215,130 +472,684 @@ async def create_database_schema(conn):
             CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.inventory (
                 store_id INTEGER NOT NULL,
                 product_id INTEGER NOT NULL,
-                stock_level INTEGER NOT NULL,
-                PRIMARY KEY (store_id, product_id),
-                FOREIGN KEY (store_id) REFERENCES {SCHEMA_NAME}.stores (store_id),
-                FOREIGN KEY (product_id) REFERENCES {SCHEMA_NAME}.products (product_id)
+                stock_level INTEGER NOT NULL
             )
         """)
         
-        # Create orders table (header only)
+        # Create orders table (header plus order-level totals kept in step with order_items)
+        partition_clause = " PARTITION BY RANGE (order_date)" if order_partitioning != 'none' else ""
         await conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.orders (
-                order_id SERIAL PRIMARY KEY,
+                order_id SERIAL,
                 customer_id INTEGER NOT NULL,
                 store_id INTEGER NOT NULL,
                 order_date DATE NOT NULL,
-                FOREIGN KEY (customer_id) REFERENCES {SCHEMA_NAME}.customers (customer_id),
-                FOREIGN KEY (store_id) REFERENCES {SCHEMA_NAME}.stores (store_id)
-            )
+                item_count INTEGER NOT NULL DEFAULT 0,
+                subtotal DECIMAL(12,2) NOT NULL DEFAULT 0,
+                discount_total DECIMAL(12,2) NOT NULL DEFAULT 0,
+                total_amount DECIMAL(12,2) NOT NULL DEFAULT 0
+            ){partition_clause}
         """)
         
-        # Create order_items table (line items)
+        # Create order_items table (line items, order_date copied from the order)
         await conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.order_items (
-                order_item_id SERIAL PRIMARY KEY,
+                order_item_id SERIAL,
                 order_id INTEGER NOT NULL,
+                order_date DATE NOT NULL,
                 store_id INTEGER NOT NULL,
                 product_id INTEGER NOT NULL,
                 quantity INTEGER NOT NULL,
                 unit_price DECIMAL(10,2) NOT NULL,
                 discount_percent INTEGER DEFAULT 0,
                 discount_amount DECIMAL(10,2) DEFAULT 0,
-                total_amount DECIMAL(10,2) NOT NULL,
-                FOREIGN KEY (order_id) REFERENCES {SCHEMA_NAME}.orders (order_id),
-                FOREIGN KEY (store_id) REFERENCES {SCHEMA_NAME}.stores (store_id),
-                FOREIGN KEY (product_id) REFERENCES {SCHEMA_NAME}.products (product_id)
-            )
+                total_amount DECIMAL(10,2) NOT NULL
+            ){partition_clause}
         """)
         
+        if order_partitioning != 'none':
+            await create_order_partitions(conn, order_partitioning)
+        
         # Create product_image_embeddings table for image data
         await conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.product_image_embeddings (
-                product_id INTEGER PRIMARY KEY,
+                product_id INTEGER NOT NULL,
                 image_url TEXT NOT NULL,
                 image_embedding vector(512),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (product_id) REFERENCES {SCHEMA_NAME}.products (product_id)
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
         
         # Create product_description_embeddings table for text embeddings
         await conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.product_description_embeddings (
-                product_id INTEGER PRIMARY KEY,
+                product_id INTEGER NOT NULL,
                 description_embedding vector(1536),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (product_id) REFERENCES {SCHEMA_NAME}.products (product_id)
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
         
-        # Create optimized performance indexes
-        logging.info("Creating performance indexes...")
-        
-        # Category and type indexes
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_categories_name ON {SCHEMA_NAME}.categories(category_name)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_product_types_category ON {SCHEMA_NAME}.product_types(category_id)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_product_types_name ON {SCHEMA_NAME}.product_types(type_name)")
-        
-        # Product indexes
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_products_sku ON {SCHEMA_NAME}.products(sku)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_products_category ON {SCHEMA_NAME}.products(category_id)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_products_type ON {SCHEMA_NAME}.products(type_id)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_products_price ON {SCHEMA_NAME}.products(base_price)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_products_cost ON {SCHEMA_NAME}.products(cost)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_products_margin ON {SCHEMA_NAME}.products(gross_margin_percent)")
-        
-        # Inventory indexes
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_inventory_store_product ON {SCHEMA_NAME}.inventory(store_id, product_id)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_inventory_product ON {SCHEMA_NAME}.inventory(product_id)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_inventory_store ON {SCHEMA_NAME}.inventory(store_id)")
-        
-        # Store indexes
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_stores_name ON {SCHEMA_NAME}.stores(store_name)")
-        
-        # Order indexes
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_orders_customer ON {SCHEMA_NAME}.orders(customer_id)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_orders_store ON {SCHEMA_NAME}.orders(store_id)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_orders_date ON {SCHEMA_NAME}.orders(order_date)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_orders_customer_date ON {SCHEMA_NAME}.orders(customer_id, order_date)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_orders_store_date ON {SCHEMA_NAME}.orders(store_id, order_date)")
-        
-        # Order items indexes
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_order_items_order ON {SCHEMA_NAME}.order_items(order_id)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_order_items_store ON {SCHEMA_NAME}.order_items(store_id)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_order_items_product ON {SCHEMA_NAME}.order_items(product_id)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_order_items_total ON {SCHEMA_NAME}.order_items(total_amount)")
-        
-        # Product image embeddings indexes
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_product_image_embeddings_product ON {SCHEMA_NAME}.product_image_embeddings(product_id)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_product_image_embeddings_url ON {SCHEMA_NAME}.product_image_embeddings(image_url)")
-        
-        # Vector similarity index for product image embeddings (if pgvector is available)
+        logging.info("Database tables created (keys, indexes and RLS are added after loading)")
+    except Exception as e:
+        logging.error(f"Error creating database schema: {e}")
+        raise
+
+def order_partition_bounds(order_partitioning: str) -> List[Tuple[str, date, date]]:
+    """(suffix, from, to) for every order table partition"""
+    bounds = []
+    for year in ORDER_YEARS:
+        if order_partitioning == 'year':
+            bounds.append((f"y{year}", date(year, 1, 1), date(year + 1, 1, 1)))
+        else:
+            for month in range(1, 13):
+                upper = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+                bounds.append((f"y{year}m{month:02d}", date(year, month, 1), upper))
+    return bounds
+
+def order_partition_name(table: str, order_date: date, order_partitioning: str) -> str:
+    """Name of the table partition a row with this order_date belongs to"""
+    if order_date.year not in ORDER_YEARS:
+        return f"{table}_default"
+    if order_partitioning == 'year':
+        return f"{table}_y{order_date.year}"
+    return f"{table}_y{order_date.year}m{order_date.month:02d}"
+
+async def create_order_partitions(conn, order_partitioning: str):
+    """Create the period partitions (plus a default partition) for orders and order_items"""
+    bounds = order_partition_bounds(order_partitioning)
+    for table in ('orders', 'order_items'):
+        for suffix, lower, upper in bounds:
+            await conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.{table}_{suffix}
+                PARTITION OF {SCHEMA_NAME}.{table} FOR VALUES FROM ('{lower}') TO ('{upper}')
+            """)
+        await conn.execute(f"CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.{table}_default PARTITION OF {SCHEMA_NAME}.{table} DEFAULT")
+    logging.info(f"Created {len(bounds)} {order_partitioning}ly partitions (+ default) for orders and order_items")
+
+async def explain_partition_pruning(conn, year: Optional[int] = None):
+    """Log the plan of a year-scoped aggregate to show which partitions it touches (default: last full year)"""
+    if year is None:
+        year = ORDER_YEARS[-2]
+    rows = await conn.fetch(f"""
+        EXPLAIN SELECT o.store_id, SUM(oi.total_amount)
+        FROM {SCHEMA_NAME}.orders o
+        JOIN {SCHEMA_NAME}.order_items oi ON oi.order_id = o.order_id AND oi.order_date = o.order_date
+        WHERE o.order_date >= DATE '{year}-01-01' AND o.order_date < DATE '{year + 1}-01-01'
+          AND oi.order_date >= DATE '{year}-01-01' AND oi.order_date < DATE '{year + 1}-01-01'
+        GROUP BY o.store_id
+    """)
+    plan = [row[0] for row in rows]
+    scanned = sorted({line.split(' on ')[1].split()[0] for line in plan if ' on ' in line and 'Scan' in line})
+    total = await conn.fetchval("""
+        SELECT COUNT(*) FROM pg_inherits i
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_namespace n ON n.oid = parent.relnamespace
+        WHERE n.nspname = $1 AND parent.relname IN ('orders', 'order_items')
+    """, SCHEMA_NAME)
+    logging.info(f"\n✂️  PARTITION PRUNING ({year} orders): {len(scanned)} of {total} partitions scanned")
+    for name in scanned:
+        logging.info(f"   {name}")
+    for line in plan:
+        logging.debug(f"   {line}")
+
+async def add_key_constraints(conn, maintenance_work_mem: str = DEFAULT_MAINTENANCE_WORK_MEM,
+                              order_partitioning: str = 'none'):
+    """Add primary keys and unique constraints, one connection per table in parallel"""
+    by_table = {}
+    for table, name, definition in KEY_CONSTRAINTS:
+        if order_partitioning != 'none':
+            definition = PARTITIONED_KEY_CONSTRAINTS.get(name, definition)
+        by_table.setdefault(table, []).append((name, definition))
+    
+    async def add_table_keys(table, constraints):
+        # ALTER TABLE locks the table exclusively, so a table's constraints share one connection
+        table_conn = await create_connection()
         try:
-            await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_product_image_embeddings_vector ON {SCHEMA_NAME}.product_image_embeddings USING ivfflat (image_embedding vector_cosine_ops) WITH (lists = 100)")
-            logging.info("Product image embeddings vector similarity index created")
-        except Exception as e:
-            logging.warning(f"Could not create product image embeddings vector index: {e}")
-        
-        # Vector similarity index for product description embeddings (if pgvector is available)
+            await table_conn.execute(f"SET maintenance_work_mem = '{maintenance_work_mem}'")
+            for name, definition in constraints:
+                await table_conn.execute(f"ALTER TABLE {SCHEMA_NAME}.{table} ADD CONSTRAINT {name} {definition}")
+        finally:
+            await table_conn.close()
+    
+    await asyncio.gather(*[add_table_keys(table, constraints) for table, constraints in by_table.items()])
+    logging.info(f"Added {len(KEY_CONSTRAINTS)} primary key / unique constraints")
+
+def brin_replaced_indexes(order_partitioning: str = 'none') -> set:
+    """B-tree indexes the brin profile drops; the order_date B-tree stays unless the order tables are partitioned"""
+    if order_partitioning != 'none':
+        return BRIN_REPLACED_INDEXES
+    return BRIN_REPLACED_INDEXES - BRIN_PARTITIONED_ONLY_REPLACED_INDEXES
+
+def brin_profile_indexes(order_partitioning: str = 'none') -> List[Tuple[str, str, str]]:
+    """Indexes the brin profile adds; order_date BRINs only on partitioned order tables"""
+    if order_partitioning != 'none':
+        return BRIN_PROFILE_INDEXES
+    return [index for index in BRIN_PROFILE_INDEXES if index[0] not in BRIN_DATE_INDEXES]
+
+def index_statements(index_profile: str = DEFAULT_INDEX_PROFILE,
+                     order_partitioning: str = 'none') -> List[Tuple[str, str, str]]:
+    """(index_name, table, CREATE INDEX statement) for every performance index of a profile"""
+    if index_profile not in INDEX_PROFILES:
+        raise ValueError(f"Unknown index profile '{index_profile}' (expected one of: {', '.join(INDEX_PROFILES)})")
+    
+    replaced = brin_replaced_indexes(order_partitioning) if index_profile == 'brin' else set()
+    statements = []
+    for name, table, columns in PERFORMANCE_INDEXES:
+        if name in replaced:
+            continue
+        statements.append((name, table, f"CREATE INDEX IF NOT EXISTS {name} ON {SCHEMA_NAME}.{table}({columns})"))
+    if index_profile == 'brin':
+        for name, table, definition in brin_profile_indexes(order_partitioning):
+            statements.append((name, table, f"CREATE INDEX IF NOT EXISTS {name} ON {SCHEMA_NAME}.{table} {definition}"))
+    return statements
+
+async def build_indexes_parallel(index_workers: int = DEFAULT_INDEX_WORKERS,
+                                 maintenance_work_mem: str = DEFAULT_MAINTENANCE_WORK_MEM,
+                                 index_profile: str = DEFAULT_INDEX_PROFILE, order_partitioning: str = 'none'):
+    """
+    Build all performance indexes of a profile over several connections.
+    
+    Largest tables are queued first so the long builds start immediately and
+    the small ones fill in around them. Each connection gets its own
+    maintenance_work_mem and may use parallel maintenance workers.
+    """
+    table_order = ['order_items', 'orders', 'customers', 'inventory']
+    statements = []
+    for name, table, sql in sorted(index_statements(index_profile, order_partitioning),
+                                   key=lambda idx: table_order.index(idx[1]) if idx[1] in table_order else len(table_order)):
+        statements.append((name, sql))
+    
+    queue = asyncio.Queue()
+    for statement in statements:
+        queue.put_nowait(statement)
+    
+    async def index_worker(worker_id):
+        worker_conn = await create_connection()
         try:
-            await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_product_description_embeddings_vector ON {SCHEMA_NAME}.product_description_embeddings USING ivfflat (description_embedding vector_cosine_ops) WITH (lists = 100)")
-            logging.info("Product description embeddings vector similarity index created")
+            await worker_conn.execute(f"SET maintenance_work_mem = '{maintenance_work_mem}'")
+            await worker_conn.execute(f"SET max_parallel_maintenance_workers = {PARALLEL_MAINTENANCE_WORKERS}")
+            while not queue.empty():
+                name, sql = queue.get_nowait()
+                start = time.perf_counter()
+                await worker_conn.execute(sql)
+                logging.info(f"  [worker {worker_id}] {name} built in {time.perf_counter() - start:.2f}s")
+        finally:
+            await worker_conn.close()
+    
+    await asyncio.gather(*[index_worker(i + 1) for i in range(max(1, index_workers))])
+    logging.info(f"Built {len(statements)} {index_profile} profile indexes with {index_workers} connections "
+                 f"(maintenance_work_mem={maintenance_work_mem})")
+
+async def add_foreign_keys(conn, order_partitioning: str = 'none'):
+    """Add foreign keys (validated against the loaded data)"""
+    for table, columns, ref_table, ref_columns in FOREIGN_KEYS:
+        if order_partitioning != 'none':
+            table, columns, ref_table, ref_columns = PARTITIONED_FOREIGN_KEYS.get(
+                (table, columns), (table, columns, ref_table, ref_columns))
+        name = f"{table}_{columns.replace(', ', '_')}_fkey"
+        await conn.execute(f"""
+            ALTER TABLE {SCHEMA_NAME}.{table}
+            ADD CONSTRAINT {name} FOREIGN KEY ({columns}) REFERENCES {SCHEMA_NAME}.{ref_table} ({ref_columns})
+        """)
+    logging.info(f"Added {len(FOREIGN_KEYS)} foreign keys")
+
+async def analyze_tables(conn):
+    """Refresh planner statistics for every retail table"""
+    for table in RETAIL_TABLES:
+        await conn.execute(f"ANALYZE {SCHEMA_NAME}.{table}")
+    logging.info(f"Analyzed {len(RETAIL_TABLES)} tables")
+
+def index_benchmark_queries(year: Optional[int] = None) -> List[Tuple[str, str]]:
+    """Range-scan analytics in the shape the MCP sales server runs: (label, SQL). Default year: last full year"""
+    if year is None:
+        year = ORDER_YEARS[-2]
+    year_range = f"DATE '{year}-01-01' AND DATE '{year}-12-31'"
+    quarter_range = f"DATE '{year}-10-01' AND DATE '{year}-12-31'"
+    return [
+        ("Monthly revenue, one year", f"""
+            SELECT date_trunc('month', o.order_date) AS month, SUM(oi.total_amount)
+            FROM {SCHEMA_NAME}.orders o JOIN {SCHEMA_NAME}.order_items oi ON oi.order_id = o.order_id
+            WHERE o.order_date BETWEEN {year_range} GROUP BY 1 ORDER BY 1"""),
+        ("Store revenue, one quarter", f"""
+            SELECT oi.store_id, SUM(oi.total_amount)
+            FROM {SCHEMA_NAME}.order_items oi
+            WHERE oi.order_date BETWEEN {quarter_range} GROUP BY oi.store_id"""),
+        ("Items for an order ID range", f"""
+            SELECT COUNT(*), SUM(oi.total_amount) FROM {SCHEMA_NAME}.order_items oi
+            WHERE oi.order_id BETWEEN (SELECT MAX(order_id) / 2 FROM {SCHEMA_NAME}.orders)
+                                  AND (SELECT MAX(order_id) / 2 + 10000 FROM {SCHEMA_NAME}.orders)"""),
+        ("Discounted sales by product, one store", f"""
+            SELECT oi.product_id, SUM(oi.discount_amount) FROM {SCHEMA_NAME}.order_items oi
+            WHERE oi.discount_percent > 0 AND oi.store_id = 1 GROUP BY oi.product_id"""),
+        ("High-value line items by store", f"""
+            SELECT oi.store_id, COUNT(*), SUM(oi.total_amount) FROM {SCHEMA_NAME}.order_items oi
+            WHERE oi.total_amount >= {HIGH_VALUE_ITEM_AMOUNT} GROUP BY oi.store_id"""),
+        ("Low stock by store", f"""
+            SELECT i.store_id, COUNT(*) FROM {SCHEMA_NAME}.inventory i
+            WHERE i.stock_level < {LOW_STOCK_LEVEL} GROUP BY i.store_id"""),
+    ]
+
+def profile_specific_indexes(index_profile: str, order_partitioning: str = 'none') -> List[Tuple[str, str, str]]:
+    """The indexes only one profile builds (the rest are shared)"""
+    if index_profile == 'brin':
+        names = {name for name, _, _ in brin_profile_indexes(order_partitioning)}
+    else:
+        names = brin_replaced_indexes(order_partitioning)
+    return [statement for statement in index_statements(index_profile, order_partitioning) if statement[0] in names]
+
+async def index_size(conn, index_name: str) -> int:
+    """Bytes used by an index, summed over its partitions when the table is partitioned"""
+    return await conn.fetchval(
+        "SELECT COALESCE(SUM(pg_relation_size(relid)), 0) FROM pg_partition_tree($1::regclass)",
+        f"{SCHEMA_NAME}.{index_name}")
+
+async def time_query(conn, sql: str, runs: int) -> float:
+    """Median milliseconds over several runs, after one warm-up run"""
+    await conn.fetch(sql)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await conn.fetch(sql)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+async def time_order_item_append(conn, rows: int) -> float:
+    """Rows/sec for appending order items with the current indexes in place (rolled back)"""
+    columns = ', '.join(ORDER_ITEM_COLUMNS)
+    tx = conn.transaction()
+    await tx.start()
+    try:
+        start = time.perf_counter()
+        await conn.execute(f"""
+            INSERT INTO {SCHEMA_NAME}.order_items ({columns})
+            SELECT {columns} FROM {SCHEMA_NAME}.order_items ORDER BY order_item_id DESC LIMIT {rows}
+        """)
+        elapsed = time.perf_counter() - start
+    finally:
+        await tx.rollback()
+    return rows / elapsed if elapsed > 0 else 0.0
+
+async def benchmark_index_profiles(conn, runs: int = 5, append_rows: int = 50000,
+                                   maintenance_work_mem: str = DEFAULT_MAINTENANCE_WORK_MEM):
+    """
+    Compare the btree and brin index profiles on an already loaded database.
+    
+    For each profile the indexes only it uses are built one at a time, then
+    index size, build time, append throughput and the index_benchmark_queries()
+    timings are measured. The profile that was in place before is restored.
+    """
+    partitioned = await conn.fetchval(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = $1::regclass", f"{SCHEMA_NAME}.orders")
+    order_partitioning = 'partitioned' if partitioned else 'none'
+    all_specific = {name for profile in INDEX_PROFILES
+                    for name, _, _ in profile_specific_indexes(profile, order_partitioning)}
+    existing = {row['indexname'] for row in await conn.fetch(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = $1", SCHEMA_NAME)}
+    original_profile = 'brin' if 'brin_orders_order_id' in existing else 'btree'
+    
+    correlations = await conn.fetch("""
+        SELECT tablename, attname, correlation FROM pg_stats
+        WHERE schemaname = $1 AND tablename IN ('orders', 'order_items')
+          AND attname IN ('order_id', 'order_date')
+        ORDER BY tablename, attname
+    """, SCHEMA_NAME)
+    
+    await conn.execute(f"SET maintenance_work_mem = '{maintenance_work_mem}'")
+    queries = index_benchmark_queries()
+    results = {}
+    try:
+        for profile in INDEX_PROFILES:
+            for name in all_specific:
+                await conn.execute(f"DROP INDEX IF EXISTS {SCHEMA_NAME}.{name}")
+            
+            logging.info(f"\n🔨 Building {profile} profile indexes...")
+            sizes = {}
+            build_seconds = 0.0
+            for name, _, sql in profile_specific_indexes(profile, order_partitioning):
+                start = time.perf_counter()
+                await conn.execute(sql)
+                build_seconds += time.perf_counter() - start
+                sizes[name] = await index_size(conn, name)
+                logging.info(f"  {name}: {sizes[name] / 1024 / 1024:,.1f} MB")
+            for table in ('orders', 'order_items', 'inventory'):
+                await conn.execute(f"ANALYZE {SCHEMA_NAME}.{table}")
+            
+            results[profile] = {
+                'size': sum(sizes.values()),
+                'build_seconds': build_seconds,
+                'append_rate': await time_order_item_append(conn, append_rows),
+                'queries': [await time_query(conn, sql, runs) for _, sql in queries],
+            }
+    finally:
+        for name in all_specific:
+            await conn.execute(f"DROP INDEX IF EXISTS {SCHEMA_NAME}.{name}")
+        for _, _, sql in profile_specific_indexes(original_profile, order_partitioning):
+            await conn.execute(sql)
+    
+    btree, brin = results['btree'], results['brin']
+    logging.info("\n📊 INDEX PROFILE BENCHMARK (profile-specific indexes only):")
+    logging.info(f"   {'Measure':<42} {'btree':>12} {'brin':>12}")
+    logging.info("   " + "-" * 68)
+    logging.info(f"   {'Index size (MB)':<42} {btree['size'] / 1024 / 1024:>12,.1f} {brin['size'] / 1024 / 1024:>12,.1f}")
+    logging.info(f"   {'Index build (s)':<42} {btree['build_seconds']:>12.2f} {brin['build_seconds']:>12.2f}")
+    logging.info(f"   {'Order item append (rows/s)':<42} {btree['append_rate']:>12,.0f} {brin['append_rate']:>12,.0f}")
+    for i, (label, _) in enumerate(queries):
+        logging.info(f"   {label + ' (ms)':<42} {btree['queries'][i]:>12.1f} {brin['queries'][i]:>12.1f}")
+    
+    logging.info("\n   Physical order (BRIN works best close to ±1.0):")
+    for row in correlations:
+        correlation = f"{row['correlation']:+.2f}" if row['correlation'] is not None else "n/a"
+        logging.info(f"   {row['tablename']}.{row['attname']}: {correlation}")
+    logging.info(f"   Restored the {original_profile} profile")
+    return results
+
+# Vector index selection thresholds (rows in the embeddings table)
+HNSW_MAX_ROWS = 1_000_000         # above this, ivfflat builds far faster and uses less memory
+HNSW_LARGE_ROWS = 100_000         # from here on, a denser HNSW graph keeps recall up
+RECALL_SAMPLE_QUERIES = 20
+RECALL_K = 10
+# Recall queries are stored vectors plus Gaussian noise of this size relative to the vector norm
+RECALL_QUERY_NOISE = 0.1
+
+def choose_vector_index(row_count: int, method: str = 'auto') -> Dict:
+    """
+    Pick the vector index type and build/search parameters for a row count.
+    
+    auto: HNSW up to HNSW_MAX_ROWS (m=16/ef_construction=64, or m=24/128 for
+    large tables), ivfflat above it. ivfflat uses lists ≈ rows/1000 (sqrt(rows)
+    beyond 1M rows) and probes ≈ sqrt(lists).
+    """
+    if method == 'auto':
+        method = 'hnsw' if row_count <= HNSW_MAX_ROWS else 'ivfflat'
+    
+    if method == 'hnsw':
+        if row_count >= HNSW_LARGE_ROWS:
+            return {'method': 'hnsw', 'with': {'m': 24, 'ef_construction': 128}, 'search': {'hnsw.ef_search': 100}}
+        return {'method': 'hnsw', 'with': {'m': 16, 'ef_construction': 64}, 'search': {'hnsw.ef_search': 40}}
+    
+    if method == 'ivfflat':
+        if row_count > 1_000_000:
+            lists = int(math.sqrt(row_count))
+        else:
+            lists = max(1, row_count // 1000)
+        probes = max(1, int(math.sqrt(lists)))
+        return {'method': 'ivfflat', 'with': {'lists': lists}, 'search': {'ivfflat.probes': probes}}
+    
+    raise ValueError(f"Unknown vector index method '{method}' (expected auto, hnsw or ivfflat)")
+
+async def measure_vector_recall(conn, table: str, column: str, search: Dict,
+                                sample_queries: int = RECALL_SAMPLE_QUERIES, k: int = RECALL_K) -> Dict:
+    """
+    Compare index search against exact search for perturbed copies of a
+    sample of stored vectors.
+    
+    A stored vector is its own nearest neighbour and is found by almost any
+    index, which inflates recall; adding RECALL_QUERY_NOISE moves each query
+    off the indexed points, like a real search vector. Returns average
+    recall@k and average query time for each mode.
+    """
+    samples = await conn.fetch(f"""
+        SELECT {column}::text AS query_vector FROM {SCHEMA_NAME}.{table}
+        WHERE {column} IS NOT NULL ORDER BY random() LIMIT $1
+    """, sample_queries)
+    if not samples:
+        return {'recall': None, 'queries': 0, 'exact_ms': 0.0, 'index_ms': 0.0}
+    
+    rng = np.random.default_rng()
+    query_vectors = []
+    for sample in samples:
+        vector = np.array(json.loads(sample['query_vector']), dtype=np.float64)
+        noise = rng.normal(size=vector.shape) * RECALL_QUERY_NOISE * np.linalg.norm(vector) / math.sqrt(len(vector))
+        query_vectors.append('[' + ','.join(f"{value:.7g}" for value in vector + noise) + ']')
+    
+    # $1 is sent as text so this works whether or not the pgvector codec is registered
+    query = f"SELECT product_id FROM {SCHEMA_NAME}.{table} ORDER BY {column} <=> $1::text::vector LIMIT {k}"
+    recall_total = 0.0
+    exact_seconds = 0.0
+    index_seconds = 0.0
+    
+    for vector_text in query_vectors:
+        async with conn.transaction():
+            # Exact: sequential scan over every vector
+            await conn.execute("SET LOCAL enable_indexscan = off")
+            start = time.perf_counter()
+            exact_ids = {row['product_id'] for row in await conn.fetch(query, vector_text)}
+            exact_seconds += time.perf_counter() - start
+        
+        async with conn.transaction():
+            # Approximate: force the vector index even on small tables
+            await conn.execute("SET LOCAL enable_seqscan = off")
+            for setting, value in search.items():
+                await conn.execute(f"SET LOCAL {setting} = {value}")
+            start = time.perf_counter()
+            index_ids = {row['product_id'] for row in await conn.fetch(query, vector_text)}
+            index_seconds += time.perf_counter() - start
+        
+        if exact_ids:
+            recall_total += len(exact_ids & index_ids) / len(exact_ids)
+    
+    return {
+        'recall': recall_total / len(samples),
+        'queries': len(samples),
+        'exact_ms': 1000 * exact_seconds / len(samples),
+        'index_ms': 1000 * index_seconds / len(samples),
+    }
+
+async def build_vector_indexes(conn, method: str = 'auto',
+                               maintenance_work_mem: str = DEFAULT_MAINTENANCE_WORK_MEM,
+                               parallel_workers: int = PARALLEL_MAINTENANCE_WORKERS,
+                               sample_queries: int = RECALL_SAMPLE_QUERIES) -> List[Dict]:
+    """
+    (Re)build the embedding vector indexes sized from the loaded row counts.
+    
+    Run after the embeddings are loaded: ivfflat lists are trained on the rows
+    present at build time and HNSW parameters depend on table size. Reports
+    build time and recall@10 against exact search.
+    """
+    results = []
+    await conn.execute(f"SET maintenance_work_mem = '{maintenance_work_mem}'")
+    await conn.execute(f"SET max_parallel_maintenance_workers = {parallel_workers}")
+    
+    for name, table, column in VECTOR_INDEXES:
+        try:
+            row_count = await conn.fetchval(f"SELECT COUNT(*) FROM {SCHEMA_NAME}.{table} WHERE {column} IS NOT NULL")
+            choice = choose_vector_index(row_count, method)
+            with_clause = ', '.join(f"{key} = {value}" for key, value in choice['with'].items())
+            
+            start = time.perf_counter()
+            await conn.execute(f"DROP INDEX IF EXISTS {SCHEMA_NAME}.{name}")
+            await conn.execute(f"""
+                CREATE INDEX {name} ON {SCHEMA_NAME}.{table}
+                USING {choice['method']} ({column} vector_cosine_ops) WITH ({with_clause})
+            """)
+            build_seconds = time.perf_counter() - start
+            
+            recall = await measure_vector_recall(conn, table, column, choice['search'], sample_queries)
+            results.append({'index': name, 'table': table, 'rows': row_count, **choice,
+                            'build_seconds': build_seconds, **recall})
         except Exception as e:
-            logging.warning(f"Could not create product description embeddings vector index: {e}")
-        
-        # Covering indexes for aggregation queries
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_order_items_covering ON {SCHEMA_NAME}.order_items(order_id, store_id, product_id, total_amount, quantity)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_products_covering ON {SCHEMA_NAME}.products(category_id, type_id, product_id, sku, cost, base_price)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_products_sku_covering ON {SCHEMA_NAME}.products(sku, product_id, product_name, cost, base_price)")
-        
-        # Customer indexes
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_customers_email ON {SCHEMA_NAME}.customers(email)")
-        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_customers_primary_store ON {SCHEMA_NAME}.customers(primary_store_id)")
-        
-        logging.info("Performance indexes created successfully!")
+            logging.warning(f"Could not create vector index {name}: {e}")
+    
+    if results:
+        logging.info(f"\n🧭 VECTOR INDEXES (recall@{RECALL_K} vs exact search):")
+        for r in results:
+            params = ', '.join(f"{key}={value}" for key, value in {**r['with'], **r['search']}.items())
+            recall = f"{r['recall']:.3f}" if r['recall'] is not None else "n/a"
+            logging.info(f"   {r['table']}: {r['rows']:,} rows → {r['method']} ({params})")
+            logging.info(f"      Build: {r['build_seconds']:.2f}s   Recall@{RECALL_K}: {recall} over {r['queries']} queries   "
+                         f"Query: {r['index_ms']:.1f} ms indexed vs {r['exact_ms']:.1f} ms exact")
+    return results
+
+# Store manager RLS policy styles (--rls-policy)
+# session: the manager's store_ids are resolved once per statement by
+#          retail.rls_store_ids() (an InitPlan), so policies are plain store_id = ANY (array)
+# exists:  original per-row EXISTS lookup against stores (kept for comparison)
+RLS_POLICY_MODES = ('session', 'exists')
+DEFAULT_RLS_POLICY = 'session'
+
+# Store-scoped tables: (table, policy_name, store column)
+STORE_SCOPED_POLICIES = [
+    ('orders', 'store_manager_orders', 'store_id'),
+    ('order_items', 'store_manager_order_items', 'store_id'),
+    ('inventory', 'store_manager_inventory', 'store_id'),
+    ('customers', 'store_manager_customers', 'primary_store_id'),
+]
+
+async def create_rls_functions(conn):
+    """
+    Create the STABLE helpers the session policies call.
+    
+    rls_store_ids() maps app.current_rls_user_id to the store_ids of every
+    store the manager runs, comparing UUIDs (so the lookup can use an index)
+    and returning NULL for an unset or malformed setting. SECURITY DEFINER lets it read stores
+    whatever the caller's own policies are.
+    """
+    await conn.execute(f"""
+        CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.rls_is_super_manager() RETURNS BOOLEAN
+        LANGUAGE sql STABLE PARALLEL SAFE
+        AS $$
+            SELECT COALESCE(current_setting('app.current_rls_user_id', true) = '{SUPER_MANAGER_UUID}', false)
+        $$
+    """)
+    await conn.execute(f"""
+        CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.rls_store_ids() RETURNS INTEGER[]
+        LANGUAGE plpgsql STABLE PARALLEL SAFE SECURITY DEFINER
+        SET search_path = pg_catalog
+        AS $$
+        DECLARE
+            user_id TEXT := current_setting('app.current_rls_user_id', true);
+        BEGIN
+            IF user_id IS NULL OR user_id !~* '^[0-9a-f]{{8}}-([0-9a-f]{{4}}-){{3}}[0-9a-f]{{12}}$' THEN
+                RETURN NULL;
+            END IF;
+            RETURN (SELECT array_agg(s.store_id) FROM {SCHEMA_NAME}.stores s WHERE s.rls_user_id = user_id::uuid);
+        END
+        $$
+    """)
+
+async def create_store_manager_policies(conn, rls_policy: str = DEFAULT_RLS_POLICY):
+    """(Re)create the store-scoped policies on orders, order_items, inventory and customers"""
+    if rls_policy not in RLS_POLICY_MODES:
+        raise ValueError(f"Unknown RLS policy style '{rls_policy}' (expected one of: {', '.join(RLS_POLICY_MODES)})")
+    
+    for table, policy, store_column in STORE_SCOPED_POLICIES:
+        if rls_policy == 'session':
+            # Scalar subqueries become InitPlans: evaluated once per statement, not per row
+            condition = f"""
+                (SELECT {SCHEMA_NAME}.rls_is_super_manager())
+                OR {store_column} = ANY ((SELECT {SCHEMA_NAME}.rls_store_ids()))
+            """
+            if table == 'customers':
+                # Also customers who have ordered from the store (hashed subplan, built once)
+                condition += f"""
+                OR customer_id IN (
+                    SELECT o.customer_id FROM {SCHEMA_NAME}.orders o
+                    WHERE o.store_id = ANY ((SELECT {SCHEMA_NAME}.rls_store_ids()))
+                )
+                """
+        else:
+            condition = f"""
+                current_setting('app.current_rls_user_id', true) = '{SUPER_MANAGER_UUID}'
+                OR
+                EXISTS (
+                    SELECT 1 FROM {SCHEMA_NAME}.stores s 
+                    WHERE s.store_id = {SCHEMA_NAME}.{table}.{store_column} 
+                    AND s.rls_user_id::text = current_setting('app.current_rls_user_id', true)
+                )
+            """
+            if table == 'customers':
+                condition += f"""
+                OR
+                EXISTS (
+                    SELECT 1 FROM {SCHEMA_NAME}.orders o
+                    JOIN {SCHEMA_NAME}.stores s ON o.store_id = s.store_id
+                    WHERE o.customer_id = {SCHEMA_NAME}.customers.customer_id
+                    AND s.rls_user_id::text = current_setting('app.current_rls_user_id', true)
+                )
+                """
         
+        await conn.execute(f"DROP POLICY IF EXISTS {policy} ON {SCHEMA_NAME}.{table}")
+        await conn.execute(f"""
+            CREATE POLICY {policy} ON {SCHEMA_NAME}.{table}
+            FOR ALL TO PUBLIC
+            USING ({condition})
+        """)
+    logging.info(f"Created {rls_policy} store manager policies on {len(STORE_SCOPED_POLICIES)} tables")
+
+def rls_benchmark_queries() -> List[Tuple[str, str]]:
+    """execute_sales_query-style aggregates: (label, SQL)"""
+    return [
+        ("Revenue by category", f"""
+            SELECT c.category_name, SUM(oi.total_amount) AS revenue
+            FROM {SCHEMA_NAME}.order_items oi
+            JOIN {SCHEMA_NAME}.products p ON p.product_id = oi.product_id
+            JOIN {SCHEMA_NAME}.categories c ON c.category_id = p.category_id
+            GROUP BY c.category_name ORDER BY revenue DESC"""),
+        ("Monthly orders and revenue", f"""
+            SELECT date_trunc('month', o.order_date) AS month, COUNT(DISTINCT o.order_id), SUM(oi.total_amount)
+            FROM {SCHEMA_NAME}.orders o JOIN {SCHEMA_NAME}.order_items oi ON oi.order_id = o.order_id
+            GROUP BY 1 ORDER BY 1"""),
+        ("Stock value", f"""
+            SELECT SUM(i.stock_level * p.cost) FROM {SCHEMA_NAME}.inventory i
+            JOIN {SCHEMA_NAME}.products p ON p.product_id = i.product_id"""),
+        ("Customer count", f"SELECT COUNT(*) FROM {SCHEMA_NAME}.customers"),
+    ]
+
+async def benchmark_rls_policies(conn, runs: int = 3):
+    """
+    Time store manager aggregates under both policy styles, as a regular
+    manager and as the super manager.
+    
+    Queries run as the store_manager role (the table owner bypasses RLS).
+    The policy style that was in place before is restored afterwards.
+    """
+    session_in_place = await conn.fetchval("""
+        SELECT COUNT(*) > 0 FROM pg_policies
+        WHERE schemaname = $1 AND policyname = 'store_manager_orders' AND qual LIKE '%rls_store_ids%'
+    """, SCHEMA_NAME)
+    original_policy = 'session' if session_in_place else 'exists'
+    
+    manager_id = await conn.fetchval(f"SELECT rls_user_id::text FROM {SCHEMA_NAME}.stores ORDER BY store_id LIMIT 1")
+    users = [("manager", manager_id), ("super manager", SUPER_MANAGER_UUID)]
+    queries = rls_benchmark_queries()
+    await create_rls_functions(conn)
+    
+    results = {}
+    try:
+        for rls_policy in RLS_POLICY_MODES:
+            await create_store_manager_policies(conn, rls_policy)
+            for user_label, user_id in users:
+                for query_label, sql in queries:
+                    samples = []
+                    for run in range(runs + 1):
+                        async with conn.transaction():
+                            await conn.execute("SET LOCAL ROLE store_manager")
+                            await conn.execute("SELECT set_config('app.current_rls_user_id', $1, true)", user_id)
+                            start = time.perf_counter()
+                            await conn.fetch(sql)
+                            if run > 0:  # first run warms the cache
+                                samples.append((time.perf_counter() - start) * 1000)
+                    samples.sort()
+                    results[(rls_policy, user_label, query_label)] = samples[len(samples) // 2]
+    finally:
+        await create_store_manager_policies(conn, original_policy)
+    
+    logging.info("\n🔐 RLS POLICY BENCHMARK (median ms, as store_manager):")
+    logging.info(f"   {'User':<14} {'Query':<30} {'exists':>10} {'session':>10} {'Speedup':>8}")
+    logging.info("   " + "-" * 76)
+    for user_label, _ in users:
+        for query_label, _ in queries:
+            before = results[('exists', user_label, query_label)]
+            after = results[('session', user_label, query_label)]
+            speedup = before / after if after > 0 else 0
+            logging.info(f"   {user_label:<14} {query_label:<30} {before:>10.1f} {after:>10.1f} {speedup:>7.1f}x")
+    logging.info(f"   Restored the {original_policy} policies")
+    return results
+
+async def setup_row_level_security(conn, rls_policy: str = DEFAULT_RLS_POLICY):
+    """Enable Row Level Security, create the store manager policies and grant permissions"""
+    try:
         # Enable Row Level Security (RLS) and create policies
         # Note: All RLS policies include access for SUPER_MANAGER_UUID which bypasses all restrictions
         logging.info("Setting up Row Level Security policies...")
@@ -359,85 +1170,9 @@ async def create_database_schema(conn):
         await conn.execute(f"ALTER TABLE {SCHEMA_NAME}.product_image_embeddings ENABLE ROW LEVEL SECURITY")
         await conn.execute(f"ALTER TABLE {SCHEMA_NAME}.product_description_embeddings ENABLE ROW LEVEL SECURITY")
         
-        # Create RLS policies for orders - store managers can only see orders from their store
-        await conn.execute(f"DROP POLICY IF EXISTS store_manager_orders ON {SCHEMA_NAME}.orders")
-        await conn.execute(f"""
-            CREATE POLICY store_manager_orders ON {SCHEMA_NAME}.orders
-            FOR ALL TO PUBLIC
-            USING (
-                -- Super manager has access to all rows
-                current_setting('app.current_rls_user_id', true) = '{SUPER_MANAGER_UUID}'
-                OR
-                -- Store managers can only see orders from their store
-                EXISTS (
-                    SELECT 1 FROM {SCHEMA_NAME}.stores s 
-                    WHERE s.store_id = {SCHEMA_NAME}.orders.store_id 
-                    AND s.rls_user_id::text = current_setting('app.current_rls_user_id', true)
-                )
-            )
-        """)
-        
-        # Create RLS policies for order_items - direct store access for better performance
-        await conn.execute(f"DROP POLICY IF EXISTS store_manager_order_items ON {SCHEMA_NAME}.order_items")
-        await conn.execute(f"""
-            CREATE POLICY store_manager_order_items ON {SCHEMA_NAME}.order_items
-            FOR ALL TO PUBLIC
-            USING (
-                -- Super manager has access to all rows
-                current_setting('app.current_rls_user_id', true) = '{SUPER_MANAGER_UUID}'
-                OR
-                -- Store managers can only see order items from their store
-                EXISTS (
-                    SELECT 1 FROM {SCHEMA_NAME}.stores s 
-                    WHERE s.store_id = {SCHEMA_NAME}.order_items.store_id 
-                    AND s.rls_user_id::text = current_setting('app.current_rls_user_id', true)
-                )
-            )
-        """)
-        
-        # Create RLS policies for inventory - store managers can only see their store's inventory
-        await conn.execute(f"DROP POLICY IF EXISTS store_manager_inventory ON {SCHEMA_NAME}.inventory")
-        await conn.execute(f"""
-            CREATE POLICY store_manager_inventory ON {SCHEMA_NAME}.inventory
-            FOR ALL TO PUBLIC
-            USING (
-                -- Super manager has access to all rows
-                current_setting('app.current_rls_user_id', true) = '{SUPER_MANAGER_UUID}'
-                OR
-                -- Store managers can only see their store's inventory
-                EXISTS (
-                    SELECT 1 FROM {SCHEMA_NAME}.stores s 
-                    WHERE s.store_id = {SCHEMA_NAME}.inventory.store_id 
-                    AND s.rls_user_id::text = current_setting('app.current_rls_user_id', true)
-                )
-            )
-        """)
-        
-        # For customers, they can only see customers assigned to their store
-        await conn.execute(f"DROP POLICY IF EXISTS store_manager_customers ON {SCHEMA_NAME}.customers")
-        await conn.execute(f"""
-            CREATE POLICY store_manager_customers ON {SCHEMA_NAME}.customers
-            FOR ALL TO PUBLIC
-            USING (
-                -- Super manager has access to all rows
-                current_setting('app.current_rls_user_id', true) = '{SUPER_MANAGER_UUID}'
-                OR
-                -- Store managers can only see customers assigned to their store
-                EXISTS (
-                    SELECT 1 FROM {SCHEMA_NAME}.stores s 
-                    WHERE s.store_id = {SCHEMA_NAME}.customers.primary_store_id 
-                    AND s.rls_user_id::text = current_setting('app.current_rls_user_id', true)
-                )
-                OR
-                -- Also allow access to customers who have ordered from their store (backward compatibility)
-                EXISTS (
-                    SELECT 1 FROM {SCHEMA_NAME}.orders o
-                    JOIN {SCHEMA_NAME}.stores s ON o.store_id = s.store_id
-                    WHERE o.customer_id = {SCHEMA_NAME}.customers.customer_id
-                    AND s.rls_user_id::text = current_setting('app.current_rls_user_id', true)
-                )
-            )
-        """)
+        # Store-scoped policies for orders, order_items, inventory and customers
+        await create_rls_functions(conn)
+        await create_store_manager_policies(conn, rls_policy)
         
         # Create permissive RLS policies for reference tables that all authenticated users should access
         
@@ -494,11 +1229,293 @@ async def create_database_schema(conn):
         # Grant permissions to store_manager role
         await setup_store_manager_permissions(conn)
         
-        logging.info("Database schema created successfully!")
+        logging.info("Row Level Security setup complete!")
     except Exception as e:
-        logging.error(f"Error creating database schema: {e}")
+        logging.error(f"Error setting up Row Level Security: {e}")
         raise
 
+async def create_order_total_triggers(conn):
+    """
+    Keep orders.item_count / subtotal / discount_total / total_amount in step
+    with order_items for writes after the bulk load.
+    
+    recalculate_order_totals(order_ids) recomputes the given orders (all of
+    them when NULL) and doubles as the maintenance procedure. The triggers are
+    statement-level with transition tables, so a multi-row write recomputes
+    each affected order once. They are created after loading because the
+    generator already writes the totals with each order.
+    """
+    await conn.execute(f"""
+        CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.recalculate_order_totals(order_ids INTEGER[] DEFAULT NULL)
+        RETURNS INTEGER
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            updated INTEGER;
+        BEGIN
+            UPDATE {SCHEMA_NAME}.orders o
+            SET item_count = t.item_count,
+                subtotal = t.subtotal,
+                discount_total = t.discount_total,
+                total_amount = t.total_amount
+            FROM (
+                SELECT o2.order_id,
+                       COUNT(oi.order_item_id) AS item_count,
+                       COALESCE(SUM(oi.quantity * oi.unit_price), 0) AS subtotal,
+                       COALESCE(SUM(oi.discount_amount), 0) AS discount_total,
+                       COALESCE(SUM(oi.total_amount), 0) AS total_amount
+                FROM {SCHEMA_NAME}.orders o2
+                LEFT JOIN {SCHEMA_NAME}.order_items oi ON oi.order_id = o2.order_id
+                WHERE order_ids IS NULL OR o2.order_id = ANY(order_ids)
+                GROUP BY o2.order_id
+            ) t
+            WHERE o.order_id = t.order_id
+              AND (o.item_count, o.subtotal, o.discount_total, o.total_amount)
+                  IS DISTINCT FROM (t.item_count, t.subtotal, t.discount_total, t.total_amount);
+            GET DIAGNOSTICS updated = ROW_COUNT;
+            RETURN updated;
+        END
+        $$
+    """)
+    await conn.execute(f"""
+        CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.order_items_refresh_totals()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM {SCHEMA_NAME}.recalculate_order_totals(ARRAY(SELECT DISTINCT order_id FROM new_items));
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM {SCHEMA_NAME}.recalculate_order_totals(ARRAY(SELECT DISTINCT order_id FROM old_items));
+            ELSE
+                PERFORM {SCHEMA_NAME}.recalculate_order_totals(ARRAY(
+                    SELECT order_id FROM new_items UNION SELECT order_id FROM old_items));
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    
+    # Transition tables allow only one event per trigger
+    triggers = [
+        ('order_items_totals_insert', 'INSERT', 'NEW TABLE AS new_items'),
+        ('order_items_totals_update', 'UPDATE', 'NEW TABLE AS new_items OLD TABLE AS old_items'),
+        ('order_items_totals_delete', 'DELETE', 'OLD TABLE AS old_items'),
+    ]
+    for name, event, referencing in triggers:
+        await conn.execute(f"DROP TRIGGER IF EXISTS {name} ON {SCHEMA_NAME}.order_items")
+        await conn.execute(f"""
+            CREATE TRIGGER {name}
+            AFTER {event} ON {SCHEMA_NAME}.order_items
+            REFERENCING {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION {SCHEMA_NAME}.order_items_refresh_totals()
+        """)
+    logging.info(f"Created {len(triggers)} order total triggers on order_items")
+
+# NOTIFY channel for table writes; the sales analysis MCP server drops cached query results on it
+TABLE_CHANGE_CHANNEL = 'zava_table_changed'
+
+# Tables whose writes are counted, each by its own <table>_write_seq sequence
+WRITE_COUNTED_TABLES = [
+    'stores', 'categories', 'product_types', 'products', 'customers', 'orders', 'order_items', 'inventory',
+    'product_image_embeddings', 'product_description_embeddings',
+]
+
+async def create_table_write_counters(conn):
+    """
+    Count writes per table and NOTIFY TABLE_CHANGE_CHANNEL with 'table:count'.
+    
+    Statement-level triggers take nextval() of the table's write sequence per
+    write statement, so a bulk write costs a single increment. Sequences are not
+    transactional, so concurrent writers never wait on each other for the count
+    (an upserted counter row would serialize them until commit). Created after
+    the load so the generator's own inserts are not counted, and after Row Level
+    Security so the store_manager role exists for the grants.
+    """
+    # SECURITY DEFINER so writers need no privileges on the sequences
+    await conn.execute(f"""
+        CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.bump_table_write_counter()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        SECURITY DEFINER
+        SET search_path = pg_catalog
+        AS $$
+        BEGIN
+            PERFORM pg_notify('{TABLE_CHANGE_CHANNEL}', TG_TABLE_NAME || ':' ||
+                nextval(format('%I.%I', TG_TABLE_SCHEMA, TG_TABLE_NAME || '_write_seq')::regclass));
+            RETURN NULL;
+        END
+        $$
+    """)
+    
+    for table in WRITE_COUNTED_TABLES:
+        await conn.execute(f"CREATE SEQUENCE IF NOT EXISTS {SCHEMA_NAME}.{table}_write_seq")
+        await conn.execute(f"GRANT SELECT ON {SCHEMA_NAME}.{table}_write_seq TO store_manager")
+        await conn.execute(f"DROP TRIGGER IF EXISTS {table}_write_counter ON {SCHEMA_NAME}.{table}")
+        await conn.execute(f"""
+            CREATE TRIGGER {table}_write_counter
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {SCHEMA_NAME}.{table}
+            FOR EACH STATEMENT EXECUTE FUNCTION {SCHEMA_NAME}.bump_table_write_counter()
+        """)
+    logging.info(f"Created write counter triggers on {len(WRITE_COUNTED_TABLES)} tables (NOTIFY {TABLE_CHANGE_CHANNEL})")
+
+# Materialized sales summaries and the security-barrier views store managers query:
+# materialized view -> (wrapper view, unique key columns)
+SALES_SUMMARY_VIEWS = {
+    'mv_sales_by_category_month': ('sales_by_category_month', 'store_id, category_id, type_id, month'),
+    'mv_sales_by_product_month': ('sales_by_product_month', 'store_id, product_id, month'),
+}
+
+async def create_sales_summary_views(conn):
+    """
+    Create the monthly sales summaries and their RLS wrapper views.
+    
+    Materialized views cannot carry RLS policies, so store managers only get
+    SELECT on the security_barrier wrappers, which apply the same
+    rls_store_ids() filter as the table policies. The unique indexes allow
+    REFRESH MATERIALIZED VIEW CONCURRENTLY.
+    """
+    # order_count counts an order once per product type it touches
+    await conn.execute(f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS {SCHEMA_NAME}.mv_sales_by_category_month AS
+        SELECT oi.store_id, p.category_id, p.type_id,
+               date_trunc('month', oi.order_date)::date AS month,
+               COUNT(DISTINCT oi.order_id) AS order_count,
+               COUNT(*) AS item_count,
+               SUM(oi.quantity) AS units_sold,
+               SUM(oi.total_amount) AS revenue,
+               SUM(oi.discount_amount) AS discount_total,
+               SUM(oi.quantity * p.cost) AS cost_total
+        FROM {SCHEMA_NAME}.order_items oi
+        JOIN {SCHEMA_NAME}.products p ON p.product_id = oi.product_id
+        GROUP BY oi.store_id, p.category_id, p.type_id, date_trunc('month', oi.order_date)
+    """)
+    await conn.execute(f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS {SCHEMA_NAME}.mv_sales_by_product_month AS
+        SELECT oi.store_id, oi.product_id,
+               date_trunc('month', oi.order_date)::date AS month,
+               COUNT(DISTINCT oi.order_id) AS order_count,
+               SUM(oi.quantity) AS units_sold,
+               SUM(oi.total_amount) AS revenue,
+               SUM(oi.discount_amount) AS discount_total
+        FROM {SCHEMA_NAME}.order_items oi
+        GROUP BY oi.store_id, oi.product_id, date_trunc('month', oi.order_date)
+    """)
+    
+    for view, (_, key_columns) in SALES_SUMMARY_VIEWS.items():
+        await conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {view}_key ON {SCHEMA_NAME}.{view} ({key_columns})")
+        await conn.execute(f"CREATE INDEX IF NOT EXISTS {view}_month ON {SCHEMA_NAME}.{view} (month)")
+    
+    rls_filter = f"(SELECT {SCHEMA_NAME}.rls_is_super_manager()) OR m.store_id = ANY ((SELECT {SCHEMA_NAME}.rls_store_ids()))"
+    await conn.execute(f"""
+        CREATE OR REPLACE VIEW {SCHEMA_NAME}.sales_by_category_month WITH (security_barrier = true) AS
+        SELECT m.store_id, s.store_name, m.category_id, c.category_name, m.type_id, pt.type_name, m.month,
+               m.order_count, m.item_count, m.units_sold, m.revenue, m.discount_total, m.cost_total
+        FROM {SCHEMA_NAME}.mv_sales_by_category_month m
+        JOIN {SCHEMA_NAME}.stores s ON s.store_id = m.store_id
+        JOIN {SCHEMA_NAME}.categories c ON c.category_id = m.category_id
+        JOIN {SCHEMA_NAME}.product_types pt ON pt.type_id = m.type_id
+        WHERE {rls_filter}
+    """)
+    await conn.execute(f"""
+        CREATE OR REPLACE VIEW {SCHEMA_NAME}.sales_by_product_month WITH (security_barrier = true) AS
+        SELECT m.store_id, s.store_name, m.product_id, p.sku, p.product_name, p.category_id, p.type_id, m.month,
+               m.order_count, m.units_sold, m.revenue, m.discount_total
+        FROM {SCHEMA_NAME}.mv_sales_by_product_month m
+        JOIN {SCHEMA_NAME}.stores s ON s.store_id = m.store_id
+        JOIN {SCHEMA_NAME}.products p ON p.product_id = m.product_id
+        WHERE {rls_filter}
+    """)
+    
+    for view, (wrapper, _) in SALES_SUMMARY_VIEWS.items():
+        # Default privileges would otherwise expose the unfiltered materialized view
+        await conn.execute(f"REVOKE ALL ON {SCHEMA_NAME}.{view} FROM PUBLIC, store_manager")
+        await conn.execute(f"GRANT SELECT ON {SCHEMA_NAME}.{wrapper} TO store_manager")
+        await conn.execute(f"ANALYZE {SCHEMA_NAME}.{view}")
+    logging.info(f"Created {len(SALES_SUMMARY_VIEWS)} sales summary views: "
+                 f"{', '.join(wrapper for wrapper, _ in SALES_SUMMARY_VIEWS.values())}")
+
+async def refresh_sales_summaries(conn, concurrently: bool = True):
+    """Refresh the sales summary materialized views (CONCURRENTLY keeps them readable meanwhile)"""
+    mode = "CONCURRENTLY " if concurrently else ""
+    for view in SALES_SUMMARY_VIEWS:
+        start = time.perf_counter()
+        await conn.execute(f"REFRESH MATERIALIZED VIEW {mode}{SCHEMA_NAME}.{view}")
+        await conn.execute(f"ANALYZE {SCHEMA_NAME}.{view}")
+        logging.info(f"  Refreshed {view} in {time.perf_counter() - start:.2f}s")
+
+# NOTIFY channel the sales analysis MCP server listens on to drop its cached table schemas
+SCHEMA_CHANGE_CHANNEL = 'zava_schema_changed'
+
+async def create_schema_change_notifier(conn):
+    """
+    NOTIFY SCHEMA_CHANGE_CHANNEL after any DDL that touches the retail schema.
+    
+    The payload is a comma-separated list of the affected object identities.
+    Event triggers are database-wide and can only be created by a superuser,
+    so a failure is logged rather than raised; listeners then rely on their
+    cache TTL alone.
+    """
+    try:
+        await conn.execute(f"""
+            CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.notify_schema_change()
+            RETURNS event_trigger
+            LANGUAGE plpgsql
+            AS $$
+            DECLARE
+                objects TEXT;
+            BEGIN
+                IF TG_EVENT = 'sql_drop' THEN
+                    SELECT string_agg(object_identity, ',') INTO objects
+                    FROM pg_event_trigger_dropped_objects()
+                    WHERE schema_name = '{SCHEMA_NAME}';
+                ELSE
+                    SELECT string_agg(object_identity, ',') INTO objects
+                    FROM pg_event_trigger_ddl_commands()
+                    WHERE schema_name = '{SCHEMA_NAME}';
+                END IF;
+                IF objects IS NOT NULL THEN
+                    -- NOTIFY payloads are limited to 8000 bytes
+                    PERFORM pg_notify('{SCHEMA_CHANGE_CHANNEL}', left(objects, 7900));
+                END IF;
+            END
+            $$
+        """)
+        
+        event_triggers = [
+            (f'{SCHEMA_NAME}_schema_ddl_end', 'ddl_command_end'),
+            (f'{SCHEMA_NAME}_schema_sql_drop', 'sql_drop'),
+        ]
+        for name, event in event_triggers:
+            await conn.execute(f"DROP EVENT TRIGGER IF EXISTS {name}")
+            await conn.execute(f"""
+                CREATE EVENT TRIGGER {name} ON {event}
+                EXECUTE FUNCTION {SCHEMA_NAME}.notify_schema_change()
+            """)
+        logging.info(f"Created schema change event triggers (NOTIFY {SCHEMA_CHANGE_CHANNEL})")
+    except Exception as e:
+        logging.warning(f"Could not create schema change event triggers: {e}")
+
+async def build_post_load_objects(conn, index_workers: int = DEFAULT_INDEX_WORKERS,
+                                  maintenance_work_mem: str = DEFAULT_MAINTENANCE_WORK_MEM,
+                                  vector_index: str = 'auto', order_partitioning: str = 'none',
+                                  index_profile: str = DEFAULT_INDEX_PROFILE, rls_policy: str = DEFAULT_RLS_POLICY):
+    """Keys, indexes, foreign keys, RLS and statistics, each as a separately timed phase"""
+    await timed_phase("Primary keys and unique constraints",
+                      add_key_constraints(conn, maintenance_work_mem, order_partitioning))
+    await timed_phase("Indexes (parallel)", build_indexes_parallel(index_workers, maintenance_work_mem,
+                                                                      index_profile, order_partitioning))
+    await timed_phase("Vector indexes", build_vector_indexes(conn, vector_index, maintenance_work_mem))
+    await timed_phase("Foreign keys", add_foreign_keys(conn, order_partitioning))
+    await timed_phase("Order total triggers", create_order_total_triggers(conn))
+    await timed_phase("Row Level Security", setup_row_level_security(conn, rls_policy))
+    if order_partitioning != 'none':
+        await timed_phase("Partition isolation check", verify_partition_isolation(conn))
+    await timed_phase("Table write counters", create_table_write_counters(conn))
+    await timed_phase("Sales summary views", create_sales_summary_views(conn))
+    await timed_phase("Schema change notifications", create_schema_change_notifier(conn))
+    await timed_phase("ANALYZE", analyze_tables(conn))
+
 async def setup_store_manager_permissions(conn):
     """Setup permissions for store_manager user to access the retail schema and tables"""
     try:
@@ -528,6 +1545,9 @@ async def setup_store_manager_permissions(conn):
         await conn.execute(f"ALTER DEFAULT PRIVILEGES IN SCHEMA {SCHEMA_NAME} GRANT SELECT ON TABLES TO store_manager")
         await conn.execute(f"ALTER DEFAULT PRIVILEGES IN SCHEMA {SCHEMA_NAME} GRANT USAGE ON SEQUENCES TO store_manager")
         
+        # Partitions carry no RLS policies of their own, so managers may only read them through the parent
+        await restrict_partition_access(conn)
+        
         # Do not grant INSERT, UPDATE, DELETE permissions to store_manager (SELECT only)
         
         logging.info("Store manager permissions granted successfully!")
@@ -540,13 +1560,177 @@ async def setup_store_manager_permissions(conn):
         logging.error(f"Error setting up store_manager permissions: {e}")
         raise
 
+async def restrict_partition_access(conn):
+    """
+    Revoke direct access to every table partition in the retail schema.
+    
+    PostgreSQL applies a parent's RLS policies only to queries on the parent,
+    so SELECT on a partition such as orders_y2025m01 would return every
+    store's rows. The schema-wide grant and default privileges cover
+    partitions too; revoke_partition_privileges() takes them back, now and
+    (through an event trigger) for partitions created or attached later.
+    """
+    await conn.execute(f"""
+        CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.revoke_partition_privileges() RETURNS INTEGER
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            part REGCLASS;
+            revoked INTEGER := 0;
+        BEGIN
+            FOR part IN
+                SELECT c.oid::regclass FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = '{SCHEMA_NAME}' AND c.relispartition AND c.relkind IN ('r', 'p')
+                  AND has_table_privilege('store_manager', c.oid, 'SELECT')
+            LOOP
+                EXECUTE format('REVOKE ALL ON %s FROM PUBLIC, store_manager', part);
+                revoked := revoked + 1;
+            END LOOP;
+            RETURN revoked;
+        END
+        $$
+    """)
+    revoked = await conn.fetchval(f"SELECT {SCHEMA_NAME}.revoke_partition_privileges()")
+    logging.info(f"Revoked direct store_manager access to {revoked} table partitions")
+    
+    # Event triggers are database-wide and need a superuser, as for the schema change notifier
+    try:
+        await conn.execute(f"""
+            CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.revoke_new_partition_privileges()
+            RETURNS event_trigger
+            LANGUAGE plpgsql
+            AS $$
+            BEGIN
+                PERFORM {SCHEMA_NAME}.revoke_partition_privileges();
+            END
+            $$
+        """)
+        await conn.execute(f"DROP EVENT TRIGGER IF EXISTS {SCHEMA_NAME}_partition_privileges")
+        await conn.execute(f"""
+            CREATE EVENT TRIGGER {SCHEMA_NAME}_partition_privileges ON ddl_command_end
+            WHEN TAG IN ('CREATE TABLE', 'ALTER TABLE')
+            EXECUTE FUNCTION {SCHEMA_NAME}.revoke_new_partition_privileges()
+        """)
+    except Exception as e:
+        logging.warning(f"Could not create the partition privileges event trigger; "
+                        f"run SELECT {SCHEMA_NAME}.revoke_partition_privileges() after adding partitions: {e}")
+
+async def verify_partition_isolation(conn):
+    """
+    Check, as store_manager acting for one manager, that no order partition
+    can be read directly for another store's rows.
+    
+    A partition is isolated when the SELECT is denied or returns only the
+    manager's own stores. Raises if any partition leaks.
+    """
+    manager_id = await conn.fetchval(f"SELECT rls_user_id::text FROM {SCHEMA_NAME}.stores ORDER BY store_id LIMIT 1")
+    own_stores = {row['store_id'] for row in await conn.fetch(
+        f"SELECT store_id FROM {SCHEMA_NAME}.stores WHERE rls_user_id::text = $1", manager_id)}
+    partitions = await conn.fetch("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_namespace n ON n.oid = parent.relnamespace
+        WHERE n.nspname = $1 AND parent.relname IN ('orders', 'order_items')
+        ORDER BY c.relname
+    """, SCHEMA_NAME)
+    
+    denied = 0
+    leaking = []
+    for row in partitions:
+        partition = row['relname']
+        try:
+            async with conn.transaction():
+                await conn.execute("SET LOCAL ROLE store_manager")
+                await conn.execute("SELECT set_config('app.current_rls_user_id', $1, true)", manager_id)
+                stores = {r['store_id'] for r in await conn.fetch(
+                    f"SELECT DISTINCT store_id FROM {SCHEMA_NAME}.{partition}")}
+        except asyncpg.InsufficientPrivilegeError:
+            denied += 1
+            continue
+        if stores - own_stores:
+            leaking.append(partition)
+    
+    if leaking:
+        raise RuntimeError(f"store_manager can read other stores' rows from partitions: {', '.join(leaking)}")
+    logging.info(f"✅ Partition isolation: {len(partitions)} order partitions checked, {denied} denied, "
+                 f"none return another store's rows")
+
 async def batch_insert(conn, query: str, data: List[Tuple], batch_size: int = 1000):
     """Insert data in batches using asyncio"""
     for i in range(0, len(data), batch_size):
         batch = data[i:i + batch_size]
         await conn.executemany(query, batch)
 
-async def insert_customers(conn, num_customers: int = 100000):
+async def bulk_load(conn, table: str, columns: List[str], records: Iterable[Tuple],
+                    loader: str = DEFAULT_LOADER, batch_size: int = 1000, timing_table: Optional[str] = None) -> int:
+    """
+    Load rows into a table in the retail schema and record the timing (under
+    timing_table when given, e.g. the parent of a partition).
+
+    records can be any iterable, including a generator, so callers never need to
+    materialize a full table in memory. Returns the number of rows loaded.
+    """
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    start = time.perf_counter()
+    if loader == 'copy':
+        await conn.copy_records_to_table(table, records=counted(records), columns=columns, schema_name=SCHEMA_NAME)
+    elif loader == 'executemany':
+        placeholders = ', '.join(f"${i}" for i in range(1, len(columns) + 1))
+        query = f"INSERT INTO {SCHEMA_NAME}.{table} ({', '.join(columns)}) VALUES ({placeholders})"
+        batch = []
+        for row in counted(records):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                await conn.executemany(query, batch)
+                batch = []
+        if batch:
+            await conn.executemany(query, batch)
+    else:
+        raise ValueError(f"Unknown loader '{loader}' (expected one of: {', '.join(BULK_LOADERS)})")
+    elapsed = time.perf_counter() - start
+
+    timing = load_timings.setdefault(timing_table or table, {'rows': 0, 'seconds': 0.0, 'calls': 0})
+    timing['rows'] += count
+    timing['seconds'] += elapsed
+    timing['calls'] += 1
+    return count
+
+def merge_load_timings(timings: Dict[str, Dict[str, float]]):
+    """Add load timings recorded elsewhere (a worker process) to this build's"""
+    for table, timing in timings.items():
+        total = load_timings.setdefault(table, {'rows': 0, 'seconds': 0.0, 'calls': 0})
+        for key in total:
+            total[key] += timing[key]
+
+def log_load_timings(loader: str):
+    """Log rows, time and throughput per table for the bulk loads of this build"""
+    if not load_timings:
+        return
+    
+    logging.info(f"\n⏱️  BULK LOAD TIMINGS (loader: {loader}):")
+    logging.info("   Table                 Rows    Seconds      Rows/sec")
+    logging.info("   " + "-" * 52)
+    total_rows = 0
+    total_seconds = 0.0
+    for table, timing in load_timings.items():
+        rate = timing['rows'] / timing['seconds'] if timing['seconds'] > 0 else 0
+        logging.info(f"   {table:<16} {timing['rows']:>9,} {timing['seconds']:>10.2f} {rate:>13,.0f}")
+        total_rows += timing['rows']
+        total_seconds += timing['seconds']
+    rate = total_rows / total_seconds if total_seconds > 0 else 0
+    logging.info("   " + "-" * 52)
+    logging.info(f"   {'Total':<16} {total_rows:>9,} {total_seconds:>10.2f} {rate:>13,.0f}")
+
+async def insert_customers(conn, num_customers: int = 100000, loader: str = DEFAULT_LOADER):
     """Insert customer data into the database"""
     try:
         logging.info(f"Generating {num_customers:,} customers...")
@@ -558,30 +1742,30 @@ async def insert_customers(conn, num_customers: int = 100000):
         if not store_ids:
             raise Exception("No stores found! Please insert stores first.")
         
-        customers_data = []
-        
-        for i in range(1, num_customers + 1):
-            first_name = fake.first_name().replace("'", "''")  # Escape single quotes
-            last_name = fake.last_name().replace("'", "''")
-            email = f"{first_name.lower()}.{last_name.lower()}.{i}@example.com"
-            phone = generate_phone_number()
-            
-            # Assign every customer to a store based on weighted distribution
-            # Use the same weighted store choice as orders for consistency
-            preferred_store_name = weighted_store_choice()
-            primary_store_id = None
-            for row in store_rows:
-                if row['store_name'] == preferred_store_name:
-                    primary_store_id = row['store_id']
-                    break
-            
-            # Fallback to first store if lookup fails (should not happen)
-            if primary_store_id is None:
-                primary_store_id = store_rows[0]['store_id']
-            
-            customers_data.append((first_name, last_name, email, phone, primary_store_id))
+        def customer_rows():
+            for i in range(1, num_customers + 1):
+                first_name = fake.first_name().replace("'", "''")  # Escape single quotes
+                last_name = fake.last_name().replace("'", "''")
+                email = f"{first_name.lower()}.{last_name.lower()}.{i}@example.com"
+                phone = generate_phone_number()
+                
+                # Assign every customer to a store based on weighted distribution
+                # Use the same weighted store choice as orders for consistency
+                preferred_store_name = weighted_store_choice()
+                primary_store_id = None
+                for row in store_rows:
+                    if row['store_name'] == preferred_store_name:
+                        primary_store_id = row['store_id']
+                        break
+                
+                # Fallback to first store if lookup fails (should not happen)
+                if primary_store_id is None:
+                    primary_store_id = store_rows[0]['store_id']
+                
+                yield (first_name, last_name, email, phone, primary_store_id)
         
-        await batch_insert(conn, f"INSERT INTO {SCHEMA_NAME}.customers (first_name, last_name, email, phone, primary_store_id) VALUES ($1, $2, $3, $4, $5)", customers_data)
+        await bulk_load(conn, 'customers', ['first_name', 'last_name', 'email', 'phone', 'primary_store_id'],
+                        customer_rows(), loader)
         
         # Log customer distribution by store
         distribution = await conn.fetch(f"""
@@ -615,7 +1799,7 @@ async def insert_stores(conn):
         
         stores_data = []
         
-        for store_name, store_config in stores.items():
+        for store_name, store_config in get_stores().items():
             # Determine if this is an online store
             is_online = "online" in store_name.lower()
             # Get the fixed UUID from the reference data
@@ -645,7 +1829,7 @@ async def insert_categories(conn):
         categories_data = []
         
         # Extract unique categories from product data
-        for main_category in main_categories.keys():
+        for main_category in get_main_categories().keys():
             categories_data.append((main_category,))
         
         await batch_insert(conn, f"INSERT INTO {SCHEMA_NAME}.categories (category_name) VALUES ($1)", categories_data)
@@ -669,7 +1853,7 @@ async def insert_product_types(conn):
             category_mapping[row['category_name']] = row['category_id']
         
         # Extract product types for each category
-        for main_category, subcategories in main_categories.items():
+        for main_category, subcategories in get_main_categories().items():
             category_id = category_mapping[main_category]
             for subcategory in subcategories.keys():
                 # Skip the seasonal multipliers key
@@ -703,7 +1887,7 @@ async def insert_products(conn):
         
         products_data = []
         
-        for main_category, subcategories in main_categories.items():
+        for main_category, subcategories in get_main_categories().items():
             category_id = category_mapping[main_category]
             
             for subcategory, product_list in subcategories.items():
@@ -721,17 +1905,13 @@ async def insert_products(conn):
                     
                 for product_details in product_list:
                     product_name = product_details["name"]
-                    sku = product_details.get("sku", f"SKU{len(products_data)+1:06d}")  # Fallback if no SKU
+                    sku = product_sku(product_details, len(products_data) + 1)  # Fallback if no SKU
                     json_price = product_details["price"]
                     description = product_details["description"]
                     
-                    # Treat the JSON price as the cost
+                    # Treat the JSON price as the cost, sold at a 33% gross margin
                     cost = float(json_price)
-                    
-                    # Calculate selling price for 33% gross margin
-                    # Gross Margin = (Selling Price - Cost) / Selling Price = 0.33
-                    # Therefore: Selling Price = Cost / (1 - 0.33) = Cost / 0.67
-                    base_price = round(cost / 0.67, 2)
+                    base_price = selling_price(cost)
                     
                     products_data.append((sku, product_name, category_id, type_id, cost, base_price, description))
         
@@ -745,7 +1925,7 @@ async def insert_products(conn):
 
 def get_store_multipliers(store_name):
     """Get order frequency multipliers based on store name"""
-    store_data = stores.get(store_name, {
+    store_data = get_stores().get(store_name, {
         'customer_distribution_weight': 1,
         'order_frequency_multiplier': 1.0, 
         'order_value_multiplier': 1.0
@@ -754,25 +1934,20 @@ def get_store_multipliers(store_name):
 
 def get_yearly_weight(year):
     """Get the weight for each year to create growth pattern"""
-    return reference_data['year_weights'].get(str(year), 1.0)
+    return get_reference_data()['year_weights'].get(str(year), 1.0)
 
 def weighted_year_choice():
     """Choose a year based on growth pattern weights"""
-    years = [2020, 2021, 2022, 2023, 2024, 2025, 2026]
+    years = ORDER_YEARS
     weights = [get_yearly_weight(year) for year in years]
     return random.choices(years, weights=weights, k=1)[0]
 
-async def get_store_id_by_name(conn, store_name):
-    """Get store_id for a given store name"""
-    row = await conn.fetchrow(f"SELECT store_id FROM {SCHEMA_NAME}.stores WHERE store_name = $1", store_name)
-    return row['store_id'] if row else 1  # Default to store_id 1 if not found
-
 def choose_seasonal_product_category(month):
     """Choose a category based on Washington State seasonal multipliers"""
     categories = []
     weights = []
     
-    for category_name, category_data in main_categories.items():
+    for category_name, category_data in get_main_categories().items():
         # Skip if no seasonal multipliers defined for this category
         if 'washington_seasonal_multipliers' not in category_data:
             categories.append(category_name)
@@ -789,8 +1964,9 @@ def choose_seasonal_product_category(month):
 def choose_product_type(main_category):
     """Choose a product type within a category with equal weights"""
     product_types = []
-    for key in main_categories[main_category].keys():
-        if isinstance(main_categories[main_category][key], list):
+    category_data = get_main_categories()[main_category]
+    for key in category_data.keys():
+        if isinstance(category_data[key], list):
             product_types.append(key)
     
     if not product_types:
@@ -827,44 +2003,21 @@ def extract_products_with_embeddings(product_data: Dict) -> List[Tuple[str, str,
     logging.info(f"Found {len(products_with_embeddings)} products with embeddings")
     return products_with_embeddings
 
-async def get_product_id_by_sku(conn: asyncpg.Connection, sku: str) -> Optional[int]:
-    """Get product_id for a given SKU"""
-    try:
-        result = await conn.fetchval(
-            f"SELECT product_id FROM {SCHEMA_NAME}.products WHERE sku = $1",
-            sku
-        )
-        return result
-    except Exception as e:
-        logging.error(f"Error getting product_id for SKU {sku}: {e}")
-        return None
+async def get_product_ids_by_sku(conn: asyncpg.Connection) -> Dict[str, int]:
+    """Fetch the full SKU → product_id map in one query"""
+    rows = await conn.fetch(f"SELECT sku, product_id FROM {SCHEMA_NAME}.products")
+    return {row['sku']: row['product_id'] for row in rows}
 
-async def insert_product_embedding(
-    conn: asyncpg.Connection, 
-    product_id: int, 
-    image_path: str, 
-    image_embedding: List[float]
-) -> bool:
-    """Insert a product embedding record"""
-    try:
-        # Store just the image filename without any path prefix
-        image_url = os.path.basename(image_path)
-        
-        # Convert the embedding list to a vector string format
-        embedding_str = f"[{','.join([str(x) for x in image_embedding])}]"
-        
-        await conn.execute(
-            f"""
-            INSERT INTO {SCHEMA_NAME}.product_image_embeddings 
-            (product_id, image_url, image_embedding) 
-            VALUES ($1, $2, $3::vector)
-            """,
-            product_id, image_url, embedding_str
-        )
-        return True
-    except Exception as e:
-        logging.error(f"Error inserting embedding for product_id {product_id}: {e}")
-        return False
+async def copy_embeddings(conn: asyncpg.Connection, table: str, columns: List[str],
+                          rows: Iterable[Tuple]) -> int:
+    """
+    Stream embedding rows into a table with binary COPY.
+    
+    Vectors are passed as NumPy float32 arrays and encoded by the pgvector
+    binary codec, so no text literals are built and there is one COPY per table.
+    """
+    await register_vector(conn)
+    return await bulk_load(conn, table, columns, rows, 'copy')
 
 async def clear_existing_embeddings(conn: asyncpg.Connection) -> None:
     """Clear all existing product image embeddings"""
@@ -875,11 +2028,11 @@ async def clear_existing_embeddings(conn: asyncpg.Connection) -> None:
         logging.error(f"Error clearing existing embeddings: {e}")
         raise
 
-async def populate_product_image_embeddings(conn: asyncpg.Connection, clear_existing: bool = False, batch_size: int = 100) -> None:
+async def populate_product_image_embeddings(conn: asyncpg.Connection, clear_existing: bool = False) -> None:
     """Populate product image embeddings from product_data.json"""
     
     logging.info("Loading product data for embeddings...")
-    products_with_embeddings = extract_products_with_embeddings(product_data)
+    products_with_embeddings = extract_products_with_embeddings(get_product_data())
     
     if not products_with_embeddings:
         logging.warning("No products with embeddings found in the data")
@@ -891,36 +2044,28 @@ async def populate_product_image_embeddings(conn: asyncpg.Connection, clear_exis
             logging.info("Clearing existing product embeddings...")
             await clear_existing_embeddings(conn)
         
-        # Process products in batches
-        inserted_count = 0
+        sku_map = await get_product_ids_by_sku(conn)
         skipped_count = 0
-        error_count = 0
         
-        for i in range(0, len(products_with_embeddings), batch_size):
-            batch = products_with_embeddings[i:i + batch_size]
-            
-            logging.info(f"Processing embeddings batch {i//batch_size + 1}/{(len(products_with_embeddings) + batch_size - 1)//batch_size}")
-            
-            for sku, image_path, image_embedding in batch:
-                # Get product_id for this SKU
-                product_id = await get_product_id_by_sku(conn, sku)
-                
+        def embedding_rows():
+            nonlocal skipped_count
+            for sku, image_path, image_embedding in products_with_embeddings:
+                product_id = sku_map.get(sku)
                 if product_id is None:
                     logging.debug(f"Product not found for SKU: {sku}")
                     skipped_count += 1
                     continue
-                
-                # Insert the embedding
-                if await insert_product_embedding(conn, product_id, image_path, image_embedding):
-                    inserted_count += 1
-                else:
-                    error_count += 1
+                # Store just the image filename without any path prefix
+                yield (product_id, os.path.basename(image_path), np.asarray(image_embedding, dtype=np.float32))
+        
+        inserted_count = await copy_embeddings(conn, 'product_image_embeddings',
+                                               ['product_id', 'image_url', 'image_embedding'],
+                                               embedding_rows())
         
         # Summary
         logging.info("Product embeddings population complete!")
         logging.info(f"  Inserted: {inserted_count}")
         logging.info(f"  Skipped (product not found): {skipped_count}")
-        logging.info(f"  Errors: {error_count}")
         logging.info(f"  Total processed: {len(products_with_embeddings)}")
         
     except Exception as e:
@@ -1000,29 +2145,6 @@ def extract_products_with_description_embeddings(product_data: Dict) -> List[Tup
     logging.info(f"Found {len(products_with_description_embeddings)} products with description embeddings")
     return products_with_description_embeddings
 
-async def insert_product_description_embedding(
-    conn: asyncpg.Connection, 
-    product_id: int, 
-    description_embedding: List[float]
-) -> bool:
-    """Insert a product description embedding record"""
-    try:
-        # Convert the embedding list to a vector string format
-        embedding_str = f"[{','.join([str(x) for x in description_embedding])}]"
-        
-        await conn.execute(
-            f"""
-            INSERT INTO {SCHEMA_NAME}.product_description_embeddings 
-            (product_id, description_embedding) 
-            VALUES ($1, $2::vector)
-            """,
-            product_id, embedding_str
-        )
-        return True
-    except Exception as e:
-        logging.error(f"Error inserting description embedding for product_id {product_id}: {e}")
-        return False
-
 async def clear_existing_description_embeddings(conn: asyncpg.Connection) -> None:
     """Clear all existing product description embeddings"""
     try:
@@ -1032,11 +2154,11 @@ async def clear_existing_description_embeddings(conn: asyncpg.Connection) -> Non
         logging.error(f"Error clearing existing description embeddings: {e}")
         raise
 
-async def populate_product_description_embeddings(conn: asyncpg.Connection, clear_existing: bool = False, batch_size: int = 100) -> None:
+async def populate_product_description_embeddings(conn: asyncpg.Connection, clear_existing: bool = False) -> None:
     """Populate product description embeddings from product_data.json"""
     
     logging.info("Loading product data for description embeddings...")
-    products_with_description_embeddings = extract_products_with_description_embeddings(product_data)
+    products_with_description_embeddings = extract_products_with_description_embeddings(get_product_data())
     
     if not products_with_description_embeddings:
         logging.warning("No products with description embeddings found in the data")
@@ -1048,36 +2170,27 @@ async def populate_product_description_embeddings(conn: asyncpg.Connection, clea
             logging.info("Clearing existing product description embeddings...")
             await clear_existing_description_embeddings(conn)
         
-        # Process products in batches
-        inserted_count = 0
+        sku_map = await get_product_ids_by_sku(conn)
         skipped_count = 0
-        error_count = 0
         
-        for i in range(0, len(products_with_description_embeddings), batch_size):
-            batch = products_with_description_embeddings[i:i + batch_size]
-            
-            logging.info(f"Processing description embeddings batch {i//batch_size + 1}/{(len(products_with_description_embeddings) + batch_size - 1)//batch_size}")
-            
-            for sku, description_embedding in batch:
-                # Get product_id for this SKU
-                product_id = await get_product_id_by_sku(conn, sku)
-                
+        def embedding_rows():
+            nonlocal skipped_count
+            for sku, description_embedding in products_with_description_embeddings:
+                product_id = sku_map.get(sku)
                 if product_id is None:
                     logging.debug(f"Product not found for SKU: {sku}")
                     skipped_count += 1
                     continue
-                
-                # Insert the description embedding
-                if await insert_product_description_embedding(conn, product_id, description_embedding):
-                    inserted_count += 1
-                else:
-                    error_count += 1
+                yield (product_id, np.asarray(description_embedding, dtype=np.float32))
+        
+        inserted_count = await copy_embeddings(conn, 'product_description_embeddings',
+                                               ['product_id', 'description_embedding'],
+                                               embedding_rows())
         
         # Summary
         logging.info("Product description embeddings population complete!")
         logging.info(f"  Inserted: {inserted_count}")
         logging.info(f"  Skipped (product not found): {skipped_count}")
-        logging.info(f"  Errors: {error_count}")
         logging.info(f"  Total processed: {len(products_with_description_embeddings)}")
         
     except Exception as e:
@@ -1129,7 +2242,7 @@ async def verify_description_embeddings_table(conn: asyncpg.Connection) -> None:
     except Exception as e:
         logging.error(f"Error verifying description embeddings table: {e}")
 
-async def insert_inventory(conn):
+async def insert_inventory(conn, loader: str = DEFAULT_LOADER):
     """Insert inventory data distributed across stores based on customer distribution weights and seasonal trends"""
     try:
         logging.info("Generating inventory with seasonal considerations...")
@@ -1144,7 +2257,7 @@ async def insert_inventory(conn):
         
         # Build category to seasonal multiplier mapping (using average across year for base inventory)
         category_seasonal_avg = {}
-        for category_name, category_data in main_categories.items():
+        for category_name, category_data in get_main_categories().items():
             if 'washington_seasonal_multipliers' in category_data:
                 seasonal_multipliers = category_data['washington_seasonal_multipliers']
                 # Use average seasonal multiplier for inventory planning
@@ -1153,65 +2266,51 @@ async def insert_inventory(conn):
             else:
                 category_seasonal_avg[category_name] = 1.0  # Default multiplier
         
-        inventory_data = []
-        
-        for store in stores_data:
-            store_id = store['store_id']
-            store_name = store['store_name']
-            
-            # Get store configuration for inventory distribution
-            store_config = stores.get(store_name, {})
-            base_stock_multiplier = store_config.get('customer_distribution_weight', 1.0)
-            
-            for product in products_data:
-                product_id = product['product_id']
-                category_name = product['category_name']
+        def inventory_rows():
+            for store in stores_data:
+                store_id = store['store_id']
+                store_name = store['store_name']
                 
-                # Get seasonal multiplier for this category
-                seasonal_multiplier = category_seasonal_avg.get(category_name, 1.0)
+                # Get store configuration for inventory distribution
+                store_config = get_stores().get(store_name, {})
+                base_stock_multiplier = store_config.get('customer_distribution_weight', 1.0)
                 
-                # Generate stock level based on store weight, seasonal trends, and random variation
-                base_stock = random.randint(10, 100)
-                stock_level = int(base_stock * base_stock_multiplier * seasonal_multiplier * random.uniform(0.5, 1.5))
-                stock_level = max(1, stock_level)  # Ensure at least 1 item in stock
-                
-                inventory_data.append((store_id, product_id, stock_level))
+                for product in products_data:
+                    product_id = product['product_id']
+                    category_name = product['category_name']
+                    
+                    # Get seasonal multiplier for this category
+                    seasonal_multiplier = category_seasonal_avg.get(category_name, 1.0)
+                    
+                    # Generate stock level based on store weight, seasonal trends, and random variation
+                    base_stock = random.randint(*INVENTORY_BASE_STOCK)
+                    stock_level = int(base_stock * base_stock_multiplier * seasonal_multiplier
+                                      * random.uniform(*INVENTORY_STOCK_VARIATION))
+                    stock_level = max(1, stock_level)  # Ensure at least 1 item in stock
+                    
+                    yield (store_id, product_id, stock_level)
         
-        await batch_insert(conn, f"INSERT INTO {SCHEMA_NAME}.inventory (store_id, product_id, stock_level) VALUES ($1, $2, $3)", inventory_data)
+        inventory_count = await bulk_load(conn, 'inventory', ['store_id', 'product_id', 'stock_level'],
+                                          inventory_rows(), loader)
         
-        logging.info(f"Successfully inserted {len(inventory_data):,} inventory records with seasonal adjustments!")
+        logging.info(f"Successfully inserted {inventory_count:,} inventory records with seasonal adjustments!")
         
     except Exception as e:
         logging.error(f"Error inserting inventory: {e}")
         raise
 
-async def build_product_lookup(conn):
-    """Build a lookup table mapping (main_category, product_type, product_name) to product_id"""
-    product_lookup = {}
-    
-    # Get all products with their category and type information
-    rows = await conn.fetch(f"""
-        SELECT p.product_id, p.product_name, c.category_name, pt.type_name
-        FROM {SCHEMA_NAME}.products p
-        JOIN {SCHEMA_NAME}.categories c ON p.category_id = c.category_id
-        JOIN {SCHEMA_NAME}.product_types pt ON p.type_id = pt.type_id
-    """)
-    
-    for row in rows:
-        key = (row['category_name'], row['type_name'], row['product_name'])
-        product_lookup[key] = row['product_id']
-    
-    logging.info(f"Built product lookup with {len(product_lookup)} products")
-    return product_lookup
+ORDER_COLUMNS = ['order_id', 'customer_id', 'store_id', 'order_date',
+                 'item_count', 'subtotal', 'discount_total', 'total_amount']
+ORDER_ITEM_COLUMNS = ['order_id', 'order_date', 'store_id', 'product_id', 'quantity', 'unit_price',
+                      'discount_percent', 'discount_amount', 'total_amount']
 
-async def insert_orders(conn, num_customers: int = 100000, product_lookup: Optional[Dict] = None):
-    """Insert order data into the database with separate orders and order_items tables"""
-    
-    # Build product lookup if not provided
-    if product_lookup is None:
-        product_lookup = await build_product_lookup(conn)
-    
-    logging.info(f"Generating orders for {num_customers:,} customers...")
+async def load_order_lookups(conn) -> Dict:
+    """
+    Preload everything order generation needs (store IDs, product prices,
+    products per category) so the generation loop never touches the database.
+    """
+    store_rows = await conn.fetch(f"SELECT store_id, store_name FROM {SCHEMA_NAME}.stores")
+    store_ids = {row['store_name']: row['store_id'] for row in store_rows}
     
     # Get available product IDs for faster random selection and build category mapping
     product_rows = await conn.fetch(f"""
@@ -1221,7 +2320,6 @@ async def insert_orders(conn, num_customers: int = 100000, product_lookup: Optio
     """)
     
     product_prices = {row['product_id']: float(row['base_price']) for row in product_rows}
-    available_product_ids = list(product_prices.keys())
     
     # Build category to product ID mapping for seasonal selection
     category_products = {}
@@ -1233,126 +2331,211 @@ async def insert_orders(conn, num_customers: int = 100000, product_lookup: Optio
     
     logging.info(f"Built category mapping with {len(category_products)} categories")
     
-    total_orders = 0
+    return {
+        'store_ids': store_ids,
+        'product_prices': product_prices,
+        'available_product_ids': list(product_prices.keys()),
+        'category_products': category_products,
+    }
+
+def generate_customer_orders(customer_id: int, first_order_id: int, lookups: Dict) -> Tuple[List[Tuple], List[Tuple]]:
+    """
+    Generate the orders and order items for one customer.
+    
+    Order IDs are assigned explicitly starting at first_order_id, so the rows do
+    not depend on the orders sequence and can be loaded in any order.
+    
+    Returns:
+        (orders, order_items) as row tuples matching ORDER_COLUMNS / ORDER_ITEM_COLUMNS
+    """
+    product_prices = lookups['product_prices']
+    available_product_ids = lookups['available_product_ids']
+    category_products = lookups['category_products']
+    
     orders_data = []
     order_items_data = []
-    
-    for customer_id in range(1, num_customers + 1):
-        # Determine store preference for this customer
-        preferred_store = weighted_store_choice()
-        store_id = await get_store_id_by_name(conn, preferred_store)
-        
-        # Get store multipliers
-        store_multipliers = get_store_multipliers(preferred_store)
-        order_frequency = store_multipliers['orders']
-        
-        # Determine number of orders for this customer (weighted by store)
-        base_orders = random.choices([0, 1, 2, 3, 4, 5], weights=[20, 40, 20, 10, 7, 3], k=1)[0]
-        num_orders = max(1, int(base_orders * order_frequency))
-        
-        for _ in range(num_orders):
-            total_orders += 1
-            order_id = total_orders
-            
-            # Generate order date with yearly growth pattern
-            year = weighted_year_choice()
-            month = random.randint(1, 12)
-            
-            # Use seasonal category selection for realistic patterns
-            selected_category = None
-            if seasonal_categories:
-                # Choose category based on seasonal multipliers for this month
-                # Increase seasonal bias by selecting seasonal category with higher probability
-                if random.random() < 0.85:  # 85% seasonal selection
-                    selected_category = choose_seasonal_product_category(month)
-                else:
-                    selected_category = random.choice(list(main_categories.keys()))
+    order_id = first_order_id - 1
+    
+    # Determine store preference for this customer
+    preferred_store = weighted_store_choice()
+    store_id = lookups['store_ids'].get(preferred_store, 1)  # Default to store_id 1 if not found
+    
+    # Get store multipliers
+    store_multipliers = get_store_multipliers(preferred_store)
+    order_frequency = store_multipliers['orders']
+    
+    # Determine number of orders for this customer (weighted by store)
+    base_orders = random.choices(ORDERS_PER_CUSTOMER[0], weights=ORDERS_PER_CUSTOMER[1], k=1)[0]
+    num_orders = max(1, int(base_orders * order_frequency))
+    
+    for _ in range(num_orders):
+        order_id += 1
+        
+        # Generate order date with yearly growth pattern
+        year = weighted_year_choice()
+        month = random.randint(1, 12)
+        
+        # Use seasonal category selection for realistic patterns
+        selected_category = None
+        if get_seasonal_categories():
+            # Choose category based on seasonal multipliers for this month
+            # Increase seasonal bias by selecting seasonal category with higher probability
+            if random.random() < SEASONAL_CATEGORY_RATE:
+                selected_category = choose_seasonal_product_category(month)
             else:
-                # No seasonal trends available, use random category selection
-                selected_category = random.choice(list(main_categories.keys()))
-            
-            # Generate random day within the month
-            if month == 2:  # February
-                max_day = 28 if year % 4 != 0 else 29
-            elif month in [4, 6, 9, 11]:  # April, June, September, November
-                max_day = 30
+                selected_category = random.choice(list(get_main_categories().keys()))
+        else:
+            # No seasonal trends available, use random category selection
+            selected_category = random.choice(list(get_main_categories().keys()))
+        
+        # Generate random day within the month
+        if month == 2:  # February
+            max_day = 28 if year % 4 != 0 else 29
+        elif month in [4, 6, 9, 11]:  # April, June, September, November
+            max_day = 30
+        else:
+            max_day = 31
+        
+        day = random.randint(1, max_day)
+        order_date = date(year, month, day)
+        
+        # Generate order items for this order
+        num_items = random.choices(ITEMS_PER_ORDER[0], weights=ITEMS_PER_ORDER[1], k=1)[0]
+        subtotal = 0.0
+        discount_total = 0.0
+        order_total = 0.0
+        
+        for _ in range(num_items):
+            # Select product based on seasonal category preferences
+            if get_seasonal_categories() and selected_category in category_products:
+                # Use seasonally-appropriate products most of the time
+                if random.random() < SEASONAL_PRODUCT_RATE:
+                    product_id = random.choice(category_products[selected_category])
+                else:
+                    # Otherwise select from any category (for variety)
+                    product_id = random.choice(available_product_ids)
             else:
-                max_day = 31
+                # No seasonal data available or category not found, use random selection
+                product_id = random.choice(available_product_ids)
+                
+            base_price = product_prices[product_id]
             
-            day = random.randint(1, max_day)
-            order_date = date(year, month, day)
+            # Generate quantity and pricing
+            # Amounts are rounded to cents here so the order totals match the stored items exactly
+            quantity = random.choices(ITEM_QUANTITY[0], weights=ITEM_QUANTITY[1], k=1)[0]
+            unit_price = round(base_price * random.uniform(*PRICE_VARIATION), 2)  # Price variation
             
-            orders_data.append((customer_id, store_id, order_date))
+            # Apply discounts occasionally
+            discount_percent = 0
+            discount_amount = 0
+            if random.random() < DISCOUNT_RATE:
+                discount_percent = random.choice(DISCOUNT_PERCENTS)
+                discount_amount = round((unit_price * quantity * discount_percent) / 100, 2)
             
-            # Generate order items for this order
-            num_items = random.choices([1, 2, 3, 4, 5], weights=[40, 30, 15, 10, 5], k=1)[0]
+            total_amount = round((unit_price * quantity) - discount_amount, 2)
+            subtotal += unit_price * quantity
+            discount_total += discount_amount
+            order_total += total_amount
             
-            for _ in range(num_items):
-                # Select product based on seasonal category preferences
-                if seasonal_categories and selected_category in category_products:
-                    # Use seasonally-appropriate products with 90% probability (increased from 70%)
-                    if random.random() < 0.9:
-                        product_id = random.choice(category_products[selected_category])
-                    else:
-                        # 10% chance to select from any category (for variety)
-                        product_id = random.choice(available_product_ids)
-                else:
-                    # No seasonal data available or category not found, use random selection
-                    product_id = random.choice(available_product_ids)
-                    
-                base_price = product_prices[product_id]
-                
-                # Generate quantity and pricing
-                quantity = random.choices([1, 2, 3, 4, 5], weights=[60, 25, 10, 3, 2], k=1)[0]
-                unit_price = base_price * random.uniform(0.8, 1.2)  # Price variation
-                
-                # Apply discounts occasionally
-                discount_percent = 0
-                discount_amount = 0
-                if random.random() < 0.15:  # 15% chance of discount
-                    discount_percent = random.choice([5, 10, 15, 20, 25])
-                    discount_amount = (unit_price * quantity * discount_percent) / 100
-                
-                total_amount = (unit_price * quantity) - discount_amount
-                
-                order_items_data.append((
-                    order_id, store_id, product_id, quantity, unit_price, 
-                    discount_percent, discount_amount, total_amount
-                ))
+            order_items_data.append((
+                order_id, order_date, store_id, product_id, quantity, unit_price, 
+                discount_percent, discount_amount, total_amount
+            ))
+        
+        orders_data.append((
+            order_id, customer_id, store_id, order_date,
+            num_items, round(subtotal, 2), round(discount_total, 2), round(order_total, 2)
+        ))
+    
+    return orders_data, order_items_data
+
+async def reset_serial_sequence(conn, table: str, column: str):
+    """Move a SERIAL column's sequence past the highest explicitly inserted ID"""
+    await conn.execute(f"""
+        SELECT setval(pg_get_serial_sequence('{SCHEMA_NAME}.{table}', '{column}'),
+                      COALESCE(MAX({column}), 0) + 1, false)
+        FROM {SCHEMA_NAME}.{table}
+    """)
+
+async def load_order_rows(conn, table: str, columns: List[str], rows: List[Tuple],
+                          loader: str = DEFAULT_LOADER, order_partitioning: str = 'none') -> int:
+    """
+    Load orders / order_items rows. When the tables are partitioned, rows are
+    grouped by partition and COPYed straight into each partition, skipping
+    per-row tuple routing through the parent. Timings are recorded under the
+    parent table either way.
+    """
+    if order_partitioning == 'none':
+        return await bulk_load(conn, table, columns, rows, loader)
+    
+    date_index = columns.index('order_date')
+    by_partition = {}
+    for row in rows:
+        by_partition.setdefault(order_partition_name(table, row[date_index], order_partitioning), []).append(row)
+    
+    loaded = 0
+    for partition_table, partition_rows in by_partition.items():
+        loaded += await bulk_load(conn, partition_table, columns, partition_rows, loader, timing_table=table)
+    return loaded
+
+async def load_customer_orders(conn, customer_ids: range, first_order_id: int, lookups: Dict,
+                               loader: str = DEFAULT_LOADER, order_partitioning: str = 'none') -> Tuple[int, int]:
+    """
+    Generate and load orders for a contiguous range of customers.
+    
+    Rows are flushed every 1000 customers to bound memory. Returns
+    (orders, order_items) counts.
+    """
+    next_order_id = first_order_id
+    orders_data = []
+    order_items_data = []
+    total_items = 0
+    
+    for processed, customer_id in enumerate(customer_ids, start=1):
+        customer_orders, customer_items = generate_customer_orders(customer_id, next_order_id, lookups)
+        next_order_id += len(customer_orders)
+        orders_data.extend(customer_orders)
+        order_items_data.extend(customer_items)
         
-        # Batch insert every 1000 customers to manage memory
-        if customer_id % 1000 == 0:
+        # Load every 1000 customers to manage memory (orders first, items reference them)
+        if processed % 1000 == 0:
             if orders_data:
-                await batch_insert(conn, f"""
-                    INSERT INTO {SCHEMA_NAME}.orders (customer_id, store_id, order_date) 
-                    VALUES ($1, $2, $3)
-                """, orders_data)
+                await load_order_rows(conn, 'orders', ORDER_COLUMNS, orders_data, loader, order_partitioning)
                 orders_data = []
             
             if order_items_data:
-                await batch_insert(conn, f"""
-                    INSERT INTO {SCHEMA_NAME}.order_items 
-                    (order_id, store_id, product_id, quantity, unit_price, discount_percent, discount_amount, total_amount) 
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                """, order_items_data)
+                total_items += await load_order_rows(conn, 'order_items', ORDER_ITEM_COLUMNS, order_items_data,
+                                                     loader, order_partitioning)
                 order_items_data = []
             
-            if customer_id % 5000 == 0:
-                logging.info(f"Processed {customer_id:,} customers, generated {total_orders:,} orders")
+            if processed % 5000 == 0:
+                logging.info(f"Processed {processed:,} customers, generated {next_order_id - first_order_id:,} orders")
     
     # Insert remaining data
     if orders_data:
-        await batch_insert(conn, f"""
-            INSERT INTO {SCHEMA_NAME}.orders (customer_id, store_id, order_date) 
-            VALUES ($1, $2, $3)
-        """, orders_data)
+        await load_order_rows(conn, 'orders', ORDER_COLUMNS, orders_data, loader, order_partitioning)
     
     if order_items_data:
-        await batch_insert(conn, f"""
-            INSERT INTO {SCHEMA_NAME}.order_items 
-            (order_id, store_id, product_id, quantity, unit_price, discount_percent, discount_amount, total_amount) 
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-        """, order_items_data)
+        total_items += await load_order_rows(conn, 'order_items', ORDER_ITEM_COLUMNS, order_items_data,
+                                             loader, order_partitioning)
+    
+    return next_order_id - first_order_id, total_items
+
+async def insert_orders(conn, num_customers: int = 100000, loader: str = DEFAULT_LOADER,
+                        order_partitioning: str = 'none'):
+    """Insert order data into the database with separate orders and order_items tables"""
+    
+    logging.info(f"Generating orders for {num_customers:,} customers...")
+    
+    lookups = await load_order_lookups(conn)
+    
+    # Explicit order IDs continue after any existing orders
+    first_order_id = await conn.fetchval(f"SELECT COALESCE(MAX(order_id), 0) + 1 FROM {SCHEMA_NAME}.orders")
+    total_orders, _ = await load_customer_orders(conn, range(1, num_customers + 1), first_order_id, lookups,
+                                                 loader, order_partitioning)
+    
+    # Order IDs were assigned explicitly, so move the sequence past them
+    await reset_serial_sequence(conn, 'orders', 'order_id')
     
     logging.info(f"Successfully inserted {total_orders:,} orders!")
     
@@ -1360,6 +2543,99 @@ async def insert_orders(conn, num_customers: int = 100000, product_lookup: Optio
     order_items_count = await conn.fetchval(f"SELECT COUNT(*) FROM {SCHEMA_NAME}.order_items")
     logging.info(f"Successfully inserted {order_items_count:,} order items!")
 
+def max_orders_per_customer() -> int:
+    """Upper bound on orders generate_customer_orders() can produce for one customer"""
+    highest_frequency = max(store.get('order_frequency_multiplier', 1.0) for store in get_stores().values())
+    return max(1, int(max(ORDERS_PER_CUSTOMER[0]) * highest_frequency))
+
+def plan_order_partitions(num_customers: int, workers: int, first_order_id: int, seed: int) -> List[Dict]:
+    """
+    Split customers 1..num_customers into contiguous ranges, one per worker.
+    
+    Each partition gets its own order ID block (customers × max orders per
+    customer), so partitions never collide and need no coordination; unused IDs
+    in a block are simply gaps. Seeds are derived from the base seed and the
+    partition index, so the same arguments always produce the same data.
+    """
+    partitions = []
+    size = -(-num_customers // workers)  # ceil division
+    block_per_customer = max_orders_per_customer()
+    next_block = first_order_id
+    for index, start in enumerate(range(1, num_customers + 1, size)):
+        end = min(start + size - 1, num_customers)
+        partitions.append({
+            'index': index,
+            'first_customer_id': start,
+            'last_customer_id': end,
+            'first_order_id': next_block,
+            'seed': seed * 1_000_003 + index,
+        })
+        next_block += (end - start + 1) * block_per_customer
+    return partitions
+
+async def load_order_partition(partition: Dict, lookups: Dict, loader: str, order_partitioning: str = 'none') -> Dict:
+    """Generate and load one customer partition on its own connection"""
+    random.seed(partition['seed'])
+    started = time.perf_counter()
+    conn = await create_connection()
+    try:
+        customer_ids = range(partition['first_customer_id'], partition['last_customer_id'] + 1)
+        orders, order_items = await load_customer_orders(conn, customer_ids, partition['first_order_id'], lookups,
+                                                         loader, order_partitioning)
+    finally:
+        await conn.close()
+    return {**partition, 'orders': orders, 'order_items': order_items, 'seconds': time.perf_counter() - started}
+
+def run_order_partition(partition: Dict, lookups: Dict, loader: str, order_partitioning: str = 'none') -> Dict:
+    """Worker process entry point; load_timings of the worker are returned with the result"""
+    load_timings.clear()
+    result = asyncio.run(load_order_partition(partition, lookups, loader, order_partitioning))
+    return {**result, 'load_timings': dict(load_timings)}
+
+async def insert_orders_parallel(conn, num_customers: int, workers: int, loader: str = DEFAULT_LOADER,
+                                 seed: Optional[int] = None, order_partitioning: str = 'none'):
+    """
+    Generate and load orders with one worker process (and connection) per
+    customer partition. Every worker streams its own orders / order_items.
+    
+    Without a seed a random base seed is drawn (and logged), so unseeded runs
+    differ like the single-process path does.
+    """
+    logging.info(f"Generating orders for {num_customers:,} customers with {workers} parallel workers...")
+    if seed is None:
+        seed = random.randrange(2 ** 31)
+        logging.info(f"Order partition base seed: {seed}")
+    
+    lookups = await load_order_lookups(conn)
+    first_order_id = await conn.fetchval(f"SELECT COALESCE(MAX(order_id), 0) + 1 FROM {SCHEMA_NAME}.orders")
+    partitions = plan_order_partitions(num_customers, workers, first_order_id, seed)
+    
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    # spawn: workers start a fresh interpreter and event loop instead of forking this one
+    with ProcessPoolExecutor(max_workers=len(partitions), mp_context=multiprocessing.get_context('spawn')) as executor:
+        results = await asyncio.gather(*[
+            loop.run_in_executor(executor, run_order_partition, partition, lookups, loader, order_partitioning)
+            for partition in partitions
+        ])
+    elapsed = time.perf_counter() - started
+    
+    await reset_serial_sequence(conn, 'orders', 'order_id')
+    
+    total_orders = sum(r['orders'] for r in results)
+    total_items = sum(r['order_items'] for r in results)
+    for r in results:
+        merge_load_timings(r['load_timings'])
+    
+    logging.info("Order partitions:")
+    logging.info("   #   Customers              Orders    Items      Seconds   Seed")
+    for r in results:
+        logging.info(f"   {r['index']:<3} {r['first_customer_id']:>8,}-{r['last_customer_id']:<10,} "
+                     f"{r['orders']:>8,} {r['order_items']:>8,} {r['seconds']:>10.2f}   {r['seed']}")
+    rate = (total_orders + total_items) / elapsed if elapsed > 0 else 0
+    logging.info(f"Successfully inserted {total_orders:,} orders and {total_items:,} order items "
+                 f"in {elapsed:.2f}s ({rate:,.0f} rows/sec across {len(partitions)} workers)")
+
 async def verify_database_contents(conn):
     """Verify database contents and show key statistics"""
     
@@ -1498,18 +2774,19 @@ async def verify_seasonal_patterns(conn):
         logging.info("\n📊 ORDER SEASONALITY BY CATEGORY:")
         logging.info("   Testing if orders follow seasonal multipliers from product_data.json")
         
-        # Get actual orders by month and category
+        # Get actual orders by month and category from the base tables: an exact distinct
+        # count (summing the per product type counts of the summary would count an order
+        # once per type), and never stale like an unrefreshed summary
         rows = await conn.fetch(f"""
             SELECT c.category_name,
-                   EXTRACT(MONTH FROM o.order_date) as month,
-                   COUNT(DISTINCT o.order_id) as order_count,
+                   EXTRACT(MONTH FROM oi.order_date) as month,
+                   COUNT(DISTINCT oi.order_id) as order_count,
                    ROUND(AVG(oi.total_amount), 2) as avg_order_value
-            FROM {SCHEMA_NAME}.orders o
-            JOIN {SCHEMA_NAME}.order_items oi ON o.order_id = oi.order_id
+            FROM {SCHEMA_NAME}.order_items oi
             JOIN {SCHEMA_NAME}.products p ON oi.product_id = p.product_id
             JOIN {SCHEMA_NAME}.categories c ON p.category_id = c.category_id
-            GROUP BY c.category_name, EXTRACT(MONTH FROM o.order_date)
-            HAVING COUNT(DISTINCT o.order_id) > 0
+            GROUP BY c.category_name, EXTRACT(MONTH FROM oi.order_date)
+            HAVING COUNT(DISTINCT oi.order_id) > 0
             ORDER BY c.category_name, month
         """)
         
@@ -1532,7 +2809,7 @@ async def verify_seasonal_patterns(conn):
         month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", 
                        "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
         
-        for category_name, category_config in main_categories.items():
+        for category_name, category_config in get_main_categories().items():
             if 'washington_seasonal_multipliers' not in category_config:
                 continue
                 
@@ -1608,7 +2885,7 @@ async def verify_seasonal_patterns(conn):
         
         # Calculate expected inventory ratios based on seasonal averages
         expected_inventory = {}
-        for category_name, category_config in main_categories.items():
+        for category_name, category_config in get_main_categories().items():
             if 'washington_seasonal_multipliers' in category_config:
                 seasonal_multipliers = category_config['washington_seasonal_multipliers']
                 avg_multiplier = sum(seasonal_multipliers) / len(seasonal_multipliers)
@@ -1690,30 +2967,56 @@ async def verify_seasonal_patterns(conn):
         logging.error(f"Error verifying seasonal patterns: {e}")
         raise
 
-async def generate_postgresql_database(num_customers: int = 50000):
-    """Generate complete PostgreSQL database"""
+async def insert_reference_data(conn):
+    """Insert stores, categories, product types and products"""
+    await insert_stores(conn)
+    await insert_categories(conn)
+    await insert_product_types(conn)
+    await insert_products(conn)
+
+async def populate_all_embeddings(conn):
+    """Populate both image and description embeddings from product_data.json"""
+    await populate_product_image_embeddings(conn, clear_existing=True)
+    await populate_product_description_embeddings(conn, clear_existing=True)
+
+async def generate_postgresql_database(num_customers: int = 50000, loader: str = DEFAULT_LOADER,
+                                       workers: int = 1, seed: Optional[int] = None,
+                                       index_workers: int = DEFAULT_INDEX_WORKERS,
+                                       maintenance_work_mem: str = DEFAULT_MAINTENANCE_WORK_MEM,
+                                       vector_index: str = 'auto', order_partitioning: str = 'none',
+                                       index_profile: str = DEFAULT_INDEX_PROFILE,
+                                       rls_policy: str = DEFAULT_RLS_POLICY):
+    """
+    Generate complete PostgreSQL database.
+    
+    Phases: bare tables → bulk load → keys → parallel index build → foreign keys
+    → RLS → sales summary views → ANALYZE, each timed separately.
+    """
     try:
         # Create connection
         conn = await create_connection()
+        load_timings.clear()
+        phase_timings.clear()
+        if seed is not None:
+            random.seed(seed)
+            Faker.seed(seed)
+        # A full build runs the embeddings phase, so decode product_data.json once, with embeddings
+        get_product_data()
         
         try:
             # Drop existing tables to start fresh (optional)
             logging.info("Dropping existing tables if they exist...")
             await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA_NAME} CASCADE")
             
-            await create_database_schema(conn)
-            await insert_stores(conn)
-            await insert_categories(conn)
-            await insert_product_types(conn)
-            await insert_customers(conn, num_customers)
-            await insert_products(conn)
+            await timed_phase("Create bare tables", create_database_schema(conn, order_partitioning))
+            await timed_phase("Load reference data", insert_reference_data(conn))
+            await timed_phase("Load customers", insert_customers(conn, num_customers, loader))
             
             # Populate product embeddings from product_data.json
             logging.info("\n" + "=" * 50)
             logging.info("POPULATING PRODUCT EMBEDDINGS")
             logging.info("=" * 50)
-            await populate_product_image_embeddings(conn, clear_existing=True)
-            await populate_product_description_embeddings(conn, clear_existing=True)
+            await timed_phase("Load embeddings", populate_all_embeddings(conn))
             
             # Verify embeddings were populated
             logging.info("\n" + "=" * 50)
@@ -1726,13 +3029,29 @@ async def generate_postgresql_database(num_customers: int = 50000):
             logging.info("\n" + "=" * 50)
             logging.info("INSERTING INVENTORY DATA")
             logging.info("=" * 50)
-            await insert_inventory(conn)
+            await timed_phase("Load inventory", insert_inventory(conn, loader))
             
             # Insert order data
             logging.info("\n" + "=" * 50)
             logging.info("INSERTING ORDER DATA")
             logging.info("=" * 50)
-            await insert_orders(conn, num_customers)
+            if workers > 1:
+                await timed_phase("Load orders", insert_orders_parallel(conn, num_customers, workers, loader, seed,
+                                                                        order_partitioning))
+            else:
+                await timed_phase("Load orders", insert_orders(conn, num_customers, loader=loader,
+                                                               order_partitioning=order_partitioning))
+            log_load_timings(loader)
+            
+            # Keys, indexes, foreign keys and RLS are built once the data is in place
+            logging.info("\n" + "=" * 50)
+            logging.info("BUILDING INDEXES, CONSTRAINTS AND RLS")
+            logging.info("=" * 50)
+            await build_post_load_objects(conn, index_workers, maintenance_work_mem, vector_index, order_partitioning,
+                                          index_profile, rls_policy)
+            log_phase_timings()
+            if order_partitioning != 'none':
+                await explain_partition_pruning(conn)
             
             # Verify the database was created and has data
             logging.info("\n" + "=" * 50)
@@ -1759,56 +3078,247 @@ async def generate_postgresql_database(num_customers: int = 50000):
         logging.error(f"Failed to generate database: {e}")
         raise
 
-async def show_database_stats():
-    """Show database statistics"""
-    
-    logging.info("\n" + "=" * 40)
-    logging.info("DATABASE STATISTICS")
-    logging.info("=" * 40)
+# Diagnostics thresholds for show_database_stats()
+DEFAULT_TOP_STATEMENTS = 10
+DEAD_TUPLE_WARN_RATIO = 0.2
+CACHE_HIT_WARN_RATIO = 0.95
+RECALL_WARN = 0.9
+STATS_RECALL_QUERIES = 5
+
+async def collect_table_stats(conn) -> List[Dict]:
+    """Size, live/dead tuples, estimated bloat, scan counts and cache hit ratio per table"""
+    rows = await conn.fetch("""
+        SELECT t.relname AS table_name,
+               pg_total_relation_size(t.relid) AS total_bytes,
+               pg_relation_size(t.relid) AS table_bytes,
+               pg_indexes_size(t.relid) AS index_bytes,
+               t.n_live_tup AS live_tuples,
+               t.n_dead_tup AS dead_tuples,
+               t.seq_scan, t.seq_tup_read,
+               COALESCE(t.idx_scan, 0) AS idx_scan,
+               io.heap_blks_hit, io.heap_blks_read,
+               t.last_autovacuum, t.last_autoanalyze
+        FROM pg_stat_user_tables t
+        JOIN pg_statio_user_tables io ON io.relid = t.relid
+        WHERE t.schemaname = $1
+        ORDER BY pg_total_relation_size(t.relid) DESC
+    """, SCHEMA_NAME)
+    
+    tables = []
+    for row in rows:
+        table = dict(row)
+        total_tuples = table['live_tuples'] + table['dead_tuples']
+        table['dead_ratio'] = table['dead_tuples'] / total_tuples if total_tuples else 0.0
+        # Rough bloat estimate: the share of the heap occupied by dead tuples
+        table['est_bloat_bytes'] = int(table['table_bytes'] * table['dead_ratio'])
+        blocks = table['heap_blks_hit'] + table['heap_blks_read']
+        table['cache_hit_ratio'] = table['heap_blks_hit'] / blocks if blocks else None
+        tables.append(table)
+    return tables
+
+async def collect_index_stats(conn) -> List[Dict]:
+    """Size and usage per index"""
+    rows = await conn.fetch("""
+        SELECT i.indexrelname AS index_name, i.relname AS table_name,
+               pg_relation_size(i.indexrelid) AS index_bytes,
+               i.idx_scan, i.idx_tup_read,
+               am.amname AS method
+        FROM pg_stat_user_indexes i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_am am ON am.oid = c.relam
+        WHERE i.schemaname = $1
+        ORDER BY pg_relation_size(i.indexrelid) DESC
+    """, SCHEMA_NAME)
+    return [dict(row) for row in rows]
+
+async def collect_top_statements(conn, top_n: int) -> Dict:
+    """Top statements by total and by mean execution time, if pg_stat_statements is available"""
+    installed = await conn.fetchval("SELECT COUNT(*) > 0 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+    if not installed:
+        return {'available': False, 'reason': 'pg_stat_statements extension not installed'}
+    
+    result = {'available': True}
+    try:
+        for key, order_by in (('by_total_time', 'total_exec_time'), ('by_mean_time', 'mean_exec_time')):
+            rows = await conn.fetch(f"""
+                SELECT LEFT(regexp_replace(query, '\\s+', ' ', 'g'), 200) AS query,
+                       calls, total_exec_time AS total_ms, mean_exec_time AS mean_ms, rows,
+                       shared_blks_hit, shared_blks_read
+                FROM pg_stat_statements
+                WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+                ORDER BY {order_by} DESC
+                LIMIT $1
+            """, top_n)
+            result[key] = [dict(row) for row in rows]
+    except Exception as e:
+        # Installed but not in shared_preload_libraries, or no permission
+        return {'available': False, 'reason': str(e)}
+    return result
+
+async def check_vector_indexes(conn, sample_queries: int = STATS_RECALL_QUERIES) -> List[Dict]:
+    """
+    Compare each vector index with what choose_vector_index() recommends for
+    the current row count, check the session search settings and sample
+    recall@k. Every finding is listed under 'warnings'.
+    """
+    checks = []
+    for name, table, column in VECTOR_INDEXES:
+        row_count = await conn.fetchval(f"SELECT COUNT(*) FROM {SCHEMA_NAME}.{table} WHERE {column} IS NOT NULL")
+        recommended = choose_vector_index(row_count)
+        check = {'index': name, 'table': table, 'rows': row_count, 'recommended': recommended, 'warnings': []}
+        
+        index = await conn.fetchrow("""
+            SELECT am.amname AS method, c.reloptions
+            FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace JOIN pg_am am ON am.oid = c.relam
+            WHERE n.nspname = $1 AND c.relname = $2
+        """, SCHEMA_NAME, name)
+        if index is None:
+            check['warnings'].append("index missing (run --build-vector-indexes)")
+            checks.append(check)
+            continue
+        
+        options = dict(option.split('=', 1) for option in (index['reloptions'] or []))
+        check['method'] = index['method']
+        check['options'] = options
+        if index['method'] == 'ivfflat':
+            lists = int(options.get('lists', 100))
+            target = recommended['with']['lists'] if recommended['method'] == 'ivfflat' else max(1, row_count // 1000)
+            if lists > 2 * target or lists * 2 < target:
+                check['warnings'].append(f"lists={lists} but ~{target} suits {row_count:,} rows")
+            if lists > row_count:
+                check['warnings'].append("more lists than rows; most lists are empty")
+            probes = int(await conn.fetchval("SELECT current_setting('ivfflat.probes', true)") or 1)
+            target_probes = max(1, int(math.sqrt(lists)))
+            check['search'] = {'ivfflat.probes': target_probes}
+            if probes < target_probes:
+                check['warnings'].append(f"session ivfflat.probes={probes}, recommend SET ivfflat.probes = {target_probes}")
+        elif index['method'] == 'hnsw':
+            if row_count > HNSW_MAX_ROWS:
+                check['warnings'].append(f"hnsw on {row_count:,} rows; ivfflat builds faster beyond {HNSW_MAX_ROWS:,}")
+            ef_search = int(await conn.fetchval("SELECT current_setting('hnsw.ef_search', true)") or 40)
+            target_ef = recommended['search'].get('hnsw.ef_search', 40) if recommended['method'] == 'hnsw' else 40
+            check['search'] = {'hnsw.ef_search': max(ef_search, target_ef)}
+            if ef_search < target_ef:
+                check['warnings'].append(f"session hnsw.ef_search={ef_search}, recommend SET hnsw.ef_search = {target_ef}")
+        
+        if row_count > 0 and sample_queries > 0:
+            recall = await measure_vector_recall(conn, table, column, check['search'], sample_queries)
+            check['recall'] = recall['recall']
+            if recall['recall'] is not None and recall['recall'] < RECALL_WARN:
+                check['warnings'].append(f"recall@{RECALL_K}={recall['recall']:.3f} below {RECALL_WARN}")
+        checks.append(check)
+    return checks
+
+async def collect_database_stats(conn, top_n: int = DEFAULT_TOP_STATEMENTS) -> Dict:
+    """Gather the full diagnostics report as a JSON-serializable dict"""
+    summary = await conn.fetchrow(f"""
+        SELECT (SELECT COUNT(*) FROM {SCHEMA_NAME}.customers) AS customers,
+               (SELECT COUNT(*) FROM {SCHEMA_NAME}.products) AS products,
+               (SELECT COUNT(*) FROM {SCHEMA_NAME}.product_image_embeddings) AS product_embeddings,
+               (SELECT COUNT(*) FROM {SCHEMA_NAME}.orders) AS orders,
+               (SELECT COUNT(*) FROM {SCHEMA_NAME}.order_items) AS order_items,
+               (SELECT COALESCE(SUM(total_amount), 0) FROM {SCHEMA_NAME}.orders) AS total_revenue,
+               pg_database_size(current_database()) AS database_bytes
+    """)
+    database_io = await conn.fetchrow("""
+        SELECT blks_hit, blks_read, xact_commit, xact_rollback, deadlocks, temp_files, temp_bytes
+        FROM pg_stat_database WHERE datname = current_database()
+    """)
+    blocks = database_io['blks_hit'] + database_io['blks_read']
+    
+    return {
+        'captured_at': datetime.now().isoformat(),
+        'database': POSTGRES_CONFIG['database'],
+        'schema': SCHEMA_NAME,
+        'summary': dict(summary),
+        'database_io': {**dict(database_io), 'cache_hit_ratio': database_io['blks_hit'] / blocks if blocks else None},
+        'tables': await collect_table_stats(conn),
+        'indexes': await collect_index_stats(conn),
+        'top_statements': await collect_top_statements(conn, top_n),
+        'vector_indexes': await check_vector_indexes(conn),
+    }
+
+def log_database_stats(stats: Dict):
+    """Log the diagnostics report as readable tables"""
+    mb = 1024 * 1024
+    summary = stats['summary']
+    logging.info(f"Database Size: {summary['database_bytes'] / mb:,.1f} MB")
+    logging.info(f"Customers: {summary['customers']:,}")
+    logging.info(f"Products: {summary['products']:,}")
+    logging.info(f"Product Embeddings: {summary['product_embeddings']:,}")
+    logging.info(f"Orders: {summary['orders']:,}")
+    logging.info(f"Order Items: {summary['order_items']:,}")
+    logging.info(f"Total Revenue: ${summary['total_revenue']:,.2f}")
+    if summary['orders'] > 0 and summary['customers'] > 0:
+        logging.info(f"Average Order Value: ${summary['total_revenue'] / summary['orders']:.2f}")
+        logging.info(f"Orders per Customer: {summary['orders'] / summary['customers']:.1f}")
+        logging.info(f"Items per Order: {summary['order_items'] / summary['orders']:.1f}")
+    
+    cache_hit = stats['database_io']['cache_hit_ratio']
+    if cache_hit is not None:
+        flag = "⚠️ " if cache_hit < CACHE_HIT_WARN_RATIO else ""
+        logging.info(f"Cache Hit Ratio (database): {flag}{cache_hit:.1%}")
+    
+    logging.info("\n📋 TABLES:")
+    logging.info(f"   {'Table':<34} {'Total MB':>9} {'Index MB':>9} {'Live':>12} {'Dead':>10} {'Bloat MB':>9} "
+                 f"{'Seq scans':>10} {'Idx scans':>12} {'Cache hit':>9}")
+    for t in stats['tables']:
+        flag = "⚠️ " if t['dead_ratio'] > DEAD_TUPLE_WARN_RATIO else ""
+        cache = f"{t['cache_hit_ratio']:.1%}" if t['cache_hit_ratio'] is not None else "n/a"
+        logging.info(f"   {flag + t['table_name']:<34} {t['total_bytes'] / mb:>9,.1f} {t['index_bytes'] / mb:>9,.1f} "
+                     f"{t['live_tuples']:>12,} {t['dead_tuples']:>10,} {t['est_bloat_bytes'] / mb:>9,.1f} "
+                     f"{t['seq_scan']:>10,} {t['idx_scan']:>12,} {cache:>9}")
+    
+    logging.info("\n📇 INDEXES:")
+    logging.info(f"   {'Index':<44} {'Table':<28} {'Method':<8} {'MB':>9} {'Scans':>12}")
+    for i in stats['indexes']:
+        flag = "· " if i['idx_scan'] == 0 else ""
+        logging.info(f"   {flag + i['index_name']:<44} {i['table_name']:<28} {i['method']:<8} "
+                     f"{i['index_bytes'] / mb:>9,.1f} {i['idx_scan']:>12,}")
+    unused = sum(1 for i in stats['indexes'] if i['idx_scan'] == 0)
+    logging.info(f"   {len(stats['indexes'])} indexes, {unused} never scanned (marked ·)")
+    
+    top = stats['top_statements']
+    if not top['available']:
+        logging.info(f"\n🔎 TOP STATEMENTS: unavailable ({top['reason']})")
+    else:
+        for key, label in (('by_total_time', 'total'), ('by_mean_time', 'mean')):
+            logging.info(f"\n🔎 TOP STATEMENTS BY {label.upper()} TIME:")
+            for st in top[key]:
+                logging.info(f"   {st['total_ms']:>10,.0f} ms total  {st['mean_ms']:>8,.1f} ms mean  "
+                             f"{st['calls']:>8,} calls  {st['query'][:90]}")
+    
+    logging.info("\n🧭 VECTOR INDEXES:")
+    for v in stats['vector_indexes']:
+        recall = f"{v['recall']:.3f}" if v.get('recall') is not None else "n/a"
+        logging.info(f"   {v['index']}: {v.get('method', 'missing')} {v.get('options', {})} on {v['rows']:,} rows, "
+                     f"recall@{RECALL_K} {recall}")
+        for warning in v['warnings']:
+            logging.info(f"      ⚠️  {warning}")
+        if not v['warnings']:
+            logging.info("      ✅ settings look right")
+
+async def show_database_stats(json_output: bool = False, top_n: int = DEFAULT_TOP_STATEMENTS):
+    """Show database diagnostics, or print them as JSON (for diffing runs over time)"""
     
     conn = await create_connection()
     
     try:
-        # Get table row counts
-        customers_count = await conn.fetchval(f"SELECT COUNT(*) FROM {SCHEMA_NAME}.customers")
-        products_count = await conn.fetchval(f"SELECT COUNT(*) FROM {SCHEMA_NAME}.products")
-        orders_count = await conn.fetchval(f"SELECT COUNT(*) FROM {SCHEMA_NAME}.orders")
-        order_items_count = await conn.fetchval(f"SELECT COUNT(*) FROM {SCHEMA_NAME}.order_items")
-        embeddings_count = await conn.fetchval(f"SELECT COUNT(*) FROM {SCHEMA_NAME}.product_image_embeddings")
-        
-        # Get revenue information
-        total_revenue = await conn.fetchval(f"SELECT SUM(total_amount) FROM {SCHEMA_NAME}.order_items")
-        if total_revenue is None:
-            total_revenue = 0
-            
-        # Count indexes
-        index_count = await conn.fetchval(f"""
-            SELECT COUNT(*) FROM pg_indexes 
-            WHERE schemaname = '{SCHEMA_NAME}' AND indexname LIKE 'idx_%'
-        """)
+        stats = await collect_database_stats(conn, top_n)
         
-        # Get database size
-        db_size = await conn.fetchval(f"""
-            SELECT pg_size_pretty(pg_database_size('{POSTGRES_CONFIG['database']}'))
-        """)
+        if json_output:
+            print(json.dumps(stats, indent=2, default=str))
+            return stats
         
-        logging.info(f"Database Size: {db_size}")
-        logging.info(f"Customers: {customers_count:,}")
-        logging.info(f"Products: {products_count:,}")
-        logging.info(f"Product Embeddings: {embeddings_count:,}")
-        logging.info(f"Orders: {orders_count:,}")
-        logging.info(f"Order Items: {order_items_count:,}")
-        logging.info(f"Total Revenue: ${total_revenue:,.2f}")
-        if orders_count > 0:
-            logging.info(f"Average Order Value: ${total_revenue/orders_count:.2f}")
-            logging.info(f"Orders per Customer: {orders_count/customers_count:.1f}")
-            logging.info(f"Items per Order: {order_items_count/orders_count:.1f}")
-        logging.info(f"Performance Indexes: {index_count}")
+        logging.info("\n" + "=" * 40)
+        logging.info("DATABASE STATISTICS")
+        logging.info("=" * 40)
+        log_database_stats(stats)
         
         # Show sample embeddings if they exist
-        if embeddings_count > 0:
+        if stats['summary']['product_embeddings'] > 0:
             await verify_embeddings_table(conn)
-        
+        return stats
     finally:
         await conn.close()
 
@@ -1828,17 +3338,45 @@ async def main():
                        help='Only verify seasonal patterns in existing database')
     parser.add_argument('--clear-embeddings', action='store_true',
                        help='Clear existing embeddings before populating (used with --embeddings-only)')
-    parser.add_argument('--batch-size', type=int, default=100,
-                       help='Batch size for processing embeddings (default: 100)')
     parser.add_argument('--num-customers', type=int, default=50000,
                        help='Number of customers to generate (default: 50000)')
+    parser.add_argument('--loader', choices=BULK_LOADERS, default=DEFAULT_LOADER,
+                       help=f'Bulk load method for customers, inventory and orders (default: {DEFAULT_LOADER})')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Worker processes for order generation, each with its own connection (default: 1)')
+    parser.add_argument('--index-workers', type=int, default=DEFAULT_INDEX_WORKERS,
+                       help=f'Connections used to build indexes after loading (default: {DEFAULT_INDEX_WORKERS})')
+    parser.add_argument('--maintenance-work-mem', default=DEFAULT_MAINTENANCE_WORK_MEM,
+                       help=f'maintenance_work_mem per index build connection (default: {DEFAULT_MAINTENANCE_WORK_MEM})')
+    parser.add_argument('--vector-index', choices=['auto', 'hnsw', 'ivfflat'], default='auto',
+                       help='Vector index type; auto picks from the embeddings row count (default: auto)')
+    parser.add_argument('--build-vector-indexes', action='store_true',
+                       help='Only (re)build vector indexes and report build time and recall@10')
+    parser.add_argument('--partition-orders', choices=ORDER_PARTITIONING_MODES, default='none',
+                       help='Range-partition orders and order_items on order_date by month or year (default: none)')
+    parser.add_argument('--index-profile', choices=INDEX_PROFILES, default=DEFAULT_INDEX_PROFILE,
+                       help='btree, or BRIN + partial indexes on the order tables (default: btree)')
+    parser.add_argument('--benchmark-indexes', action='store_true',
+                       help='Only compare the btree and brin index profiles on the existing database')
+    parser.add_argument('--rls-policy', choices=RLS_POLICY_MODES, default=DEFAULT_RLS_POLICY,
+                       help='Store manager policies: session store_id lookup or per-row EXISTS (default: session)')
+    parser.add_argument('--benchmark-rls', action='store_true',
+                       help='Only compare the session and exists RLS policies on the existing database')
+    parser.add_argument('--refresh-summaries', action='store_true',
+                       help='Only refresh the sales summary materialized views (CONCURRENTLY)')
+    parser.add_argument('--json', action='store_true',
+                       help='With --show-stats, print the diagnostics report as JSON')
+    parser.add_argument('--top-statements', type=int, default=DEFAULT_TOP_STATEMENTS,
+                       help=f'With --show-stats, pg_stat_statements entries to list (default: {DEFAULT_TOP_STATEMENTS})')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Random seed for reproducible data; order partitions derive their seeds from it')
     
     args = parser.parse_args()
     
     try:
         if args.show_stats:
             # Show database statistics
-            await show_database_stats()
+            await show_database_stats(json_output=args.json, top_n=args.top_statements)
         elif args.verify_embeddings:
             # Verify embeddings only
             conn = await create_connection()
@@ -1854,12 +3392,40 @@ async def main():
                 await verify_seasonal_patterns(conn)
             finally:
                 await conn.close()
+        elif args.build_vector_indexes:
+            # Rebuild vector indexes only
+            conn = await create_connection()
+            try:
+                await build_vector_indexes(conn, args.vector_index, args.maintenance_work_mem)
+            finally:
+                await conn.close()
+        elif args.benchmark_indexes:
+            # Compare index profiles only
+            conn = await create_connection()
+            try:
+                await benchmark_index_profiles(conn, maintenance_work_mem=args.maintenance_work_mem)
+            finally:
+                await conn.close()
+        elif args.benchmark_rls:
+            # Compare RLS policy styles only
+            conn = await create_connection()
+            try:
+                await benchmark_rls_policies(conn)
+            finally:
+                await conn.close()
+        elif args.refresh_summaries:
+            # Refresh sales summaries only
+            conn = await create_connection()
+            try:
+                await refresh_sales_summaries(conn)
+            finally:
+                await conn.close()
         elif args.embeddings_only:
             # Populate embeddings only
             conn = await create_connection()
             try:
-                await populate_product_image_embeddings(conn, clear_existing=args.clear_embeddings, batch_size=args.batch_size)
-                await populate_product_description_embeddings(conn, clear_existing=args.clear_embeddings, batch_size=args.batch_size)
+                await populate_product_image_embeddings(conn, clear_existing=args.clear_embeddings)
+                await populate_product_description_embeddings(conn, clear_existing=args.clear_embeddings)
                 await verify_embeddings_table(conn)
                 await verify_description_embeddings_table(conn)
             finally:
@@ -1868,7 +3434,14 @@ async def main():
             # Generate the complete database
             logging.info(f"Database will be created at {POSTGRES_CONFIG['host']}:{POSTGRES_CONFIG['port']}/{POSTGRES_CONFIG['database']}")
             logging.info(f"Schema: {SCHEMA_NAME}")
-            await generate_postgresql_database(num_customers=args.num_customers)
+            await generate_postgresql_database(num_customers=args.num_customers, loader=args.loader,
+                                               workers=args.workers, seed=args.seed,
+                                               index_workers=args.index_workers,
+                                               maintenance_work_mem=args.maintenance_work_mem,
+                                               vector_index=args.vector_index,
+                                               order_partitioning=args.partition_orders,
+                                               index_profile=args.index_profile,
+                                               rls_policy=args.rls_policy)
             
             logging.info("\nDatabase generated successfully!")
             logging.info(f"Host: {POSTGRES_CONFIG['host']}:{POSTGRES_CONFIG['port']}")
@@ -19,6 +19,8 @@ FEATURES:
 - Product description embeddings population from product_data.json
 - Performance-optimized indexes
 - Row Level Security (RLS) with security policies
+- fast_executemany / table-valued parameter bulk loading, indexes built after the load
+- Optional columnstore analytics index profile for batch-mode aggregations
 - Comprehensive statistics and verification
 - Note: Vector embeddings use VARBINARY format (SQL Server 2022+ VECTOR support available)
 
@@ -27,6 +29,10 @@ USAGE:
     python generate_zava_sql_server.py --show-stats        # Show database statistics
     python generate_zava_sql_server.py --embeddings-only   # Populate embeddings only
     python generate_zava_sql_server.py --verify-embeddings # Verify embeddings tables
+    python generate_zava_sql_server.py --loader tvp        # Stage orders through table-valued parameters
+    python generate_zava_sql_server.py --benchmark-loaders # Compare executemany / fast / tvp load times
+    python generate_zava_sql_server.py --index-profile columnstore # Add columnstore indexes for analytics
+    python generate_zava_sql_server.py --benchmark-indexes # Compare rowstore and columnstore query times
     python generate_zava_sql_server.py --help              # Show all options
 """
 
@@ -37,13 +43,31 @@ import os
 import pickle
 import random
 import sys
+import time
 from datetime import date
+from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
 
 import pyodbc
 from dotenv import load_dotenv
 from faker import Faker
 
+from zava_rules import (
+    DISCOUNT_PERCENTS,
+    DISCOUNT_RATE,
+    INVENTORY_BASE_STOCK,
+    INVENTORY_STOCK_VARIATION,
+    ITEM_QUANTITY,
+    ITEMS_PER_ORDER,
+    ORDER_YEARS,
+    ORDERS_PER_CUSTOMER,
+    PRICE_VARIATION,
+    SEASONAL_CATEGORY_RATE,
+    SEASONAL_PRODUCT_RATE,
+    product_sku,
+    selling_price,
+)
+
 # Load environment variables
 script_dir = os.path.dirname(os.path.abspath(__file__))
 # Try to load .env from script directory first, then parent directories
@@ -80,6 +104,67 @@ SCHEMA_NAME = 'retail'
 # Super Manager UUID - has access to all rows regardless of RLS policies
 SUPER_MANAGER_UUID = '00000000-0000-0000-0000-000000000000'
 
+# Bulk loaders for customers, inventory, orders and order_items (--loader)
+# executemany: plain pyodbc executemany (original path, one round trip per row)
+# fast:        fast_executemany with typed parameter arrays
+# tvp:         orders and order_items staged through table-valued parameters,
+#              everything else as fast
+SQL_LOADERS = ('executemany', 'fast', 'tvp')
+DEFAULT_SQL_LOADER = 'fast'
+BULK_BATCH_SIZE = 5000
+
+ORDER_COLUMNS = ['order_id', 'customer_id', 'store_id', 'order_date']
+ORDER_ITEM_COLUMNS = ['order_id', 'store_id', 'product_id', 'quantity', 'unit_price',
+                      'discount_percent', 'discount_amount', 'total_amount']
+
+# Parameter types for fast_executemany, one per inserted column, so pyodbc
+# binds whole arrays instead of inspecting every row
+SQL_INT = (pyodbc.SQL_INTEGER, 0, 0)
+SQL_DATE = (pyodbc.SQL_TYPE_DATE, 0, 0)
+SQL_AMOUNT = (pyodbc.SQL_DECIMAL, 10, 2)
+
+def sql_nvarchar(length: int) -> Tuple[int, int, int]:
+    return (pyodbc.SQL_WVARCHAR, length, 0)
+
+BULK_INPUT_SIZES = {
+    'customers': [sql_nvarchar(255), sql_nvarchar(255), sql_nvarchar(255), sql_nvarchar(50), SQL_INT],
+    'inventory': [SQL_INT, SQL_INT, SQL_INT],
+    'orders': [SQL_INT, SQL_INT, SQL_INT, SQL_DATE],
+    'order_items': [SQL_INT, SQL_INT, SQL_INT, SQL_INT, SQL_AMOUNT, SQL_INT, SQL_AMOUNT, SQL_AMOUNT],
+}
+
+# Table types used by the tvp loader: table -> (type name, column definitions)
+TVP_TYPES = {
+    'orders': ('order_rows', 'order_id INT NOT NULL, customer_id INT NOT NULL, store_id INT NOT NULL, '
+                             'order_date DATE NOT NULL'),
+    'order_items': ('order_item_rows', 'order_id INT NOT NULL, store_id INT NOT NULL, product_id INT NOT NULL, '
+                                       'quantity INT NOT NULL, unit_price DECIMAL(10,2) NOT NULL, '
+                                       'discount_percent INT NOT NULL, discount_amount DECIMAL(10,2) NOT NULL, '
+                                       'total_amount DECIMAL(10,2) NOT NULL'),
+}
+
+# Index profiles (--index-profile)
+# rowstore:    B-tree indexes only, including the wide covering indexes
+# columnstore: adds nonclustered columnstore indexes on orders and order_items so
+#              store / category / month aggregations run in batch mode; the wide
+#              rowstore covering index on order_items is left out
+INDEX_PROFILES = ('rowstore', 'columnstore')
+DEFAULT_INDEX_PROFILE = 'rowstore'
+
+# index name -> (table, columns)
+COLUMNSTORE_INDEXES = {
+    'ncci_orders': ('orders', 'order_id, customer_id, store_id, order_date'),
+    'ncci_order_items': ('order_items', 'order_id, store_id, product_id, quantity, unit_price, '
+                                        'discount_percent, discount_amount, total_amount'),
+}
+COLUMNSTORE_REPLACED_INDEXES = ('idx_order_items_covering', 'idx_order_items_total')
+
+# Per-table load timings for the current build: table -> {'rows', 'seconds', 'calls'}
+load_timings: Dict[str, Dict[str, float]] = {}
+
+# Elapsed seconds per build phase for the current build
+phase_timings: Dict[str, float] = {}
+
 # Load reference data from JSON file
 def load_reference_data():
     """Load reference data from JSON file"""
@@ -91,37 +176,76 @@ def load_reference_data():
         logging.error(f"Failed to load reference data: {e}")
         raise
 
-def load_product_data():
-    """Load product data from JSON file"""
+# Per-product keys holding embedding arrays (the bulk of product_data.json)
+EMBEDDING_KEYS = ('image_embedding', 'description_embedding')
+
+def strip_embeddings(obj: Dict) -> Dict:
+    """json object_hook dropping embedding arrays as each object is decoded"""
+    for key in EMBEDDING_KEYS:
+        obj.pop(key, None)
+    return obj
+
+def load_product_data(include_embeddings: bool = True):
+    """Load product data from JSON file (optionally without the embedding arrays)"""
     try:
         json_path = os.path.join(os.path.dirname(__file__), 'product_data.json')
         with open(json_path, 'r') as f:
-            return json.load(f)
+            if include_embeddings:
+                return json.load(f)
+            return json.load(f, object_hook=strip_embeddings)
     except Exception as e:
         logging.error(f"Failed to load product data: {e}")
         raise
 
-# Load the reference data
-reference_data = load_reference_data()
-product_data = load_product_data()
-
-# Get reference data from loaded JSON
-main_categories = product_data['main_categories']
-stores = reference_data['stores']
-
-# Check if seasonal trends are available
-seasonal_categories = []
-for category_name, category_data in main_categories.items():
-    if 'washington_seasonal_multipliers' in category_data:
-        seasonal_categories.append(category_name)
-
-if seasonal_categories:
-    logging.info(f"🗓️  Washington State seasonal trends active for {len(seasonal_categories)} categories: {', '.join(seasonal_categories)}")
-else:
-    logging.info("⚠️  No seasonal trends found - using equal weights for all categories")
+# The JSON data files are loaded on first use, so subcommands that only query the
+# database (--show-stats, RLS demos, benchmarks) never read them, and the embedding
+# arrays are only held in memory when an embeddings phase runs
+_reference_data: Optional[Dict] = None
+_product_data: Optional[Dict] = None
+_product_catalog: Optional[Dict] = None
+_seasonal_categories: Optional[List[str]] = None
+
+def get_reference_data() -> Dict:
+    """Store configuration and year weights from reference_data.json"""
+    global _reference_data
+    if _reference_data is None:
+        _reference_data = load_reference_data()
+    return _reference_data
+
+def get_product_data() -> Dict:
+    """Full product_data.json, including embeddings (for the embeddings phases)"""
+    global _product_data
+    if _product_data is None:
+        _product_data = load_product_data()
+    return _product_data
+
+def get_stores() -> Dict:
+    return get_reference_data()['stores']
+
+def get_main_categories() -> Dict:
+    """Categories, product types and products, without embeddings unless already loaded"""
+    global _product_catalog
+    if _product_data is not None:
+        return _product_data['main_categories']
+    if _product_catalog is None:
+        _product_catalog = load_product_data(include_embeddings=False)
+    return _product_catalog['main_categories']
+
+def get_seasonal_categories() -> List[str]:
+    """Categories with Washington State seasonal multipliers"""
+    global _seasonal_categories
+    if _seasonal_categories is None:
+        _seasonal_categories = [name for name, data in get_main_categories().items()
+                                if 'washington_seasonal_multipliers' in data]
+        if _seasonal_categories:
+            logging.info(f"🗓️  Washington State seasonal trends active for {len(_seasonal_categories)} categories: {', '.join(_seasonal_categories)}")
+        else:
+            logging.info("⚠️  No seasonal trends found - using equal weights for all categories")
+    return _seasonal_categories
 
 def weighted_store_choice():
     """Choose a store based on weighted distribution"""
+    stores = get_stores()
     store_names = list(stores.keys())
     weights = [stores[store]['customer_distribution_weight'] for store in store_names]
     return random.choices(store_names, weights=weights, k=1)[0]
@@ -300,11 +424,17 @@ def create_database_schema(conn):
             )
         """)
         
+        # Table types for the tvp loader
+        for type_name, columns in TVP_TYPES.values():
+            cursor.execute(f"""
+                IF TYPE_ID(N'{SCHEMA_NAME}.{type_name}') IS NULL
+                EXEC('CREATE TYPE [{SCHEMA_NAME}].[{type_name}] AS TABLE ({columns})')
+            """)
+        
         conn.commit()
         logging.info("Database tables created successfully!")
         
-        # Create performance indexes
-        create_indexes(conn)
+        # Performance indexes are created after the bulk load (see create_indexes)
         
         # Note: Row Level Security setup removed for compatibility
         logging.info("Skipping Row Level Security setup for compatibility")
@@ -315,14 +445,19 @@ def create_database_schema(conn):
         conn.rollback()
         raise
 
-def create_indexes(conn):
+def create_indexes(conn, index_profile: str = DEFAULT_INDEX_PROFILE):
     """Create performance indexes for SQL Server"""
+    if index_profile not in INDEX_PROFILES:
+        raise ValueError(f"Unknown index profile '{index_profile}' (expected one of: {', '.join(INDEX_PROFILES)})")
+    
     try:
         cursor = conn.cursor()
-        logging.info("Creating performance indexes...")
+        logging.info(f"Creating performance indexes (profile: {index_profile})...")
         
         # Helper function to create index if it doesn't exist
         def create_index_if_not_exists(index_name, table_name, columns):
+            if index_profile == 'columnstore' and index_name in COLUMNSTORE_REPLACED_INDEXES:
+                return
             try:
                 cursor.execute(f"""
                     IF NOT EXISTS (SELECT name FROM sys.indexes WHERE name = N'{index_name}')
@@ -377,12 +512,131 @@ def create_indexes(conn):
         create_index_if_not_exists('idx_customers_primary_store', 'customers', 'primary_store_id')
         
         conn.commit()
+        
+        if index_profile == 'columnstore':
+            create_columnstore_indexes(conn)
+        
         logging.info("Performance indexes created successfully!")
     except Exception as e:
         logging.error(f"Error creating indexes: {e}")
         conn.rollback()
         raise
 
+def create_columnstore_indexes(conn):
+    """Create the nonclustered columnstore indexes of the columnstore profile"""
+    cursor = conn.cursor()
+    for index_name, (table_name, columns) in COLUMNSTORE_INDEXES.items():
+        cursor.execute(f"""
+            IF NOT EXISTS (SELECT name FROM sys.indexes WHERE name = N'{index_name}')
+            CREATE NONCLUSTERED COLUMNSTORE INDEX {index_name} ON {SCHEMA_NAME}.{table_name} ({columns})
+        """)
+        logging.info(f"  Columnstore index {index_name} on {table_name}")
+    conn.commit()
+
+def drop_columnstore_indexes(conn):
+    """Drop the columnstore indexes (back to the rowstore profile)"""
+    cursor = conn.cursor()
+    for index_name, (table_name, _) in COLUMNSTORE_INDEXES.items():
+        cursor.execute(f"""
+            IF EXISTS (SELECT name FROM sys.indexes WHERE name = N'{index_name}')
+            DROP INDEX {index_name} ON {SCHEMA_NAME}.{table_name}
+        """)
+    conn.commit()
+
+def index_benchmark_queries(year: Optional[int] = None) -> List[Tuple[str, str]]:
+    """Typical store / category / month aggregations: (label, query). Default year: last full year"""
+    if year is None:
+        year = ORDER_YEARS[-2]
+    return [
+        ("Revenue by store and month", f"""
+            SELECT o.store_id, YEAR(o.order_date) AS order_year, MONTH(o.order_date) AS order_month,
+                   SUM(oi.total_amount) AS revenue, COUNT(DISTINCT o.order_id) AS orders
+            FROM {SCHEMA_NAME}.orders o
+            JOIN {SCHEMA_NAME}.order_items oi ON o.order_id = oi.order_id
+            GROUP BY o.store_id, YEAR(o.order_date), MONTH(o.order_date)
+        """),
+        (f"Revenue by category ({year})", f"""
+            SELECT p.category_id, SUM(oi.total_amount) AS revenue, SUM(oi.quantity) AS units
+            FROM {SCHEMA_NAME}.order_items oi
+            JOIN {SCHEMA_NAME}.orders o ON o.order_id = oi.order_id
+            JOIN {SCHEMA_NAME}.products p ON p.product_id = oi.product_id
+            WHERE o.order_date >= '{year}-01-01' AND o.order_date < '{year + 1}-01-01'
+            GROUP BY p.category_id
+        """),
+        ("Top 20 products by revenue", f"""
+            SELECT TOP 20 oi.product_id, SUM(oi.total_amount) AS revenue
+            FROM {SCHEMA_NAME}.order_items oi
+            GROUP BY oi.product_id
+            ORDER BY revenue DESC
+        """),
+        ("Discount totals by store", f"""
+            SELECT oi.store_id, SUM(oi.discount_amount) AS discounts, AVG(oi.unit_price) AS avg_price
+            FROM {SCHEMA_NAME}.order_items oi
+            WHERE oi.discount_percent > 0
+            GROUP BY oi.store_id
+        """),
+    ]
+
+def time_query(conn, sql: str, runs: int) -> float:
+    """Median milliseconds over several runs, after one warm-up run"""
+    cursor = conn.cursor()
+    cursor.execute(sql)
+    cursor.fetchall()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        cursor.execute(sql)
+        cursor.fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def benchmark_index_profiles(conn, runs: int = 5) -> None:
+    """
+    Time the analytics queries on rowstore and on columnstore indexes.
+    
+    Both profiles run against the same data: the rowstore timings use the
+    IGNORE_NONCLUSTERED_COLUMNSTORE_INDEX hint, so the columnstore indexes are
+    only created (and dropped again afterwards) when they do not exist yet.
+    """
+    index_names = ', '.join(f"N'{name}'" for name in COLUMNSTORE_INDEXES)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM sys.indexes WHERE name IN ({index_names})")
+    had_columnstore = cursor.fetchone()[0] == len(COLUMNSTORE_INDEXES)
+    
+    try:
+        if not had_columnstore:
+            logging.info("Creating columnstore indexes for the benchmark...")
+            create_columnstore_indexes(conn)
+        
+        cursor.execute(f"""
+            SELECT i.name, SUM(rg.total_rows), SUM(rg.size_in_bytes)
+            FROM sys.dm_db_column_store_row_group_physical_stats rg
+            JOIN sys.indexes i ON i.object_id = rg.object_id AND i.index_id = rg.index_id
+            WHERE i.name IN ({index_names})
+            GROUP BY i.name
+        """)
+        sizes = cursor.fetchall()
+        
+        results = []
+        for label, sql in index_benchmark_queries():
+            rowstore_ms = time_query(conn, f"{sql} OPTION (IGNORE_NONCLUSTERED_COLUMNSTORE_INDEX)", runs)
+            columnstore_ms = time_query(conn, sql, runs)
+            results.append((label, rowstore_ms, columnstore_ms))
+    finally:
+        if not had_columnstore:
+            drop_columnstore_indexes(conn)
+    
+    logging.info(f"\n📊 INDEX PROFILE BENCHMARK (median of {runs} runs):")
+    logging.info("   Query                                 Rowstore ms  Columnstore ms  Speedup")
+    logging.info("   " + "-" * 78)
+    for label, rowstore_ms, columnstore_ms in results:
+        speedup = rowstore_ms / columnstore_ms if columnstore_ms > 0 else 0
+        logging.info(f"   {label:<36} {rowstore_ms:>12.1f} {columnstore_ms:>15.1f} {speedup:>8.1f}x")
+    
+    for name, total_rows, size_bytes in sizes:
+        logging.info(f"   {name}: {total_rows:,} rows in {size_bytes / (1024 * 1024):,.1f} MB")
+
 def setup_row_level_security(conn):
     """Setup Row Level Security for SQL Server"""
     try:
@@ -536,7 +790,89 @@ def batch_insert(conn, query: str, data: List[Tuple], batch_size: int = 1000):
         cursor.executemany(query, batch)
     conn.commit()
 
-def insert_customers(conn, num_customers: int = 100000):
+def bulk_insert(conn, table: str, columns: List[str], rows: List[Tuple], loader: str = DEFAULT_SQL_LOADER,
+                batch_size: int = BULK_BATCH_SIZE, target: Optional[str] = None, identity_insert: bool = False) -> int:
+    """
+    Insert rows with the chosen loader and record the timing under table.
+    
+    target defaults to the retail table; the loader benchmark points it at a
+    temp table. identity_insert allows explicit IDENTITY values (order_id).
+    """
+    if loader not in SQL_LOADERS:
+        raise ValueError(f"Unknown loader '{loader}' (expected one of: {', '.join(SQL_LOADERS)})")
+    
+    target = target or f"{SCHEMA_NAME}.{table}"
+    column_list = ', '.join(columns)
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    
+    if identity_insert:
+        cursor.execute(f"SET IDENTITY_INSERT {target} ON")
+    try:
+        if loader == 'tvp' and table in TVP_TYPES:
+            # One round trip per batch: the whole batch travels as a single table-valued parameter
+            type_name, _ = TVP_TYPES[table]
+            for i in range(0, len(rows), batch_size):
+                tvp = [type_name, SCHEMA_NAME] + rows[i:i + batch_size]
+                cursor.execute(f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM ?", (tvp,))
+        else:
+            if loader != 'executemany':
+                cursor.fast_executemany = True
+                if table in BULK_INPUT_SIZES:
+                    cursor.setinputsizes(BULK_INPUT_SIZES[table])
+            placeholders = ', '.join('?' for _ in columns)
+            query = f"INSERT INTO {target} ({column_list}) VALUES ({placeholders})"
+            for i in range(0, len(rows), batch_size):
+                cursor.executemany(query, rows[i:i + batch_size])
+    finally:
+        if identity_insert:
+            cursor.execute(f"SET IDENTITY_INSERT {target} OFF")
+    conn.commit()
+    
+    elapsed = time.perf_counter() - start
+    timing = load_timings.setdefault(table, {'rows': 0, 'seconds': 0.0, 'calls': 0})
+    timing['rows'] += len(rows)
+    timing['seconds'] += elapsed
+    timing['calls'] += 1
+    return len(rows)
+
+def log_load_timings(loader: str):
+    """Log rows, seconds and rows/sec per bulk-loaded table"""
+    if not load_timings:
+        return
+    
+    logging.info(f"\n⏱️  LOAD TIMINGS (loader: {loader}):")
+    logging.info("   Table           Rows        Seconds    Rows/sec")
+    logging.info("   " + "-" * 50)
+    for table, timing in load_timings.items():
+        rate = timing['rows'] / timing['seconds'] if timing['seconds'] > 0 else 0
+        logging.info(f"   {table:<14} {timing['rows']:>10,} {timing['seconds']:>10.2f} {rate:>11,.0f}")
+
+def timed_phase(name: str, func, *args, **kwargs):
+    """Run a build phase and record how long it took"""
+    logging.info(f"\n⏳ {name}...")
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    phase_timings[name] = time.perf_counter() - start
+    logging.info(f"✓ {name} completed in {phase_timings[name]:.2f}s")
+    return result
+
+def log_phase_timings():
+    """Log the elapsed time of every build phase"""
+    if not phase_timings:
+        return
+    
+    total = sum(phase_timings.values())
+    logging.info("\n⏱️  BUILD PHASE TIMINGS:")
+    logging.info("   Phase                              Seconds    Share")
+    logging.info("   " + "-" * 52)
+    for name, seconds in phase_timings.items():
+        share = 100.0 * seconds / total if total > 0 else 0
+        logging.info(f"   {name:<34} {seconds:>8.2f}   {share:>5.1f}%")
+    logging.info("   " + "-" * 52)
+    logging.info(f"   {'Total':<34} {total:>8.2f}")
+
+def insert_customers(conn, num_customers: int = 100000, loader: str = DEFAULT_SQL_LOADER):
     """Insert customer data into the database"""
     try:
         logging.info(f"Generating {num_customers:,} customers...")
@@ -552,8 +888,8 @@ def insert_customers(conn, num_customers: int = 100000):
         customers_data = []
         
         for i in range(1, num_customers + 1):
-            first_name = fake.first_name().replace("'", "''")  # Escape single quotes
-            last_name = fake.last_name().replace("'", "''")
+            first_name = fake.first_name()
+            last_name = fake.last_name()
             email = f"{first_name.lower()}.{last_name.lower()}.{i}@example.com"
             phone = generate_phone_number()
             
@@ -572,7 +908,8 @@ def insert_customers(conn, num_customers: int = 100000):
             
             customers_data.append((first_name, last_name, email, phone, primary_store_id))
         
-        batch_insert(conn, f"INSERT INTO {SCHEMA_NAME}.customers (first_name, last_name, email, phone, primary_store_id) VALUES (?, ?, ?, ?, ?)", customers_data)
+        bulk_insert(conn, 'customers', ['first_name', 'last_name', 'email', 'phone', 'primary_store_id'],
+                    customers_data, loader)
         
         # Log customer distribution by store
         cursor.execute(f"""
@@ -608,7 +945,7 @@ def insert_stores(conn):
         
         stores_data = []
         
-        for store_name, store_config in stores.items():
+        for store_name, store_config in get_stores().items():
             # Determine if this is an online store
             is_online = "online" in store_name.lower()
             # Get the fixed UUID from the reference data
@@ -640,7 +977,7 @@ def insert_categories(conn):
         categories_data = []
         
         # Extract unique categories from product data
-        for main_category in main_categories:
+        for main_category in get_main_categories():
             categories_data.append((main_category,))
         
         batch_insert(conn, f"INSERT INTO {SCHEMA_NAME}.categories (category_name) VALUES (?)", categories_data)
@@ -666,7 +1003,7 @@ def insert_product_types(conn):
             category_mapping[row[1]] = row[0]  # row[1] is category_name, row[0] is category_id
         
         # Extract product types for each category
-        for main_category, subcategories in main_categories.items():
+        for main_category, subcategories in get_main_categories().items():
             category_id = category_mapping[main_category]
             for subcategory in subcategories:
                 # Skip the seasonal multipliers key
@@ -703,7 +1040,7 @@ def insert_products(conn):
         
         products_data = []
         
-        for main_category, subcategories in main_categories.items():
+        for main_category, subcategories in get_main_categories().items():
             category_id = category_mapping[main_category]
             
             for subcategory, product_list in subcategories.items():
@@ -721,17 +1058,13 @@ def insert_products(conn):
                     
                 for product_details in product_list:
                     product_name = product_details["name"]
-                    sku = product_details.get("sku", f"SKU{len(products_data)+1:06d}")  # Fallback if no SKU
+                    sku = product_sku(product_details, len(products_data) + 1)  # Fallback if no SKU
                     json_price = product_details["price"]
                     description = product_details["description"]
                     
-                    # Treat the JSON price as the cost
+                    # Treat the JSON price as the cost, sold at a 33% gross margin
                     cost = float(json_price)
-                    
-                    # Calculate selling price for 33% gross margin
-                    # Gross Margin = (Selling Price - Cost) / Selling Price = 0.33
-                    # Therefore: Selling Price = Cost / (1 - 0.33) = Cost / 0.67
-                    base_price = round(cost / 0.67, 2)
+                    base_price = selling_price(cost)
                     
                     products_data.append((sku, product_name, category_id, type_id, cost, base_price, description))
         
@@ -745,7 +1078,7 @@ def insert_products(conn):
 
 def get_store_multipliers(store_name):
     """Get order frequency multipliers based on store name"""
-    store_data = stores.get(store_name, {
+    store_data = get_stores().get(store_name, {
         'customer_distribution_weight': 1,
         'order_frequency_multiplier': 1.0, 
         'order_value_multiplier': 1.0
@@ -754,27 +1087,20 @@ def get_store_multipliers(store_name):
 
 def get_yearly_weight(year):
     """Get the weight for each year to create growth pattern"""
-    return reference_data['year_weights'].get(str(year), 1.0)
+    return get_reference_data()['year_weights'].get(str(year), 1.0)
 
 def weighted_year_choice():
     """Choose a year based on growth pattern weights"""
-    years = [2020, 2021, 2022, 2023, 2024, 2025, 2026]
+    years = ORDER_YEARS
     weights = [get_yearly_weight(year) for year in years]
     return random.choices(years, weights=weights, k=1)[0]
 
-def get_store_id_by_name(conn, store_name):
-    """Get store_id for a given store name"""
-    cursor = conn.cursor()
-    cursor.execute(f"SELECT store_id FROM {SCHEMA_NAME}.stores WHERE store_name = ?", (store_name,))
-    row = cursor.fetchone()
-    return row[0] if row else 1  # Default to store_id 1 if not found
-
 def choose_seasonal_product_category(month):
     """Choose a category based on Washington State seasonal multipliers"""
     categories = []
     weights = []
     
-    for category_name, category_data in main_categories.items():
+    for category_name, category_data in get_main_categories().items():
         # Skip if no seasonal multipliers defined for this category
         if 'washington_seasonal_multipliers' not in category_data:
             categories.append(category_name)
@@ -791,8 +1117,9 @@ def choose_seasonal_product_category(month):
 def choose_product_type(main_category):
     """Choose a product type within a category with equal weights"""
     product_types = []
-    for key in main_categories[main_category].keys():
-        if isinstance(main_categories[main_category][key], list):
+    category_data = get_main_categories()[main_category]
+    for key in category_data.keys():
+        if isinstance(category_data[key], list):
             product_types.append(key)
     
     if not product_types:
@@ -883,7 +1210,7 @@ def populate_product_image_embeddings(conn, clear_existing: bool = False, batch_
     """Populate product image embeddings from product_data.json"""
     
     logging.info("Loading product data for embeddings...")
-    products_with_embeddings = extract_products_with_embeddings(product_data)
+    products_with_embeddings = extract_products_with_embeddings(get_product_data())
     
     if not products_with_embeddings:
         logging.warning("No products with embeddings found in the data")
@@ -1038,7 +1365,7 @@ def populate_product_description_embeddings(conn, clear_existing: bool = False,
     """Populate product description embeddings from product_data.json"""
     
     logging.info("Loading product data for description embeddings...")
-    products_with_description_embeddings = extract_products_with_description_embeddings(product_data)
+    products_with_description_embeddings = extract_products_with_description_embeddings(get_product_data())
     
     if not products_with_description_embeddings:
         logging.warning("No products with description embeddings found in the data")
@@ -1127,120 +1454,8 @@ def verify_description_embeddings_table(conn) -> None:
     except Exception as e:
         logging.error(f"Error verifying description embeddings table: {e}")
 
-def insert_inventory(conn):
-    """Insert inventory data distributed across stores based on customer distribution weights and seasonal trends"""
-    try:
-        logging.info("Generating inventory with seasonal considerations...")
-        
-        cursor = conn.cursor()
-        
-        # Get all stores and products with category information
-        cursor.execute(f"SELECT store_id, store_name FROM {SCHEMA_NAME}.stores")
-        stores_data = cursor.fetchall()
-        
-        cursor.execute(f"""
-            SELECT p.product_id, c.category_name 
-            FROM {SCHEMA_NAME}.products p
-            JOIN {SCHEMA_NAME}.categories c ON p.category_id = c.category_id
-        """)
-        products_data = cursor.fetchall()
-        
-        # Build category to seasonal multiplier mapping (using average across year for base inventory)
-        category_seasonal_avg = {}
-        for category_name, category_data in main_categories.items():
-            if 'washington_seasonal_multipliers' in category_data:
-                seasonal_multipliers = category_data['washington_seasonal_multipliers']
-                # Use average seasonal multiplier for inventory planning
-                avg_multiplier = sum(seasonal_multipliers) / len(seasonal_multipliers)
-                category_seasonal_avg[category_name] = avg_multiplier
-            else:
-                category_seasonal_avg[category_name] = 1.0  # Default multiplier
-        
-        inventory_data = []
-        
-        for store in stores_data:
-            store_id = store[0]  # store_id
-            store_name = store[1]  # store_name
-            
-            # Get store configuration for inventory distribution
-            store_config = stores.get(store_name, {})
-            base_stock_multiplier = store_config.get('customer_distribution_weight', 1.0)
-            
-            for product in products_data:
-                product_id = product[0]  # product_id
-                category_name = product[1]  # category_name
-                
-                # Get seasonal multiplier for this category
-                seasonal_multiplier = category_seasonal_avg.get(category_name, 1.0)
-                
-                # Generate stock level based on store weight, seasonal trends, and random variation
-                base_stock = random.randint(10, 100)
-                stock_level = int(base_stock * base_stock_multiplier * seasonal_multiplier * random.uniform(0.5, 1.5))
-                stock_level = max(1, stock_level)  # Ensure at least 1 item in stock
-                
-                inventory_data.append((store_id, product_id, stock_level))
-        
-        batch_insert(conn, f"INSERT INTO {SCHEMA_NAME}.inventory (store_id, product_id, stock_level) VALUES (?, ?, ?)", inventory_data)
-        
-        logging.info(f"Successfully inserted {len(inventory_data):,} inventory records with seasonal adjustments!")
-        
-    except Exception as e:
-        logging.error(f"Error inserting inventory: {e}")
-        raise
-
-def build_product_lookup(conn):
-    """Build a lookup table mapping (main_category, product_type, product_name) to product_id"""
-    try:
-        logging.info("Building product lookup table...")
-        cursor = conn.cursor()
-        
-        # Get all products with their category and type information
-        cursor.execute(f"""
-            SELECT p.product_id, p.sku, p.product_name, p.base_price, p.cost,
-                   c.category_name, pt.type_name
-            FROM {SCHEMA_NAME}.products p
-            JOIN {SCHEMA_NAME}.categories c ON p.category_id = c.category_id
-            JOIN {SCHEMA_NAME}.product_types pt ON p.type_id = pt.type_id
-        """)
-        products = cursor.fetchall()
-        
-        product_lookup = {}
-        
-        for product in products:
-            category = product[5]  # category_name
-            product_type = product[6]  # type_name
-            
-            if category not in product_lookup:
-                product_lookup[category] = {}
-            
-            if product_type not in product_lookup[category]:
-                product_lookup[category][product_type] = []
-            
-            product_lookup[category][product_type].append({
-                'product_id': product[0],
-                'sku': product[1],
-                'name': product[2],
-                'price': float(product[3]),
-                'cost': float(product[4])
-            })
-        
-        logging.info(f"Built product lookup with {len(products):,} products across {len(product_lookup)} categories")
-        return product_lookup
-        
-    except Exception as e:
-        logging.error(f"Error building product lookup: {e}")
-        raise
-
-def insert_orders(conn, num_customers: int = 100000, product_lookup: Optional[Dict] = None):
-    """Insert order data into the database with separate orders and order_items tables"""
-    
-    # Build product lookup if not provided
-    if product_lookup is None:
-        product_lookup = build_product_lookup(conn)
-    
-    logging.info(f"Generating orders for {num_customers:,} customers...")
-    
-    # Get available product IDs for faster random selection and build category mapping
+def load_order_lookups(conn) -> Dict:
+    """Load the product and store maps used while generating orders (one query each)"""
     cursor = conn.cursor()
     cursor.execute(f"""
         SELECT p.product_id, p.cost, p.base_price, c.category_name 
@@ -1250,145 +1465,208 @@ def insert_orders(conn, num_customers: int = 100000, product_lookup: Optional[Di
     product_rows = cursor.fetchall()
     
     product_prices = {row[0]: float(row[2]) for row in product_rows}  # product_id: base_price
-    available_product_ids = list(product_prices.keys())
     
     # Build category to product ID mapping for seasonal selection
     category_products = {}
     for row in product_rows:
-        category_name = row[3]  # category_name
-        if category_name not in category_products:
-            category_products[category_name] = []
-        category_products[category_name].append(row[0])  # product_id
+        category_products.setdefault(row[3], []).append(row[0])
+    
+    # Store name -> store_id, replaces a lookup query per customer
+    cursor.execute(f"SELECT store_name, store_id FROM {SCHEMA_NAME}.stores")
+    store_ids = {row[0]: row[1] for row in cursor.fetchall()}
     
     logging.info(f"Built category mapping with {len(category_products)} categories")
+    return {
+        'product_prices': product_prices,
+        'available_product_ids': list(product_prices.keys()),
+        'category_products': category_products,
+        'store_ids': store_ids,
+    }
+
+def generate_customer_orders(customer_id: int, first_order_id: int, lookups: Dict) -> Tuple[List[Tuple], List[Tuple]]:
+    """
+    Generate the orders and order items for one customer.
+    
+    Order IDs are assigned explicitly from first_order_id so order items can be
+    generated before the orders are inserted.
+    """
+    product_prices = lookups['product_prices']
+    available_product_ids = lookups['available_product_ids']
+    category_products = lookups['category_products']
+    
+    # Determine store preference for this customer
+    preferred_store = weighted_store_choice()
+    store_id = lookups['store_ids'].get(preferred_store, 1)  # Default to store_id 1 if not found
+    
+    # Get store multipliers
+    store_multipliers = get_store_multipliers(preferred_store)
+    order_frequency = store_multipliers['orders']
+    
+    # Determine number of orders for this customer (weighted by store)
+    base_orders = random.choices(ORDERS_PER_CUSTOMER[0], weights=ORDERS_PER_CUSTOMER[1], k=1)[0]
+    num_orders = max(1, int(base_orders * order_frequency))
     
-    total_orders = 0
     orders_data = []
     order_items_data = []
     
-    for customer_id in range(1, num_customers + 1):
-        # Determine store preference for this customer
-        preferred_store = weighted_store_choice()
-        store_id = get_store_id_by_name(conn, preferred_store)
+    for order_id in range(first_order_id, first_order_id + num_orders):
+        # Generate order date with yearly growth pattern
+        year = weighted_year_choice()
+        month = random.randint(1, 12)
+        
+        # Use seasonal category selection for realistic patterns
+        selected_category = None
+        if get_seasonal_categories():
+            # Choose category based on seasonal multipliers for this month
+            # Increase seasonal bias by selecting seasonal category with higher probability
+            if random.random() < SEASONAL_CATEGORY_RATE:
+                selected_category = choose_seasonal_product_category(month)
+            else:
+                selected_category = random.choice(list(get_main_categories().keys()))
+        else:
+            # No seasonal trends available, use random category selection
+            selected_category = random.choice(list(get_main_categories().keys()))
+        
+        # Generate random day within the month
+        if month == 2:  # February
+            max_day = 28 if year % 4 != 0 else 29
+        elif month in [4, 6, 9, 11]:  # April, June, September, November
+            max_day = 30
+        else:
+            max_day = 31
         
-        # Get store multipliers
-        store_multipliers = get_store_multipliers(preferred_store)
-        order_frequency = store_multipliers['orders']
+        day = random.randint(1, max_day)
+        order_date = date(year, month, day)
         
-        # Determine number of orders for this customer (weighted by store)
-        base_orders = random.choices([0, 1, 2, 3, 4, 5], weights=[20, 40, 20, 10, 7, 3], k=1)[0]
-        num_orders = max(1, int(base_orders * order_frequency))
+        orders_data.append((order_id, customer_id, store_id, order_date))
         
-        for _ in range(num_orders):
-            total_orders += 1
-            order_id = total_orders
-            
-            # Generate order date with yearly growth pattern
-            year = weighted_year_choice()
-            month = random.randint(1, 12)
-            
-            # Use seasonal category selection for realistic patterns
-            selected_category = None
-            if seasonal_categories:
-                # Choose category based on seasonal multipliers for this month
-                # Increase seasonal bias by selecting seasonal category with higher probability
-                if random.random() < 0.85:  # 85% seasonal selection
-                    selected_category = choose_seasonal_product_category(month)
+        # Generate order items for this order
+        num_items = random.choices(ITEMS_PER_ORDER[0], weights=ITEMS_PER_ORDER[1], k=1)[0]
+        
+        for _ in range(num_items):
+            # Select product based on seasonal category preferences
+            if get_seasonal_categories() and selected_category in category_products:
+                # Use seasonally-appropriate products most of the time
+                if random.random() < SEASONAL_PRODUCT_RATE:
+                    product_id = random.choice(category_products[selected_category])
                 else:
-                    selected_category = random.choice(list(main_categories.keys()))
-            else:
-                # No seasonal trends available, use random category selection
-                selected_category = random.choice(list(main_categories.keys()))
-            
-            # Generate random day within the month
-            if month == 2:  # February
-                max_day = 28 if year % 4 != 0 else 29
-            elif month in [4, 6, 9, 11]:  # April, June, September, November
-                max_day = 30
+                    # Otherwise select from any category (for variety)
+                    product_id = random.choice(available_product_ids)
             else:
-                max_day = 31
+                # No seasonal data available or category not found, use random selection
+                product_id = random.choice(available_product_ids)
+                
+            base_price = product_prices[product_id]
             
-            day = random.randint(1, max_day)
-            order_date = date(year, month, day)
+            # Generate quantity and pricing
+            quantity = random.choices(ITEM_QUANTITY[0], weights=ITEM_QUANTITY[1], k=1)[0]
+            unit_price = base_price * random.uniform(*PRICE_VARIATION)  # Price variation
             
-            orders_data.append((customer_id, store_id, order_date))
+            # Apply discounts occasionally
+            discount_percent = 0
+            discount_amount = 0
+            if random.random() < DISCOUNT_RATE:
+                discount_percent = random.choice(DISCOUNT_PERCENTS)
+                discount_amount = (unit_price * quantity * discount_percent) / 100
             
-            # Generate order items for this order
-            num_items = random.choices([1, 2, 3, 4, 5], weights=[40, 30, 15, 10, 5], k=1)[0]
+            total_amount = (unit_price * quantity) - discount_amount
             
-            for _ in range(num_items):
-                # Select product based on seasonal category preferences
-                if seasonal_categories and selected_category in category_products:
-                    # Use seasonally-appropriate products with 90% probability (increased from 70%)
-                    if random.random() < 0.9:
-                        product_id = random.choice(category_products[selected_category])
-                    else:
-                        # 10% chance to select from any category (for variety)
-                        product_id = random.choice(available_product_ids)
-                else:
-                    # No seasonal data available or category not found, use random selection
-                    product_id = random.choice(available_product_ids)
-                    
-                base_price = product_prices[product_id]
-                
-                # Generate quantity and pricing
-                quantity = random.choices([1, 2, 3, 4, 5], weights=[60, 25, 10, 3, 2], k=1)[0]
-                unit_price = base_price * random.uniform(0.8, 1.2)  # Price variation
-                
-                # Apply discounts occasionally
-                discount_percent = 0
-                discount_amount = 0
-                if random.random() < 0.15:  # 15% chance of discount
-                    discount_percent = random.choice([5, 10, 15, 20, 25])
-                    discount_amount = (unit_price * quantity * discount_percent) / 100
-                
-                total_amount = (unit_price * quantity) - discount_amount
-                
-                order_items_data.append((
-                    order_id, store_id, product_id, quantity, unit_price, 
-                    discount_percent, discount_amount, total_amount
-                ))
-        
-        # Batch insert every 1000 customers to manage memory
-        if customer_id % 1000 == 0:
-            if orders_data:
-                batch_insert(conn, f"""
-                    INSERT INTO {SCHEMA_NAME}.orders (customer_id, store_id, order_date) 
-                    VALUES (?, ?, ?)
-                """, orders_data)
-                orders_data = []
-            
-            if order_items_data:
-                batch_insert(conn, f"""
-                    INSERT INTO {SCHEMA_NAME}.order_items 
-                    (order_id, store_id, product_id, quantity, unit_price, discount_percent, discount_amount, total_amount) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, order_items_data)
-                order_items_data = []
-            
-            if customer_id % 5000 == 0:
-                logging.info(f"Processed {customer_id:,} customers, generated {total_orders:,} orders")
+            # Amounts as DECIMAL(10,2) values so fast_executemany binds them without conversion
+            order_items_data.append((
+                order_id, store_id, product_id, quantity, Decimal(f"{unit_price:.2f}"),
+                discount_percent, Decimal(f"{discount_amount:.2f}"), Decimal(f"{total_amount:.2f}")
+            ))
     
-    # Insert remaining data
-    if orders_data:
-        batch_insert(conn, f"""
-            INSERT INTO {SCHEMA_NAME}.orders (customer_id, store_id, order_date) 
-            VALUES (?, ?, ?)
-        """, orders_data)
+    return orders_data, order_items_data
+
+def insert_orders(conn, num_customers: int = 100000, loader: str = DEFAULT_SQL_LOADER):
+    """Insert order data into the database with separate orders and order_items tables"""
+    
+    logging.info(f"Generating orders for {num_customers:,} customers (loader: {loader})...")
+    
+    lookups = load_order_lookups(conn)
+    
+    total_orders = 0
+    total_items = 0
+    orders_data = []
+    order_items_data = []
     
-    if order_items_data:
-        batch_insert(conn, f"""
-            INSERT INTO {SCHEMA_NAME}.order_items 
-            (order_id, store_id, product_id, quantity, unit_price, discount_percent, discount_amount, total_amount) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, order_items_data)
+    def flush():
+        # Orders first so the order_items foreign key is satisfied
+        if orders_data:
+            bulk_insert(conn, 'orders', ORDER_COLUMNS, orders_data, loader, identity_insert=True)
+            orders_data.clear()
+        if order_items_data:
+            bulk_insert(conn, 'order_items', ORDER_ITEM_COLUMNS, order_items_data, loader)
+            order_items_data.clear()
+    
+    for customer_id in range(1, num_customers + 1):
+        orders, items = generate_customer_orders(customer_id, total_orders + 1, lookups)
+        orders_data.extend(orders)
+        order_items_data.extend(items)
+        total_orders += len(orders)
+        total_items += len(items)
+        
+        # Flush every BULK_BATCH_SIZE order items to manage memory
+        if len(order_items_data) >= BULK_BATCH_SIZE:
+            flush()
+        
+        if customer_id % 5000 == 0:
+            logging.info(f"Processed {customer_id:,} customers, generated {total_orders:,} orders")
+    
+    # Insert remaining data
+    flush()
     
     logging.info(f"Successfully inserted {total_orders:,} orders!")
+    logging.info(f"Successfully inserted {total_items:,} order items!")
+
+def benchmark_loaders(conn, num_customers: int = 2000):
+    """
+    Load the same generated orders and order items with every loader and compare.
     
-    # Get order items count
-    cursor.execute(f"SELECT COUNT(*) FROM {SCHEMA_NAME}.order_items")
-    order_items_count = cursor.fetchone()[0]
-    logging.info(f"Successfully inserted {order_items_count:,} order items!")
+    Rows go into session temp tables (#bench_orders, #bench_order_items) with
+    the same column types as the retail tables, so the benchmark can run
+    against a populated database without touching its data.
+    """
+    logging.info(f"\n🏁 Benchmarking loaders with orders for {num_customers:,} customers...")
+    
+    lookups = load_order_lookups(conn)
+    orders_data = []
+    order_items_data = []
+    for customer_id in range(1, num_customers + 1):
+        orders, items = generate_customer_orders(customer_id, len(orders_data) + 1, lookups)
+        orders_data.extend(orders)
+        order_items_data.extend(items)
+    
+    cursor = conn.cursor()
+    results = []
+    for loader in SQL_LOADERS:
+        cursor.execute("IF OBJECT_ID('tempdb..#bench_orders') IS NOT NULL DROP TABLE #bench_orders")
+        cursor.execute("IF OBJECT_ID('tempdb..#bench_order_items') IS NOT NULL DROP TABLE #bench_order_items")
+        cursor.execute(f"CREATE TABLE #bench_orders ({TVP_TYPES['orders'][1]})")
+        cursor.execute(f"CREATE TABLE #bench_order_items ({TVP_TYPES['order_items'][1]})")
+        conn.commit()
+        
+        load_timings.clear()
+        bulk_insert(conn, 'orders', ORDER_COLUMNS, orders_data, loader, target='#bench_orders')
+        bulk_insert(conn, 'order_items', ORDER_ITEM_COLUMNS, order_items_data, loader, target='#bench_order_items')
+        seconds = sum(timing['seconds'] for timing in load_timings.values())
+        results.append((loader, seconds))
+    
+    cursor.execute("DROP TABLE #bench_orders")
+    cursor.execute("DROP TABLE #bench_order_items")
+    conn.commit()
+    load_timings.clear()
+    
+    total_rows = len(orders_data) + len(order_items_data)
+    baseline = results[0][1]
+    logging.info(f"\n   {len(orders_data):,} orders + {len(order_items_data):,} order items")
+    logging.info("   Loader         Seconds     Rows/sec    Speedup")
+    logging.info("   " + "-" * 50)
+    for loader, seconds in results:
+        rate = total_rows / seconds if seconds > 0 else 0
+        speedup = baseline / seconds if seconds > 0 else 0
+        logging.info(f"   {loader:<12} {seconds:>9.2f} {rate:>12,.0f} {speedup:>9.1f}x")
 
 def verify_database_contents(conn) -> None:
     """Verify database contents and show key statistics"""
@@ -1577,7 +1855,7 @@ def verify_seasonal_patterns(conn):
         month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", 
                        "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
         
-        for category_name, category_config in main_categories.items():
+        for category_name, category_config in get_main_categories().items():
             if 'washington_seasonal_multipliers' not in category_config:
                 continue
                 
@@ -1654,7 +1932,7 @@ def verify_seasonal_patterns(conn):
         
         # Calculate expected inventory ratios based on seasonal averages
         expected_inventory = {}
-        for category_name, category_config in main_categories.items():
+        for category_name, category_config in get_main_categories().items():
             if 'washington_seasonal_multipliers' in category_config:
                 seasonal_multipliers = category_config['washington_seasonal_multipliers']
                 avg_multiplier = sum(seasonal_multipliers) / len(seasonal_multipliers)
@@ -1738,9 +2016,15 @@ def verify_seasonal_patterns(conn):
         logging.error(f"Error verifying seasonal patterns: {e}")
         raise
 
-def generate_sql_server_database(num_customers: int = 50000):
+def generate_sql_server_database(num_customers: int = 50000, loader: str = DEFAULT_SQL_LOADER,
+                                 index_profile: str = DEFAULT_INDEX_PROFILE):
     """Generate complete SQL Server database"""
+    load_timings.clear()
+    phase_timings.clear()
     try:
+        # A full build runs the embeddings phase, so decode product_data.json once, with embeddings
+        get_product_data()
+        
         # Create connection
         conn = create_connection()
         
@@ -1774,6 +2058,11 @@ def generate_sql_server_database(num_customers: int = 50000):
                             DROP TABLE [{SCHEMA_NAME}].[customers]
                         IF EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = '{SCHEMA_NAME}' AND TABLE_NAME = 'stores')
                             DROP TABLE [{SCHEMA_NAME}].[stores]
+                        -- Drop the bulk load table types
+                        IF TYPE_ID(N'{SCHEMA_NAME}.order_item_rows') IS NOT NULL
+                            DROP TYPE [{SCHEMA_NAME}].[order_item_rows]
+                        IF TYPE_ID(N'{SCHEMA_NAME}.order_rows') IS NOT NULL
+                            DROP TYPE [{SCHEMA_NAME}].[order_rows]
                         -- Drop the schema
                         DROP SCHEMA [{SCHEMA_NAME}]
                     END
@@ -1784,24 +2073,28 @@ def generate_sql_server_database(num_customers: int = 50000):
                 logging.info(f"Schema drop completed (some objects may not have existed): {drop_error}")
                 conn.rollback()
             
-            create_database_schema(conn)
-            insert_stores(conn)
-            insert_categories(conn)
-            insert_product_types(conn)
-            insert_customers(conn, num_customers)
-            insert_products(conn)
+            timed_phase("Schema", create_database_schema, conn)
+            timed_phase("Stores", insert_stores, conn)
+            timed_phase("Categories", insert_categories, conn)
+            timed_phase("Product types", insert_product_types, conn)
+            timed_phase("Customers", insert_customers, conn, num_customers, loader)
+            timed_phase("Products", insert_products, conn)
             
             # Insert inventory data
             logging.info("\n" + "=" * 50)
             logging.info("INSERTING INVENTORY DATA")
             logging.info("=" * 50)
-            insert_inventory(conn)
+            timed_phase("Inventory", insert_inventory, conn, loader)
             
             # Insert order data
             logging.info("\n" + "=" * 50)
             logging.info("INSERTING ORDER DATA")
             logging.info("=" * 50)
-            insert_orders(conn, num_customers)
+            timed_phase("Orders", insert_orders, conn, num_customers, loader)
+            log_load_timings(loader)
+            
+            # Indexes are built once over the loaded tables instead of being maintained row by row
+            timed_phase("Indexes", create_indexes, conn, index_profile)
             
             # Populate product embeddings
             logging.info("\n" + "=" * 50)
@@ -1810,11 +2103,11 @@ def generate_sql_server_database(num_customers: int = 50000):
             
             # Populate image embeddings
             logging.info("Populating product image embeddings...")
-            populate_product_image_embeddings(conn, clear_existing=True)
+            timed_phase("Image embeddings", populate_product_image_embeddings, conn, clear_existing=True)
             
             # Populate description embeddings
             logging.info("Populating product description embeddings...")
-            populate_product_description_embeddings(conn, clear_existing=True)
+            timed_phase("Description embeddings", populate_product_description_embeddings, conn, clear_existing=True)
             
             # Verify embeddings
             logging.info("Verifying image embeddings...")
@@ -1828,6 +2121,7 @@ def generate_sql_server_database(num_customers: int = 50000):
             logging.info("FINAL DATABASE VERIFICATION")
             logging.info("=" * 50)
             verify_database_contents(conn)
+            log_phase_timings()
             
             logging.info("\n" + "=" * 50)
             logging.info("DATABASE GENERATION COMPLETE")
@@ -1901,6 +2195,18 @@ def main():
                        help='Batch size for processing embeddings (default: 100)')
     parser.add_argument('--num-customers', type=int, default=50000,
                        help='Number of customers to generate (default: 50000)')
+    parser.add_argument('--loader', choices=SQL_LOADERS, default=DEFAULT_SQL_LOADER,
+                       help=f'Bulk loader for customers, inventory, orders and order items (default: {DEFAULT_SQL_LOADER})')
+    parser.add_argument('--benchmark-loaders', action='store_true',
+                       help='Compare load times of every loader on generated orders (database must already exist)')
+    parser.add_argument('--benchmark-customers', type=int, default=2000,
+                       help='Customers to generate orders for in --benchmark-loaders (default: 2000)')
+    parser.add_argument('--index-profile', choices=INDEX_PROFILES, default=DEFAULT_INDEX_PROFILE,
+                       help=f'Index profile to build (default: {DEFAULT_INDEX_PROFILE})')
+    parser.add_argument('--benchmark-indexes', action='store_true',
+                       help='Compare analytics query times on rowstore and columnstore indexes (database must already exist)')
+    parser.add_argument('--benchmark-runs', type=int, default=5,
+                       help='Timed runs per query in --benchmark-indexes (default: 5)')
     
     args = parser.parse_args()
     
@@ -1908,6 +2214,18 @@ def main():
         if args.show_stats:
             # Show database statistics
             show_database_stats()
+        elif args.benchmark_loaders:
+            conn = create_connection()
+            try:
+                benchmark_loaders(conn, args.benchmark_customers)
+            finally:
+                conn.close()
+        elif args.benchmark_indexes:
+            conn = create_connection()
+            try:
+                benchmark_index_profiles(conn, args.benchmark_runs)
+            finally:
+                conn.close()
         elif args.verify_embeddings:
             # Only verify embeddings tables
             logging.info("Verifying embeddings tables...")
@@ -1943,7 +2261,8 @@ def main():
             logging.info(f"Database will be created at {SQL_SERVER_CONFIG['server']}")
             logging.info(f"Database: {SQL_SERVER_CONFIG['database']}")
             logging.info(f"Schema: {SCHEMA_NAME}")
-            generate_sql_server_database(num_customers=args.num_customers)
+            generate_sql_server_database(num_customers=args.num_customers, loader=args.loader,
+                                         index_profile=args.index_profile)
             
             logging.info("\nDatabase generated successfully!")
             logging.info(f"Server: {SQL_SERVER_CONFIG['server']}")
@@ -1957,77 +2276,44 @@ def main():
         logging.error(f"Failed to complete operation: {e}")
         sys.exit(1)
 
-def build_product_lookup(conn):
-    """Build a lookup table for products by category and type"""
+def insert_inventory(conn, loader: str = DEFAULT_SQL_LOADER):
+    """Insert inventory data distributed across stores based on customer distribution weights and seasonal trends"""
     try:
-        logging.info("Building product lookup table...")
+        logging.info("Generating inventory with seasonal considerations...")
         cursor = conn.cursor()
         
-        # Get all products with their category and type information
+        # Get all stores and products with category information
+        cursor.execute(f"SELECT store_id, store_name FROM {SCHEMA_NAME}.stores")
+        stores = cursor.fetchall()
+        
         cursor.execute(f"""
-            SELECT p.product_id, p.sku, p.product_name, p.base_price, p.cost,
-                   c.category_name, pt.type_name
+            SELECT p.product_id, c.category_name
             FROM {SCHEMA_NAME}.products p
             JOIN {SCHEMA_NAME}.categories c ON p.category_id = c.category_id
-            JOIN {SCHEMA_NAME}.product_types pt ON p.type_id = pt.type_id
         """)
         products = cursor.fetchall()
         
-        product_lookup = {}
-        
-        for product in products:
-            category = product[5]  # category_name
-            product_type = product[6]  # type_name
-            
-            if category not in product_lookup:
-                product_lookup[category] = {}
-            
-            if product_type not in product_lookup[category]:
-                product_lookup[category][product_type] = []
-            
-            product_lookup[category][product_type].append({
-                'product_id': product[0],
-                'sku': product[1],
-                'name': product[2],
-                'price': float(product[3]),
-                'cost': float(product[4])
-            })
-        
-        logging.info(f"Built product lookup with {len(products):,} products across {len(product_lookup)} categories")
-        return product_lookup
-        
-    except Exception as e:
-        logging.error(f"Error building product lookup: {e}")
-        raise
-
-def insert_inventory(conn):
-    """Insert inventory data distributed across stores"""
-    try:
-        logging.info("Generating inventory...")
-        cursor = conn.cursor()
-        
-        # Get all products and stores
-        cursor.execute(f"SELECT product_id FROM {SCHEMA_NAME}.products")
-        products = cursor.fetchall()
-        
-        cursor.execute(f"SELECT store_id FROM {SCHEMA_NAME}.stores")
-        stores = cursor.fetchall()
+        # Average seasonal multiplier per category, used for inventory planning
+        category_seasonal_avg = {}
+        for category_name, category_data in get_main_categories().items():
+            seasonal_multipliers = category_data.get('washington_seasonal_multipliers', [1.0])
+            category_seasonal_avg[category_name] = sum(seasonal_multipliers) / len(seasonal_multipliers)
         
         inventory_data = []
         
-        for product in products:
-            product_id = product[0]
+        for store_id, store_name in stores:
+            base_stock_multiplier = get_stores().get(store_name, {}).get('customer_distribution_weight', 1.0)
             
-            for store in stores:
-                store_id = store[0]
-                
-                # Generate stock level (random between 10-500)
-                stock_level = random.randint(10, 500)
-                inventory_data.append((store_id, product_id, stock_level))
+            for product_id, category_name in products:
+                # Stock level based on store weight, seasonal trends and random variation (at least 1)
+                base_stock = random.randint(*INVENTORY_BASE_STOCK)
+                stock_level = int(base_stock * base_stock_multiplier * category_seasonal_avg.get(category_name, 1.0)
+                                  * random.uniform(*INVENTORY_STOCK_VARIATION))
+                inventory_data.append((store_id, product_id, max(1, stock_level)))
         
-        batch_insert(conn, f"INSERT INTO {SCHEMA_NAME}.inventory (store_id, product_id, stock_level) VALUES (?, ?, ?)", inventory_data)
+        bulk_insert(conn, 'inventory', ['store_id', 'product_id', 'stock_level'], inventory_data, loader)
         
-        logging.info(f"Successfully inserted {len(inventory_data):,} inventory records!")
+        logging.info(f"Successfully inserted {len(inventory_data):,} inventory records with seasonal adjustments!")
     except Exception as e:
         logging.error(f"Error inserting inventory: {e}")
         raise
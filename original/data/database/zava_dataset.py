@@ -0,0 +1,848 @@
+"""
+Zava DIY Dataset Core
+
+Backend-agnostic, columnar synthesis of the large retail tables (customers,
+inventory, orders, order_items). A dataset is synthesized once, in batches of
+NumPy structured arrays, and every batch is handed to one or more sinks, so
+PostgreSQL, SQL Server, MongoDB and Parquet all receive exactly the same rows.
+
+DATASET:
+- Reproducible from (num_customers, seed, batch_customers); each batch has its
+  own RNG stream, so a batch can be regenerated without replaying earlier ones
+- Orders follow the rules in zava_rules.py, shared with the generators: weighted
+  stores, yearly growth weights, Washington State seasonal categories, occasional
+  discounts, order totals computed from the rounded line items
+- Catalog IDs (stores, categories, products) follow the order of
+  reference_data.json / product_data.json; relational sinks map them onto the
+  IDs in the target database by store name and SKU
+
+SINKS:
+- postgres:  asyncpg binary COPY into the retail schema
+- sqlserver: pyodbc fast_executemany (explicit IDs via IDENTITY_INSERT)
+- mongodb:   pymongo insert_many with the string IDs of scripts/generate_mongodb_data.py
+- parquet:   one Parquet file per table, written as Arrow record batches (requires pyarrow)
+
+Relational sinks expect the schema and catalog tables to exist (run the
+matching generator first) and replace customers, inventory, orders and
+order_items.
+
+SCOPE:
+- generate_zava_postgres.py and generate_zava_sql_server.py still synthesize
+  these tables themselves, row by row, from the same zava_rules.py; their
+  builds match this dataset in distribution, not row for row. Load through
+  this module when backends must hold identical rows
+
+CACHE:
+- Generated batches are kept on disk as compressed columnar .npz files, keyed by
+  a SHA-256 of reference_data.json, product_data.json, zava_rules.py, the
+  scale / date parameters and the seed; a repeated run streams the cached batches instead of
+  synthesizing again
+- Evicted least recently used first by total size, and by age
+
+USAGE:
+    python zava_dataset.py --sink parquet --output-dir dataset        # Write Parquet files
+    python zava_dataset.py --sink postgres --sink sqlserver --seed 42 # Same rows into both databases
+    python zava_dataset.py --sink mongodb --num-customers 25000       # Load MongoDB collections
+    python zava_dataset.py --sink postgres --no-cache                 # Always synthesize
+    python zava_dataset.py --evict-cache --cache-max-mb 2048 --cache-max-age-days 14  # Trim the cache
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from faker import Faker
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from zava_rules import (
+    DISCOUNT_PERCENTS,
+    DISCOUNT_RATE,
+    INVENTORY_BASE_STOCK,
+    INVENTORY_STOCK_VARIATION,
+    ITEM_QUANTITY,
+    ITEMS_PER_ORDER,
+    ORDER_YEARS,
+    ORDERS_PER_CUSTOMER,
+    PRICE_VARIATION,
+    SEASONAL_CATEGORY_RATE,
+    SEASONAL_PRODUCT_RATE,
+    product_sku,
+    selling_price,
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_NUM_CUSTOMERS = 50000
+DEFAULT_SEED = 42
+DEFAULT_BATCH_CUSTOMERS = 10000
+
+# On-disk cache of generated batches (ZAVA_DATASET_CACHE overrides the location)
+DEFAULT_CACHE_DIR = os.getenv('ZAVA_DATASET_CACHE', os.path.join(DATA_DIR, '.dataset_cache'))
+DEFAULT_CACHE_MAX_MB = 4096
+DEFAULT_CACHE_MAX_AGE_DAYS = 30
+# Bump when the synthesis code in this module or the file layout change, so old entries stop matching
+# (changes to zava_rules.py are picked up through its hash)
+CACHE_FORMAT_VERSION = 2
+RULES_FILE = os.path.join(DATA_DIR, 'zava_rules.py')
+
+# Table layouts, in load order (customers before orders, orders before order_items)
+TABLE_DTYPES = {
+    'customers': np.dtype([
+        ('customer_id', 'i4'), ('first_name', 'O'), ('last_name', 'O'), ('email', 'O'),
+        ('phone', 'O'), ('primary_store_id', 'i4'),
+    ]),
+    'inventory': np.dtype([('store_id', 'i4'), ('product_id', 'i4'), ('stock_level', 'i4')]),
+    'orders': np.dtype([
+        ('order_id', 'i4'), ('customer_id', 'i4'), ('store_id', 'i4'), ('order_date', 'M8[D]'),
+        ('item_count', 'i4'), ('subtotal', 'f8'), ('discount_total', 'f8'), ('total_amount', 'f8'),
+    ]),
+    'order_items': np.dtype([
+        ('order_id', 'i4'), ('order_date', 'M8[D]'), ('store_id', 'i4'), ('product_id', 'i4'),
+        ('quantity', 'i4'), ('unit_price', 'f8'), ('discount_percent', 'i4'),
+        ('discount_amount', 'f8'), ('total_amount', 'f8'),
+    ]),
+}
+DATASET_TABLES = list(TABLE_DTYPES)
+
+# Columns of the catalog that reference store / product IDs (remapped by relational sinks)
+STORE_ID_COLUMNS = ('store_id', 'primary_store_id')
+PRODUCT_ID_COLUMNS = ('product_id',)
+
+
+class Catalog:
+    """Stores, categories and products from the JSON data files, as NumPy lookup arrays"""
+
+    def __init__(self, reference_data: Dict, product_data: Dict):
+        self.stores = reference_data['stores']
+        self.store_names = list(self.stores)
+        self.store_weights = np.array([s['customer_distribution_weight'] for s in self.stores.values()], dtype='f8')
+        self.store_p = self.store_weights / self.store_weights.sum()
+        self.store_order_frequency = np.array(
+            [s.get('order_frequency_multiplier', 1.0) for s in self.stores.values()], dtype='f8')
+
+        year_weights = np.array([reference_data['year_weights'].get(str(y), 1.0) for y in ORDER_YEARS], dtype='f8')
+        self.year_p = year_weights / year_weights.sum()
+
+        main_categories = product_data['main_categories']
+        self.category_names = list(main_categories)
+        seasonal = []
+        skus = []
+        names = []
+        prices = []
+        product_category = []
+        for category_index, (category_name, category_data) in enumerate(main_categories.items()):
+            seasonal.append(category_data.get('washington_seasonal_multipliers', [1.0] * 12))
+            for type_name, product_list in category_data.items():
+                if type_name == 'washington_seasonal_multipliers' or not product_list:
+                    continue
+                for product in product_list:
+                    skus.append(product_sku(product, len(skus) + 1))
+                    names.append(product['name'])
+                    prices.append(selling_price(float(product['price'])))
+                    product_category.append(category_index)
+
+        # (categories, 12) seasonal weights and the average used for inventory planning
+        self.seasonal = np.array(seasonal, dtype='f8')
+        self.seasonal_avg = self.seasonal.mean(axis=1)
+        self.has_seasonal = any('washington_seasonal_multipliers' in c for c in main_categories.values())
+
+        # Product i has product_id i + 1
+        self.product_skus = skus
+        self.product_names = names
+        self.product_prices = np.array(prices, dtype='f8')
+        self.product_category = np.array(product_category, dtype='i4')
+        self.category_products = [np.flatnonzero(self.product_category == c) for c in range(len(self.category_names))]
+
+    @classmethod
+    def from_files(cls, data_dir: str = DATA_DIR) -> 'Catalog':
+        with open(os.path.join(data_dir, 'reference_data.json'), 'r') as f:
+            reference_data = json.load(f)
+        with open(os.path.join(data_dir, 'product_data.json'), 'r') as f:
+            product_data = json.load(f)
+        return cls(reference_data, product_data)
+
+
+class ZavaDataset:
+    """
+    A reproducible Zava dataset, produced as (table, structured array) batches.
+
+    Inventory comes first as a single batch, then customers, orders and
+    order_items for every batch_customers customers.
+    """
+
+    def __init__(self, catalog: Catalog, num_customers: int = DEFAULT_NUM_CUSTOMERS, seed: int = DEFAULT_SEED,
+                 batch_customers: int = DEFAULT_BATCH_CUSTOMERS):
+        self.catalog = catalog
+        self.num_customers = num_customers
+        self.seed = seed
+        self.batch_customers = batch_customers
+
+    def config(self) -> Dict:
+        """Everything that determines the generated rows"""
+        return {
+            'num_customers': self.num_customers,
+            'seed': self.seed,
+            'batch_customers': self.batch_customers,
+            'stores': len(self.catalog.store_names),
+            'products': len(self.catalog.product_skus),
+        }
+
+    def batches(self) -> Iterator[Tuple[str, np.ndarray]]:
+        yield 'inventory', self.generate_inventory()
+
+        first_order_id = 1
+        for batch_index, first_customer in enumerate(range(1, self.num_customers + 1, self.batch_customers)):
+            count = min(self.batch_customers, self.num_customers - first_customer + 1)
+            rng = np.random.default_rng([self.seed, batch_index + 1])
+            customers = self.generate_customers(rng, first_customer, count, batch_index)
+            orders, order_items = self.generate_orders(rng, customers, first_order_id)
+            first_order_id += len(orders)
+            yield 'customers', customers
+            yield 'orders', orders
+            yield 'order_items', order_items
+
+    def generate_inventory(self) -> np.ndarray:
+        """One row per store and product, scaled by store weight and average seasonality"""
+        catalog = self.catalog
+        rng = np.random.default_rng([self.seed, 0])
+        n_stores = len(catalog.store_names)
+        n_products = len(catalog.product_skus)
+
+        inventory = np.empty(n_stores * n_products, dtype=TABLE_DTYPES['inventory'])
+        inventory['store_id'] = np.repeat(np.arange(1, n_stores + 1), n_products)
+        inventory['product_id'] = np.tile(np.arange(1, n_products + 1), n_stores)
+
+        base_stock = rng.integers(INVENTORY_BASE_STOCK[0], INVENTORY_BASE_STOCK[1] + 1, size=len(inventory))
+        store_weight = np.repeat(catalog.store_weights, n_products)
+        seasonal = np.tile(catalog.seasonal_avg[catalog.product_category], n_stores)
+        stock = base_stock * store_weight * seasonal * rng.uniform(*INVENTORY_STOCK_VARIATION, size=len(inventory))
+        inventory['stock_level'] = np.maximum(1, stock.astype('i4'))
+        return inventory
+
+    def generate_customers(self, rng: np.random.Generator, first_customer: int, count: int,
+                           batch_index: int) -> np.ndarray:
+        catalog = self.catalog
+        fake = Faker()
+        fake.seed_instance(f"{self.seed}-{batch_index}")
+
+        customers = np.empty(count, dtype=TABLE_DTYPES['customers'])
+        customers['customer_id'] = np.arange(first_customer, first_customer + count)
+        first_names = [fake.first_name() for _ in range(count)]
+        last_names = [fake.last_name() for _ in range(count)]
+        customers['first_name'] = first_names
+        customers['last_name'] = last_names
+        customers['email'] = [f"{first.lower()}.{last.lower()}.{customer_id}@example.com"
+                              for first, last, customer_id in zip(first_names, last_names, customers['customer_id'])]
+        area = rng.integers(200, 1000, size=count)
+        exchange = rng.integers(200, 1000, size=count)
+        line = rng.integers(1000, 10000, size=count)
+        customers['phone'] = [f"({a}) {b}-{c}" for a, b, c in zip(area, exchange, line)]
+
+        customers['primary_store_id'] = rng.choice(len(catalog.store_p), size=count, p=catalog.store_p) + 1
+        return customers
+
+    def generate_orders(self, rng: np.random.Generator, customers: np.ndarray,
+                        first_order_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Orders and their line items"""
+        catalog = self.catalog
+
+        # Like the generators, a customer's orders go to a store drawn independently of their
+        # primary store, and that store's order frequency scales the number of orders
+        store_index = rng.choice(len(catalog.store_p), size=len(customers), p=catalog.store_p)
+        base_orders = rng.choice(ORDERS_PER_CUSTOMER[0], size=len(customers), p=ORDERS_PER_CUSTOMER[1])
+        orders_per_customer = np.maximum(1, (base_orders * catalog.store_order_frequency[store_index]).astype('i4'))
+        n_orders = int(orders_per_customer.sum())
+
+        orders = np.zeros(n_orders, dtype=TABLE_DTYPES['orders'])
+        orders['order_id'] = np.arange(first_order_id, first_order_id + n_orders)
+        orders['customer_id'] = np.repeat(customers['customer_id'], orders_per_customer)
+        orders['store_id'] = np.repeat(store_index + 1, orders_per_customer)
+
+        # Order dates: weighted year, uniform month, uniform day within the month
+        years = np.array(ORDER_YEARS)[rng.choice(len(ORDER_YEARS), size=n_orders, p=catalog.year_p)]
+        months = rng.integers(1, 13, size=n_orders)
+        month_start = ((years - 1970) * 12 + months - 1).astype('M8[M]')
+        days_in_month = ((month_start + 1).astype('M8[D]') - month_start.astype('M8[D]')).astype('i4')
+        orders['order_date'] = month_start.astype('M8[D]') + (rng.random(n_orders) * days_in_month).astype('i4')
+
+        # One category per order: seasonal for the month most of the time, otherwise uniform
+        n_categories = len(catalog.category_names)
+        order_category = rng.integers(0, n_categories, size=n_orders)
+        if catalog.has_seasonal:
+            seasonal_orders = rng.random(n_orders) < SEASONAL_CATEGORY_RATE
+            for month in range(1, 13):
+                mask = seasonal_orders & (months == month)
+                weights = catalog.seasonal[:, month - 1]
+                order_category[mask] = rng.choice(n_categories, size=int(mask.sum()), p=weights / weights.sum())
+
+        # Line items
+        items_per_order = rng.choice(ITEMS_PER_ORDER[0], size=n_orders, p=ITEMS_PER_ORDER[1])
+        n_items = int(items_per_order.sum())
+        item_order = np.repeat(np.arange(n_orders), items_per_order)
+
+        items = np.zeros(n_items, dtype=TABLE_DTYPES['order_items'])
+        items['order_id'] = orders['order_id'][item_order]
+        items['order_date'] = orders['order_date'][item_order]
+        items['store_id'] = orders['store_id'][item_order]
+
+        # Products from the order's category most of the time, otherwise from the whole catalog
+        product_index = rng.integers(0, len(catalog.product_skus), size=n_items)
+        if catalog.has_seasonal:
+            item_category = order_category[item_order]
+            from_category = rng.random(n_items) < SEASONAL_PRODUCT_RATE
+            for category, category_products in enumerate(catalog.category_products):
+                mask = from_category & (item_category == category)
+                if len(category_products) and mask.any():
+                    product_index[mask] = category_products[rng.integers(0, len(category_products), size=int(mask.sum()))]
+        items['product_id'] = product_index + 1
+
+        # Pricing, rounded to cents so order totals match the stored items exactly
+        quantity = rng.choice(ITEM_QUANTITY[0], size=n_items, p=ITEM_QUANTITY[1])
+        unit_price = np.round(catalog.product_prices[product_index] * rng.uniform(*PRICE_VARIATION, size=n_items), 2)
+        discounted = rng.random(n_items) < DISCOUNT_RATE
+        discount_percent = np.where(discounted, rng.choice(DISCOUNT_PERCENTS, size=n_items), 0)
+        discount_amount = np.round(unit_price * quantity * discount_percent / 100, 2)
+        items['quantity'] = quantity
+        items['unit_price'] = unit_price
+        items['discount_percent'] = discount_percent
+        items['discount_amount'] = discount_amount
+        items['total_amount'] = np.round(unit_price * quantity - discount_amount, 2)
+
+        orders['item_count'] = items_per_order
+        orders['subtotal'] = np.round(np.bincount(item_order, weights=unit_price * quantity, minlength=n_orders), 2)
+        orders['discount_total'] = np.round(np.bincount(item_order, weights=discount_amount, minlength=n_orders), 2)
+        orders['total_amount'] = np.round(np.bincount(item_order, weights=items['total_amount'], minlength=n_orders), 2)
+        return orders, items
+
+
+def to_arrow(array: np.ndarray):
+    """Convert a structured array batch into an Arrow record batch"""
+    if pa is None:
+        raise RuntimeError("pyarrow is required for Arrow output (pip install pyarrow)")
+    return pa.RecordBatch.from_arrays([pa.array(array[name]) for name in array.dtype.names],
+                                      names=list(array.dtype.names))
+
+
+class DatasetSink(ABC):
+    """Receives every batch of a dataset; subclasses load it into one backend"""
+
+    name = 'sink'
+
+    def open(self, dataset: ZavaDataset):
+        pass
+
+    @abstractmethod
+    def write(self, table: str, batch: np.ndarray):
+        """Load one batch of a table"""
+
+    def close(self):
+        pass
+
+
+class ParquetSink(DatasetSink):
+    """One Parquet file per table under output_dir"""
+
+    name = 'parquet'
+
+    def __init__(self, output_dir: str):
+        if pq is None:
+            raise RuntimeError("pyarrow is required for the parquet sink (pip install pyarrow)")
+        self.output_dir = output_dir
+        self.writers = {}
+
+    def open(self, dataset: ZavaDataset):
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, 'dataset.json'), 'w') as f:
+            json.dump(dataset.config(), f, indent=2)
+
+    def write(self, table: str, batch: np.ndarray):
+        record_batch = to_arrow(batch)
+        if table not in self.writers:
+            path = os.path.join(self.output_dir, f"{table}.parquet")
+            self.writers[table] = pq.ParquetWriter(path, record_batch.schema, compression='zstd')
+        self.writers[table].write_batch(record_batch)
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+
+
+class RelationalSink(DatasetSink):
+    """
+    Shared behaviour of the SQL sinks: catalog ID remapping and column selection.
+
+    columns maps each loaded table to the target columns (a subset of the
+    dataset columns, in the target's order).
+    """
+
+    columns: Dict[str, List[str]] = {}
+
+    def remap_ids(self, dataset: ZavaDataset, store_ids: Dict[str, int], product_ids: Dict[str, int]):
+        """Build dataset ID -> database ID arrays from the target's store names and SKUs"""
+        catalog = dataset.catalog
+        missing_stores = [name for name in catalog.store_names if name not in store_ids]
+        missing_products = [sku for sku in catalog.product_skus if sku not in product_ids]
+        if missing_stores or missing_products:
+            raise RuntimeError(f"{self.name}: catalog is missing {len(missing_stores)} stores and "
+                               f"{len(missing_products)} products; run the generator first")
+        self.store_map = np.array([0] + [store_ids[name] for name in catalog.store_names], dtype='i4')
+        self.product_map = np.array([0] + [product_ids[sku] for sku in catalog.product_skus], dtype='i4')
+
+    def rows(self, table: str, batch: np.ndarray) -> List[Tuple]:
+        columns = self.columns[table]
+        mapped = []
+        for column in columns:
+            values = batch[column]
+            if column in STORE_ID_COLUMNS:
+                values = self.store_map[values]
+            elif column in PRODUCT_ID_COLUMNS:
+                values = self.product_map[values]
+            mapped.append(values.tolist())
+        return list(zip(*mapped))
+
+
+class PostgresSink(RelationalSink):
+    """asyncpg binary COPY into the retail schema of generate_zava_postgres.py"""
+
+    name = 'postgres'
+    columns = {
+        'customers': ['customer_id', 'first_name', 'last_name', 'email', 'phone', 'primary_store_id'],
+        'inventory': ['store_id', 'product_id', 'stock_level'],
+        'orders': ['order_id', 'customer_id', 'store_id', 'order_date',
+                   'item_count', 'subtotal', 'discount_total', 'total_amount'],
+        'order_items': ['order_id', 'order_date', 'store_id', 'product_id', 'quantity', 'unit_price',
+                        'discount_percent', 'discount_amount', 'total_amount'],
+    }
+
+    def __init__(self, config: Dict, schema_name: str = 'retail'):
+        self.config = config
+        self.schema_name = schema_name
+        self.loop = asyncio.new_event_loop()
+        self.conn = None
+
+    def open(self, dataset: ZavaDataset):
+        import asyncpg
+
+        self.conn = self.loop.run_until_complete(asyncpg.connect(**self.config))
+        stores = self.loop.run_until_complete(self.conn.fetch(f"SELECT store_name, store_id FROM {self.schema_name}.stores"))
+        products = self.loop.run_until_complete(self.conn.fetch(f"SELECT sku, product_id FROM {self.schema_name}.products"))
+        self.remap_ids(dataset, {r['store_name']: r['store_id'] for r in stores},
+                       {r['sku']: r['product_id'] for r in products})
+        tables = ', '.join(f"{self.schema_name}.{table}" for table in self.columns)
+        self.loop.run_until_complete(self.conn.execute(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+    def write(self, table: str, batch: np.ndarray):
+        self.loop.run_until_complete(self.conn.copy_records_to_table(
+            table, records=self.rows(table, batch), columns=self.columns[table], schema_name=self.schema_name))
+
+    def close(self):
+        if self.conn is not None:
+            # Explicit IDs were loaded; move the sequences past them
+            for table, column in (('customers', 'customer_id'), ('orders', 'order_id')):
+                self.loop.run_until_complete(self.conn.execute(f"""
+                    SELECT setval(pg_get_serial_sequence('{self.schema_name}.{table}', '{column}'),
+                                  COALESCE(MAX({column}), 0) + 1, false)
+                    FROM {self.schema_name}.{table}
+                """))
+            self.loop.run_until_complete(self.conn.close())
+            self.conn = None
+        self.loop.close()
+
+
+class SqlServerSink(RelationalSink):
+    """pyodbc fast_executemany into the retail schema of generate_zava_sql_server.py"""
+
+    name = 'sqlserver'
+    columns = {
+        'customers': ['customer_id', 'first_name', 'last_name', 'email', 'phone', 'primary_store_id'],
+        'inventory': ['store_id', 'product_id', 'stock_level'],
+        'orders': ['order_id', 'customer_id', 'store_id', 'order_date'],
+        'order_items': ['order_id', 'store_id', 'product_id', 'quantity', 'unit_price',
+                        'discount_percent', 'discount_amount', 'total_amount'],
+    }
+    identity_tables = ('customers', 'orders')
+
+    def __init__(self, conn, schema_name: str = 'retail'):
+        self.conn = conn
+        self.schema_name = schema_name
+
+    def open(self, dataset: ZavaDataset):
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT store_name, store_id FROM {self.schema_name}.stores")
+        stores = {row[0]: row[1] for row in cursor.fetchall()}
+        cursor.execute(f"SELECT sku, product_id FROM {self.schema_name}.products")
+        products = {row[0]: row[1] for row in cursor.fetchall()}
+        self.remap_ids(dataset, stores, products)
+        # Foreign keys rule out TRUNCATE; delete children first
+        for table in reversed(list(self.columns)):
+            cursor.execute(f"DELETE FROM {self.schema_name}.{table}")
+        self.conn.commit()
+
+    def write(self, table: str, batch: np.ndarray):
+        columns = self.columns[table]
+        target = f"{self.schema_name}.{table}"
+        cursor = self.conn.cursor()
+        cursor.fast_executemany = True
+        if table in self.identity_tables:
+            cursor.execute(f"SET IDENTITY_INSERT {target} ON")
+        try:
+            placeholders = ', '.join('?' for _ in columns)
+            cursor.executemany(f"INSERT INTO {target} ({', '.join(columns)}) VALUES ({placeholders})",
+                               self.rows(table, batch))
+        finally:
+            if table in self.identity_tables:
+                cursor.execute(f"SET IDENTITY_INSERT {target} OFF")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class MongoSink(DatasetSink):
+    """pymongo insert_many with the document shapes of scripts/generate_mongodb_data.py"""
+
+    name = 'mongodb'
+
+    def __init__(self, connection_string: str, database_name: str):
+        self.connection_string = connection_string
+        self.database_name = database_name
+        self.client = None
+        self.db = None
+
+    def open(self, dataset: ZavaDataset):
+        from pymongo import MongoClient
+
+        catalog = dataset.catalog
+        self.client = MongoClient(self.connection_string)
+        self.db = self.client[self.database_name]
+        # Index 0 is unused so dataset IDs index the arrays directly
+        self.store_ids = [None] + ['store_' + name.replace('Zava Retail ', '').lower().replace(' ', '_')
+                                   for name in catalog.store_names]
+        self.store_names = [None] + catalog.store_names
+        self.product_ids = [None] + [f"prod_{sku.lower()}" for sku in catalog.product_skus]
+        self.product_skus = [None] + catalog.product_skus
+        self.product_names = [None] + catalog.product_names
+        for table in DATASET_TABLES:
+            self.db[table].delete_many({})
+
+    def documents(self, table: str, batch: np.ndarray) -> List[Dict]:
+        rows = batch.tolist()
+        names = batch.dtype.names
+        docs = []
+        if table == 'customers':
+            for row in rows:
+                r = dict(zip(names, row))
+                customer_id = f"cust_{r['customer_id']:06d}"
+                docs.append({
+                    '_id': customer_id, 'customer_id': customer_id,
+                    'first_name': r['first_name'], 'last_name': r['last_name'],
+                    'email': r['email'], 'phone': r['phone'],
+                    'primary_store_id': self.store_ids[r['primary_store_id']], 'deleted': False,
+                })
+        elif table == 'inventory':
+            for row in rows:
+                r = dict(zip(names, row))
+                store_id, product_id = self.store_ids[r['store_id']], self.product_ids[r['product_id']]
+                docs.append({
+                    '_id': f"{store_id}_{product_id}", 'store_id': store_id, 'product_id': product_id,
+                    'stock_level': r['stock_level'], 'deleted': False,
+                })
+        elif table == 'orders':
+            for row in rows:
+                r = dict(zip(names, row))
+                order_id = f"order_{r['order_id']:08d}"
+                docs.append({
+                    '_id': order_id, 'order_id': order_id,
+                    'customer_id': f"cust_{r['customer_id']:06d}",
+                    'store_id': self.store_ids[r['store_id']], 'store_name': self.store_names[r['store_id']],
+                    'order_date': datetime.combine(r['order_date'], datetime.min.time()).isoformat(),
+                    'item_count': r['item_count'], 'subtotal': r['subtotal'],
+                    'discount_total': r['discount_total'], 'total': r['total_amount'],
+                    'status': 'completed', 'deleted': False,
+                })
+        else:
+            line = 0
+            previous_order = None
+            for row in rows:
+                r = dict(zip(names, row))
+                line = line + 1 if r['order_id'] == previous_order else 1
+                previous_order = r['order_id']
+                order_id = f"order_{r['order_id']:08d}"
+                docs.append({
+                    '_id': f"{order_id}_{line}", 'order_id': order_id,
+                    'product_id': self.product_ids[r['product_id']],
+                    'store_id': self.store_ids[r['store_id']],
+                    'order_date': datetime.combine(r['order_date'], datetime.min.time()).isoformat(),
+                    'sku': self.product_skus[r['product_id']], 'product_name': self.product_names[r['product_id']],
+                    'quantity': r['quantity'], 'unit_price': r['unit_price'],
+                    'discount_percent': r['discount_percent'], 'line_total': r['total_amount'],
+                    'deleted': False,
+                })
+        return docs
+
+    def write(self, table: str, batch: np.ndarray):
+        docs = self.documents(table, batch)
+        if docs:
+            self.db[table].insert_many(docs, ordered=False)
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+
+class DatasetCache:
+    """
+    Content-addressed cache of generated batches.
+
+    Each entry is a directory named after the dataset key, holding one
+    compressed .npz file per batch (one array per column) and a manifest
+    listing the batches in generation order. Entries are written to a temporary
+    directory and renamed into place once complete, so a partial run never
+    leaves a usable-looking entry behind. The manifest's mtime is the entry's
+    last use.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def key(self, dataset: ZavaDataset, data_dir: str = DATA_DIR) -> str:
+        digest = hashlib.sha256()
+        for path in (os.path.join(data_dir, 'reference_data.json'), os.path.join(data_dir, 'product_data.json'),
+                     RULES_FILE):
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+        parameters = dict(dataset.config(), format_version=CACHE_FORMAT_VERSION)
+        digest.update(json.dumps(parameters, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()[:32]
+
+    def entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self.entry_dir(key), 'manifest.json'))
+
+    def read(self, key: str) -> Iterator[Tuple[str, np.ndarray]]:
+        """Stream the cached batches of an entry in generation order"""
+        entry = self.entry_dir(key)
+        manifest_path = os.path.join(entry, 'manifest.json')
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        os.utime(manifest_path)
+
+        for item in manifest['batches']:
+            dtype = TABLE_DTYPES[item['table']]
+            with np.load(os.path.join(entry, item['file']), allow_pickle=False) as columns:
+                batch = np.empty(item['rows'], dtype=dtype)
+                for name in dtype.names:
+                    values = columns[name]
+                    # Text columns are stored as fixed-width unicode; back to Python strings
+                    batch[name] = values.tolist() if dtype[name] == object else values
+            yield item['table'], batch
+
+    def write_through(self, key: str, dataset: ZavaDataset,
+                      batches: Iterator[Tuple[str, np.ndarray]]) -> Iterator[Tuple[str, np.ndarray]]:
+        """Yield batches unchanged while writing them into a new cache entry"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        staging = os.path.join(self.cache_dir, f".{key}.{os.getpid()}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        manifest = {'key': key, 'config': dataset.config(), 'created_at': datetime.now().isoformat(), 'batches': []}
+        completed = False
+        try:
+            for index, (table, batch) in enumerate(batches):
+                file_name = f"{index:05d}_{table}.npz"
+                columns = {}
+                for name in batch.dtype.names:
+                    values = batch[name]
+                    columns[name] = values.astype(str) if values.dtype == object else values
+                np.savez_compressed(os.path.join(staging, file_name), **columns)
+                manifest['batches'].append({'table': table, 'file': file_name, 'rows': len(batch)})
+                yield table, batch
+            with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+                json.dump(manifest, f, indent=2)
+            completed = True
+        finally:
+            if completed and not self.contains(key):
+                os.replace(staging, self.entry_dir(key))
+            else:
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def batches(self, dataset: ZavaDataset) -> Iterator[Tuple[str, np.ndarray]]:
+        """Cached batches for the dataset, or freshly generated ones that fill the cache"""
+        key = self.key(dataset)
+        if self.contains(key):
+            logging.info(f"Dataset cache hit ({key}), streaming cached batches")
+            return self.read(key)
+        logging.info(f"Dataset cache miss ({key}), synthesizing")
+        return self.write_through(key, dataset, dataset.batches())
+
+    def entries(self) -> List[Dict]:
+        """Complete entries with their size and last use, least recently used first"""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for name in os.listdir(self.cache_dir):
+            manifest_path = os.path.join(self.cache_dir, name, 'manifest.json')
+            if name.startswith('.') or not os.path.exists(manifest_path):
+                continue
+            entry = self.entry_dir(name)
+            size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+            entries.append({'key': name, 'bytes': size, 'last_used': os.path.getmtime(manifest_path)})
+        entries.sort(key=lambda e: e['last_used'])
+        return entries
+
+    def evict(self, max_bytes: Optional[int] = None, max_age_days: Optional[float] = None) -> List[str]:
+        """Remove entries older than max_age_days, then the least recently used until under max_bytes"""
+        entries = self.entries()
+        evicted = []
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            for entry in [e for e in entries if e['last_used'] < cutoff]:
+                evicted.append(entry['key'])
+                entries.remove(entry)
+        if max_bytes is not None:
+            total = sum(e['bytes'] for e in entries)
+            while entries and total > max_bytes:
+                entry = entries.pop(0)
+                evicted.append(entry['key'])
+                total -= entry['bytes']
+        for key in evicted:
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+        return evicted
+
+
+def load_dataset(dataset: ZavaDataset, sinks: List[DatasetSink],
+                 batches: Optional[Iterator[Tuple[str, np.ndarray]]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Synthesize the dataset once and write every batch to all sinks.
+
+    Returns per-sink timings: sink name -> {'rows', 'seconds'}; 'generate' holds
+    the synthesis time itself.
+    """
+    timings = {sink.name: {'rows': 0, 'seconds': 0.0} for sink in sinks}
+    timings['generate'] = {'rows': 0, 'seconds': 0.0}
+    batch_iter = iter(batches if batches is not None else dataset.batches())
+
+    for sink in sinks:
+        sink.open(dataset)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                table, batch = next(batch_iter)
+            except StopIteration:
+                break
+            timings['generate']['seconds'] += time.perf_counter() - start
+            timings['generate']['rows'] += len(batch)
+
+            for sink in sinks:
+                start = time.perf_counter()
+                sink.write(table, batch)
+                timings[sink.name]['seconds'] += time.perf_counter() - start
+                timings[sink.name]['rows'] += len(batch)
+    finally:
+        for sink in sinks:
+            sink.close()
+    return timings
+
+
+def log_dataset_timings(timings: Dict[str, Dict[str, float]]):
+    logging.info("\n⏱️  DATASET TIMINGS:")
+    logging.info("   Step            Rows       Seconds      Rows/sec")
+    logging.info("   " + "-" * 50)
+    for name, timing in timings.items():
+        rate = timing['rows'] / timing['seconds'] if timing['seconds'] > 0 else 0
+        logging.info(f"   {name:<12} {timing['rows']:>10,} {timing['seconds']:>10.2f} {rate:>13,.0f}")
+
+
+SINKS = ('postgres', 'sqlserver', 'mongodb', 'parquet')
+
+def build_sink(name: str, args) -> DatasetSink:
+    """Create a sink, taking connection settings from the matching generator"""
+    if name == 'postgres':
+        from generate_zava_postgres import POSTGRES_CONFIG, SCHEMA_NAME
+        return PostgresSink(POSTGRES_CONFIG, SCHEMA_NAME)
+    if name == 'sqlserver':
+        from generate_zava_sql_server import SCHEMA_NAME, create_connection
+        return SqlServerSink(create_connection(), SCHEMA_NAME)
+    if name == 'mongodb':
+        connection_string = os.getenv('MONGODB_CONNECTION_STRING')
+        if not connection_string:
+            raise RuntimeError("MONGODB_CONNECTION_STRING is not set")
+        return MongoSink(connection_string, os.getenv('MONGODB_DATABASE', 'retail-demo'))
+    return ParquetSink(args.output_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthesize the Zava dataset once and load it into one or more backends')
+    parser.add_argument('--sink', action='append', choices=SINKS,
+                        help='Backend to load (repeat for several)')
+    parser.add_argument('--num-customers', type=int, default=DEFAULT_NUM_CUSTOMERS,
+                        help=f'Number of customers to generate (default: {DEFAULT_NUM_CUSTOMERS})')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f'Random seed (default: {DEFAULT_SEED})')
+    parser.add_argument('--batch-customers', type=int, default=DEFAULT_BATCH_CUSTOMERS,
+                        help=f'Customers per batch (default: {DEFAULT_BATCH_CUSTOMERS})')
+    parser.add_argument('--output-dir', default=os.path.join(DATA_DIR, 'dataset'),
+                        help='Directory for the parquet sink (default: ./dataset)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Dataset cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always synthesize; neither read nor fill the cache')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_CACHE_MAX_MB,
+                        help=f'Evict least recently used entries above this size (default: {DEFAULT_CACHE_MAX_MB})')
+    parser.add_argument('--cache-max-age-days', type=float, default=DEFAULT_CACHE_MAX_AGE_DAYS,
+                        help=f'Evict entries unused for this many days (default: {DEFAULT_CACHE_MAX_AGE_DAYS})')
+    parser.add_argument('--evict-cache', action='store_true',
+                        help='Only apply the cache limits and list the remaining entries')
+    args = parser.parse_args()
+    
+    if not args.sink and not args.evict_cache:
+        parser.error("at least one --sink is required")
+
+    try:
+        cache = DatasetCache(args.cache_dir)
+        if args.evict_cache:
+            evicted = cache.evict(args.cache_max_mb * 1024 * 1024, args.cache_max_age_days)
+            logging.info(f"Evicted {len(evicted)} cache entries")
+            for entry in cache.entries():
+                logging.info(f"  {entry['key']}: {entry['bytes'] / (1024 * 1024):,.1f} MB, "
+                             f"last used {datetime.fromtimestamp(entry['last_used']).isoformat(timespec='seconds')}")
+            return
+
+        dataset = ZavaDataset(Catalog.from_files(), args.num_customers, args.seed, args.batch_customers)
+        sinks = [build_sink(name, args) for name in dict.fromkeys(args.sink)]
+        logging.info(f"Loading {args.num_customers:,} customers (seed {args.seed}) into: "
+                     f"{', '.join(sink.name for sink in sinks)}")
+        batches = None if args.no_cache else cache.batches(dataset)
+        log_dataset_timings(load_dataset(dataset, sinks, batches))
+        if not args.no_cache:
+            cache.evict(args.cache_max_mb * 1024 * 1024, args.cache_max_age_days)
+    except Exception as e:
+        logging.error(f"Failed to load dataset: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
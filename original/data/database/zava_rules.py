@@ -0,0 +1,55 @@
+"""
+Zava DIY Dataset Generation Rules
+
+Distributions and pricing rules shared by generate_zava_postgres.py,
+generate_zava_sql_server.py and zava_dataset.py, so every backend draws
+orders, line items, discounts and prices from the same definitions.
+
+Distributions are (values, probabilities) pairs, usable with both
+random.choices(values, weights=probabilities) and
+numpy.random.Generator.choice(values, p=probabilities).
+"""
+
+from typing import Dict
+
+# Stores: every customer gets a primary store and, drawn independently, the store their orders are
+# placed at, both weighted by the store's customer_distribution_weight; the order store's
+# order_frequency_multiplier scales the customer's order count
+
+# Years orders are generated for (also the PostgreSQL order table partition range)
+ORDER_YEARS = [2020, 2021, 2022, 2023, 2024, 2025, 2026]
+
+# Orders per customer before the store's order_frequency_multiplier is applied (at least one order)
+ORDERS_PER_CUSTOMER = ([0, 1, 2, 3, 4, 5], [0.20, 0.40, 0.20, 0.10, 0.07, 0.03])
+ITEMS_PER_ORDER = ([1, 2, 3, 4, 5], [0.40, 0.30, 0.15, 0.10, 0.05])
+ITEM_QUANTITY = ([1, 2, 3, 4, 5], [0.60, 0.25, 0.10, 0.03, 0.02])
+
+# Share of line items with a discount, and the discount percentages drawn for them
+DISCOUNT_RATE = 0.15
+DISCOUNT_PERCENTS = [5, 10, 15, 20, 25]
+
+# Share of orders whose category follows the month's Washington State seasonal multipliers,
+# and share of their line items drawn from that category
+SEASONAL_CATEGORY_RATE = 0.85
+SEASONAL_PRODUCT_RATE = 0.9
+
+# Inventory per store and product: a base stock level from this range, scaled by the store's
+# customer_distribution_weight, the category's average seasonal multiplier and a random factor
+INVENTORY_BASE_STOCK = (10, 100)
+INVENTORY_STOCK_VARIATION = (0.5, 1.5)
+
+# Unit prices vary around the product's base price by this factor range
+PRICE_VARIATION = (0.8, 1.2)
+
+# Selling price for a 33% gross margin: (price - cost) / price = 0.33, so price = cost / 0.67
+COST_TO_PRICE_RATIO = 0.67
+
+
+def product_sku(product: Dict, product_number: int) -> str:
+    """SKU of a product_data.json entry, or a generated one for the product_number-th product (1-based)"""
+    return product.get('sku', f"SKU{product_number:06d}")
+
+
+def selling_price(cost: float) -> float:
+    """Base selling price for a product cost (the JSON price), rounded to cents"""
+    return round(cost / COST_TO_PRICE_RATIO, 2)
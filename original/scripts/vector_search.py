@@ -36,7 +36,7 @@ conn.autocommit = True
 cur = conn.cursor()
 cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
 register_vector(conn)
-cur.execute("CREATE INDEX IF NOT EXISTS idx_product_embeddings_hnsw ON retail.product_description_embeddings USING hnsw (description_embedding vector_cosine_ops)")
+# The vector index is built (and sized from the row count) by data/database/generate_zava_postgres.py
 cur.execute("SET hnsw.iterative_scan = strict_order")
 
 search_query = "25 foot garden hose"
@@ -5,15 +5,21 @@ Provides comprehensive customer sales database access with individual table sche
 
 import argparse
 import asyncio
+import sys
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Annotated, Optional
 
+# Add the shared folder to path to import result_format
+sys.path.append(str(Path(__file__).parent.parent / "shared"))
+
 from customer_sales_postgres import PostgreSQLCustomerSales
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import Field
+from result_format import DEFAULT_RESULT_FORMAT, RESULT_FORMATS
 
 RLS_USER_ID = None
 
@@ -91,12 +97,15 @@ async def get_products_by_name(
     ctx: Context,
     product_name: Annotated[str, Field(description="Name of the product to search for.")],
     max_rows: Annotated[int, Field(
-        description="Maximum number of rows to return.")] = 20
+        description="Maximum number of rows to return.")] = 20,
+    result_format: Annotated[str, Field(
+        description=f"Result format, one of {', '.join(RESULT_FORMATS)}. 'columnar' lists column names once followed by row arrays.")] = DEFAULT_RESULT_FORMAT
 ) -> str:
     """Get products by name using a PostgreSQL query.
 
     Args:
         max_rows: Maximum number of rows to return.
+        result_format: Result format: columnar (default), json, csv or markdown.
 
     Returns:
         Query results as a string.
@@ -110,7 +119,8 @@ async def get_products_by_name(
     try:
 
         provider = get_db_provider()
-        result = await provider.get_products_by_name(product_name, max_rows, rls_user_id=rls_user_id)
+        result = await provider.get_products_by_name(
+            product_name, max_rows, rls_user_id=rls_user_id, result_format=result_format)
         return f"Query Results:\n{result}"
 
     except Exception as e:
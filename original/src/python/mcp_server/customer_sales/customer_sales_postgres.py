@@ -18,10 +18,16 @@ import asyncio
 import json
 import logging
 import os
+import sys
+from pathlib import Path
 from typing import Optional
 
+# Add the shared folder to path to import result_format
+sys.path.append(str(Path(__file__).parent.parent / "shared"))
+
 import asyncpg
 from dotenv import load_dotenv
+from result_format import ResultEncoder
 
 # Load environment variables (don't override existing ones)
 load_dotenv(override=False)
@@ -100,8 +106,10 @@ class PostgreSQLCustomerSales:
         if self.connection_pool:
             await self.connection_pool.release(conn)
 
-    async def get_products_by_name(self, product_name: str, max_rows: int, rls_user_id: str) -> str:
-        """Get products by name using a PostgreSQL query."""
+    async def get_products_by_name(
+        self, product_name: str, max_rows: int, rls_user_id: str, result_format: Optional[str] = None
+    ) -> str:
+        """Get products by name using a PostgreSQL query, in one of the formats in result_format.py."""
         conn = None
         try:
             max_rows = min(max_rows, 100)  # Limit to 100 for performance
@@ -123,29 +131,16 @@ class PostgreSQLCustomerSales:
                 LIMIT $2;
             """
 
-            rows = await conn.fetch(
-                query,
-                f"%{product_name}%", max_rows
-            )
+            statement = await conn.prepare(query)
+            encoder = ResultEncoder([attribute.name for attribute in statement.get_attributes()], result_format)
+            rows = await statement.fetch(f"%{product_name}%", max_rows)
 
+            meta = {"row_count": len(rows)}
             if not rows:
-                return json.dumps(
-                    {
-                        "results": [],
-                        "row_count": 0,
-                        "columns": [],
-                        "message": "The query returned no results. Try a different question.",
-                    }
-                )
-
-            # Convert asyncpg Records to list of dictionaries
-            results = [dict(row) for row in rows]
-            columns = list(rows[0].keys()) if rows else []
+                meta["message"] = "The query returned no results. Try a different question."
 
             # Return LLM-friendly format
-            return json.dumps(
-                {"results": results, "row_count": len(results), "columns": columns}, indent=2, default=str
-            )
+            return encoder.render([encoder.encode_row(row.values()) for row in rows], meta)
 
         except Exception as e:
             return json.dumps(
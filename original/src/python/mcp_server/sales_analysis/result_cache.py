@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+In-process cache of execute_sales_query responses.
+
+Entries are keyed by the normalized SQL text (case, whitespace and comments
+ignored) plus the RLS user and output options, so trivially
+different spellings of a query share an entry while managers never see each
+other's rows. The cache is bounded in bytes with least-recently-used eviction,
+entries expire after a TTL, and entries are dropped when a table they read is
+written: the database generator's write counter triggers NOTIFY the table
+name, and PostgreSQLSchemaProvider passes it to table_changed().
+"""
+
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Hashable, NamedTuple, Optional, Tuple
+
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "300"))
+
+# Functions whose result changes between calls even when the data does not. The current
+# date and time functions are stable within a statement but differ from call to call, so a
+# cached "orders this month" would go stale at the next month boundary.
+VOLATILE_FUNCTIONS = frozenset(
+    {
+        "random",
+        "setseed",
+        "now",
+        "current_date",
+        "current_time",
+        "current_timestamp",
+        "localtime",
+        "localtimestamp",
+        "age",
+        "statement_timestamp",
+        "transaction_timestamp",
+        "clock_timestamp",
+        "timeofday",
+        "nextval",
+        "setval",
+        "gen_random_uuid",
+        "txid_current",
+        "pg_sleep",
+    }
+)
+
+# Date/time input strings PostgreSQL resolves to the current time when the query runs
+# ('now'::timestamp, order_date >= 'today'), which make a query as volatile as now()
+RELATIVE_TIME_LITERALS = frozenset({"now", "today", "tomorrow", "yesterday"})
+
+_SQL_TOKEN = re.compile(
+    r"""
+      (?P<string>[Ee]'(?:[^'\\]|''|\\.)*'|'(?:[^']|'')*')
+    | (?P<dollar>\$(?P<tag>[A-Za-z_]\w*|)\$.*?\$(?P=tag)\$)
+    | (?P<ident>"(?:[^"]|"")*")
+    | (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<word>[A-Za-z_][\w$]*)
+    | (?P<number>(?:\d+\.\d*|\.\d+|\d+)(?:[Ee][-+]?\d+)?)
+    | (?P<space>\s+)
+    | (?P<op>.)
+    """,
+    re.S | re.X,
+)
+
+
+class NormalizedQuery(NamedTuple):
+    """Normalized SQL text, plus the lower-cased words (keywords, identifiers, functions) and string literals in it."""
+
+    text: str
+    words: FrozenSet[str]
+    literals: FrozenSet[str]
+
+    @property
+    def volatile(self) -> bool:
+        """Whether the result can change without a write: a volatile function or a relative time literal."""
+        return bool(self.words & VOLATILE_FUNCTIONS or self.literals & RELATIVE_TIME_LITERALS)
+
+
+def normalize_sql(sql: str) -> NormalizedQuery:
+    """Normalize a query for use as a cache key.
+
+    Unquoted words are lower-cased (PostgreSQL folds them anyway), comments are removed
+    and tokens are separated by single spaces. Numbers, string literals, dollar-quoted
+    strings and quoted identifiers are kept verbatim (1.50::text and 1.5::text differ).
+    """
+    tokens = []
+    words = set()
+    literals = set()
+    for match in _SQL_TOKEN.finditer(sql):
+        kind = match.lastgroup
+        if kind in ("space", "comment"):
+            continue
+        token = match.group()
+        if kind == "word":
+            token = token.lower()
+            words.add(token)
+        elif kind == "string":
+            # Contents only, lower-cased and trimmed as PostgreSQL does for date/time input
+            literals.add(token[token.index("'") + 1 : -1].strip().lower())
+        tokens.append(token)
+
+    # A trailing statement terminator does not change the query
+    while tokens and tokens[-1] == ";":
+        tokens.pop()
+    return NormalizedQuery(" ".join(tokens), frozenset(words), frozenset(literals))
+
+
+@dataclass
+class CachedResult:
+    """A cached response and the tables whose writes invalidate it."""
+
+    response: str
+    size: int
+    expires_at: float
+    tables: FrozenSet[str]
+
+
+class ResultCache:
+    """LRU cache of query responses bounded by total response bytes, with a TTL and per-table invalidation."""
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES, ttl_seconds: float = RESULT_CACHE_TTL_SECONDS) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Hashable, CachedResult]" = OrderedDict()
+        # Latest write counter seen per table; used to reject results computed before a write
+        self.table_versions: Dict[str, int] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return a cached response and mark it recently used, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        if time.monotonic() >= entry.expires_at:
+            self._remove(key)
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry.response
+
+    def record_bypass(self) -> None:
+        """Count a query that was not eligible for caching."""
+        self.stats["bypassed"] += 1
+
+    def snapshot(self, tables: FrozenSet[str]) -> Tuple[Tuple[str, int], ...]:
+        """Current write versions of the given tables, taken before a query runs."""
+        return tuple((table, self.table_versions.get(table, 0)) for table in sorted(tables))
+
+    def put(self, key: Hashable, response: str, tables: FrozenSet[str], snapshot: Tuple[Tuple[str, int], ...]) -> None:
+        """Store a response unless one of its tables was written while the query ran, or it is too large."""
+        if snapshot != self.snapshot(tables):
+            return
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CachedResult(response, size, time.monotonic() + self.ttl_seconds, tables)
+        self.total_bytes += size
+        self.stats["stores"] += 1
+
+        while self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+
+    def table_changed(self, table: str, version: Optional[int] = None) -> int:
+        """Record a write to a table and drop the entries that read it. Returns the number dropped."""
+        self.table_versions[table] = version if version is not None else self.table_versions.get(table, 0) + 1
+        stale = [key for key, entry in self._entries.items() if table in entry.tables]
+        for key in stale:
+            self._remove(key)
+        self.stats["invalidations"] += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry (after DDL, or when change notifications may have been missed)."""
+        self.stats["invalidations"] += len(self._entries)
+        self._entries.clear()
+        self.total_bytes = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of cacheable lookups answered from the cache."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters and gauges describing the cache, for logging or a metrics endpoint."""
+        return {
+            **self.stats,
+            "hit_rate": round(self.hit_rate, 4),
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
@@ -5,15 +5,29 @@ Provides comprehensive customer sales database access with individual table sche
 
 import argparse
 import asyncio
+import logging
+import os
+import sys
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Annotated, Optional
 
+# Add the shared folder to path to import result_format
+sys.path.append(str(Path(__file__).parent.parent / "shared"))
+
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import Field
-from sales_analysis_postgres import PostgreSQLSchemaProvider
+from result_format import DEFAULT_RESULT_FORMAT, RESULT_FORMATS
+from sales_analysis_postgres import ALL_TABLES, PostgreSQLSchemaProvider
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+# Log to stderr: in stdio mode stdout carries the JSON-RPC stream
+logger = logging.getLogger(__name__)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 
 RLS_USER_ID = None
 
@@ -25,22 +39,64 @@ class AppContext:
     db: PostgreSQLSchemaProvider
 
 
+# One provider per process. With stateless HTTP the lifespan below runs for every request,
+# so the pool, schema change listener and schema cache must not be tied to it.
+DB_PROVIDER: Optional[PostgreSQLSchemaProvider] = None
+DB_PROVIDER_LOCK = asyncio.Lock()
+
+
+async def start_db_provider() -> PostgreSQLSchemaProvider:
+    """Create, connect and warm the process-wide database provider on first use."""
+    global DB_PROVIDER
+
+    async with DB_PROVIDER_LOCK:
+        if DB_PROVIDER is None:
+            db = PostgreSQLSchemaProvider()
+            # Use connection pool instead of single connection for HTTP server
+            await db.create_pool()
+            await db.start_schema_listener()
+
+            # Warm the schema cache: table structures for everyone, plus the valid values of the stdio
+            # user and of any managers listed in SCHEMA_CACHE_WARM_RLS_USER_IDS (comma-separated)
+            warm_rls_user_ids = [
+                user_id.strip()
+                for user_id in os.getenv("SCHEMA_CACHE_WARM_RLS_USER_IDS", "").split(",")
+                if user_id.strip()
+            ]
+            if RLS_USER_ID is not None and RLS_USER_ID not in warm_rls_user_ids:
+                warm_rls_user_ids.append(RLS_USER_ID)
+            try:
+                await db.warm_schema_cache(ALL_TABLES, warm_rls_user_ids)
+            except Exception as e:
+                logger.warning(f"⚠️  Error warming schema cache: {e}")
+
+            DB_PROVIDER = db
+
+    return DB_PROVIDER
+
+
+async def stop_db_provider() -> None:
+    """Close the process-wide database provider on shutdown."""
+    global DB_PROVIDER
+
+    if DB_PROVIDER is not None:
+        cache_metrics = DB_PROVIDER.result_cache.metrics()
+        logger.info(
+            f"📊 Result cache: {cache_metrics['hits']} hits, {cache_metrics['misses']} misses "
+            f"(hit rate {cache_metrics['hit_rate']:.1%})"
+        )
+        try:
+            await DB_PROVIDER.close_pool()
+        except Exception as e:
+            logger.error(f"⚠️  Error closing database pool: {e}")
+        DB_PROVIDER = None
+
+
 @asynccontextmanager
 async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     """Manage application lifecycle with type-safe context"""
 
-    db = PostgreSQLSchemaProvider()
-    # Use connection pool instead of single connection for HTTP server
-    await db.create_pool()
-
-    try:
-        yield AppContext(db=db)
-    finally:
-        # Cleanup on shutdown
-        try:
-            await db.close_pool()
-        except Exception as e:
-            print(f"⚠️  Error closing database pool: {e}")
+    yield AppContext(db=await start_db_provider())
 
 
 # Create MCP server with lifespan support
@@ -92,7 +148,7 @@ async def get_multiple_table_schemas(
     table_names: Annotated[
         list[str],
         Field(
-            description="List of table names. Valid table names include 'retail.customers', 'retail.stores', 'retail.categories', 'retail.product_types', 'retail.products', 'retail.orders', 'retail.order_items', 'retail.inventory'."
+            description="List of table names. Valid table names include 'retail.customers', 'retail.stores', 'retail.categories', 'retail.product_types', 'retail.products', 'retail.orders', 'retail.order_items', 'retail.inventory', 'retail.sales_by_category_month', 'retail.sales_by_product_month'."
         ),
     ],
 ) -> str:
@@ -100,7 +156,7 @@ async def get_multiple_table_schemas(
     Retrieve schemas for multiple tables. Use this tool only for schemas you have not already fetched during the conversation.
 
     Args:
-        table_names: List of table names. Valid table names include 'retail.customers', 'retail.stores', 'retail.categories', 'retail.product_types', 'retail.products', 'retail.orders', 'retail.order_items', 'retail.inventory'.
+        table_names: List of table names. Valid table names include 'retail.customers', 'retail.stores', 'retail.categories', 'retail.product_types', 'retail.products', 'retail.orders', 'retail.order_items', 'retail.inventory', 'retail.sales_by_category_month', 'retail.sales_by_product_month'.
 
     Returns:
         Concatenated schema strings for the requested tables.
@@ -111,24 +167,15 @@ async def get_multiple_table_schemas(
     if not table_names:
         return "Error: table_names parameter is required and cannot be empty"
 
-    valid_tables = {
-        "retail.customers",
-        "retail.stores",
-        "retail.categories",
-        "retail.product_types",
-        "retail.products",
-        "retail.orders",
-        "retail.order_items",
-        "retail.inventory",
-    }
+    valid_tables = set(ALL_TABLES)
 
     # Validate table names
     invalid_tables = [name for name in table_names if name not in valid_tables]
     if invalid_tables:
         return f"Error: Invalid table names: {invalid_tables}. Valid tables are: {sorted(valid_tables)}"
 
-    print(f"Manager ID: {rls_user_id}")
-    print(f"Retrieving schemas for tables: {', '.join(table_names)}")
+    logger.info(f"Manager ID: {rls_user_id}")
+    logger.info(f"Retrieving schemas for tables: {', '.join(table_names)}")
 
     try:
         provider = get_db_provider()
@@ -139,12 +186,20 @@ async def get_multiple_table_schemas(
 
 @mcp.tool()
 async def execute_sales_query(
-    ctx: Context, postgresql_query: Annotated[str, Field(description="A well-formed PostgreSQL query.")]
+    ctx: Context,
+    postgresql_query: Annotated[str, Field(description="A well-formed PostgreSQL query.")],
+    result_format: Annotated[
+        str,
+        Field(
+            description=f"Result format, one of {', '.join(RESULT_FORMATS)}. 'columnar' lists column names once followed by row arrays."
+        ),
+    ] = DEFAULT_RESULT_FORMAT,
 ) -> str:
-    """Always fetch table schemas first, use exact column names, join related tables for clarity, aggregate results, limit output to 20 rows, and explain that results are limited for readability.
+    """Always fetch table schemas first, use exact column names, join related tables for clarity, aggregate results, limit output to 20 rows, and explain that results are limited for readability. For sales by month, category, product type or product, query the pre-aggregated retail.sales_by_category_month and retail.sales_by_product_month views instead of summing order_items.
 
     Args:
         postgresql_query: A well-formed PostgreSQL query.
+        result_format: Result format: columnar (default), json, csv or markdown.
 
     Returns:
         Query results as a string.
@@ -152,15 +207,15 @@ async def execute_sales_query(
 
     rls_user_id = get_rls_user_id(ctx)
 
-    print(f"Manager ID: {rls_user_id}")
-    print(f"Executing PostgreSQL query: {postgresql_query}")
+    logger.info(f"Manager ID: {rls_user_id}")
+    logger.info(f"Executing PostgreSQL query: {postgresql_query}")
 
     try:
         if not postgresql_query:
             return "Error: postgresql_query parameter is required"
 
         provider = get_db_provider()
-        result = await provider.execute_query(postgresql_query, rls_user_id=rls_user_id)
+        result = await provider.execute_query(postgresql_query, rls_user_id=rls_user_id, result_format=result_format)
         return f"Query Results:\n{result}"
 
     except Exception as e:
@@ -174,7 +229,7 @@ async def get_current_utc_date() -> str:
     Returns:
         Current UTC date and time in ISO format (YYYY-MM-DDTHH:MM:SS.fffffZ)
     """
-    print("Retrieving current UTC date and time")
+    logger.info("Retrieving current UTC date and time")
     try:
         current_utc = datetime.now(timezone.utc)
         return f"Current UTC Date/Time: {current_utc.isoformat()}"
@@ -182,18 +237,60 @@ async def get_current_utc_date() -> str:
         return f"Error retrieving current UTC date: {e!s}"
 
 
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> PlainTextResponse:
+    """Expose the query result cache counters (including hit rate) in Prometheus text format."""
+    lines = []
+    if DB_PROVIDER is not None:
+        for name, value in DB_PROVIDER.result_cache.metrics().items():
+            metric_type = "counter" if name in DB_PROVIDER.result_cache.stats else "gauge"
+            metric = f"zava_sales_result_cache_{name}"
+            lines.append(f"# TYPE {metric} {metric_type}")
+            lines.append(f"{metric} {value}")
+    return PlainTextResponse("\n".join(lines) + "\n")
+
+
 async def run_http_server() -> None:
     """Run the MCP server in HTTP mode."""
     print(f"📡 MCP endpoint available at: http://{mcp.settings.host}:{mcp.settings.port}/mcp")
+    print(f"📊 Result cache metrics at: http://{mcp.settings.host}:{mcp.settings.port}/metrics")
 
     # Run the FastMCP server as HTTP endpoint
-    await mcp.run_streamable_http_async()
+    try:
+        await mcp.run_streamable_http_async()
+    finally:
+        await stop_db_provider()
+
+
+async def run_stdio_server() -> None:
+    """Run the MCP server in stdio mode."""
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        await stop_db_provider()
+
+
+def configure_logging() -> None:
+    """Send the server's and the database provider's log records to stderr at LOG_LEVEL.
+
+    The root logger stays at ERROR (set in sales_analysis_postgres), which would drop
+    their INFO and WARNING records, so these loggers get a handler of their own.
+    """
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    for name in (__name__, "sales_analysis_postgres"):
+        server_logger = logging.getLogger(name)
+        server_logger.setLevel(LOG_LEVEL)
+        server_logger.addHandler(handler)
+        server_logger.propagate = False
 
 
 def main() -> None:
     """Main entry point for the MCP server."""
     global RLS_USER_ID
 
+    configure_logging()
+
     parser = argparse.ArgumentParser()
     parser.add_argument("--stdio", action="store_true", help="Run server in stdio mode")
     parser.add_argument("--RLS_USER_ID", type=str, default=None, help="Row Level Security User ID")
@@ -203,7 +300,7 @@ def main() -> None:
     RLS_USER_ID = args.RLS_USER_ID
 
     if args.stdio:
-        mcp.run()
+        asyncio.run(run_stdio_server())
     else:
         # Run the HTTP server
         asyncio.run(run_http_server())
@@ -19,10 +19,18 @@ import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+# Add the shared folder to path to import result_format
+sys.path.append(str(Path(__file__).parent.parent / "shared"))
 
 import asyncpg
 from dotenv import load_dotenv
+from result_cache import ResultCache, normalize_sql
+from result_format import DEFAULT_RESULT_FORMAT, ResultEncoder, compare_result_formats
 
 # Load environment variables (don't override existing ones)
 load_dotenv(override=False)
@@ -47,6 +55,185 @@ CATEGORIES_TABLE = "categories"
 PRODUCT_TYPES_TABLE = "product_types"
 INVENTORY_TABLE = "inventory"
 
+# Monthly sales summaries (RLS-filtered views over materialized views)
+SALES_BY_CATEGORY_MONTH_VIEW = "sales_by_category_month"
+SALES_BY_PRODUCT_MONTH_VIEW = "sales_by_product_month"
+
+# Every relation the MCP tools may describe, in the order they are listed to the model
+ALL_TABLES = [
+    f"{SCHEMA_NAME}.{STORES_TABLE}",
+    f"{SCHEMA_NAME}.{CATEGORIES_TABLE}",
+    f"{SCHEMA_NAME}.{PRODUCT_TYPES_TABLE}",
+    f"{SCHEMA_NAME}.{PRODUCTS_TABLE}",
+    f"{SCHEMA_NAME}.{CUSTOMERS_TABLE}",
+    f"{SCHEMA_NAME}.{ORDERS_TABLE}",
+    f"{SCHEMA_NAME}.{ORDER_ITEMS_TABLE}",
+    f"{SCHEMA_NAME}.{INVENTORY_TABLE}",
+    f"{SCHEMA_NAME}.{SALES_BY_CATEGORY_MONTH_VIEW}",
+    f"{SCHEMA_NAME}.{SALES_BY_PRODUCT_MONTH_VIEW}",
+]
+
+# Schema cache lifetimes. Table structure is the same for every user; the valid-value
+# lists (available_years, available_stores, ...) are RLS-filtered and cached per user.
+SCHEMA_CACHE_TTL_SECONDS = float(os.getenv("SCHEMA_CACHE_TTL_SECONDS", "3600"))
+ENUM_CACHE_TTL_SECONDS = float(os.getenv("ENUM_CACHE_TTL_SECONDS", "300"))
+
+# NOTIFY channel of the database generator's schema change event trigger
+SCHEMA_CHANGE_CHANNEL = "zava_schema_changed"
+# NOTIFY channel of the generator's per-table write counter triggers ('table:count' payloads)
+TABLE_CHANGE_CHANNEL = "zava_table_changed"
+# Delay before reconnecting a lost change listener, doubled after each failed attempt
+LISTENER_RECONNECT_INITIAL_SECONDS = float(os.getenv("LISTENER_RECONNECT_INITIAL_SECONDS", "1"))
+LISTENER_RECONNECT_MAX_SECONDS = float(os.getenv("LISTENER_RECONNECT_MAX_SECONDS", "60"))
+
+# Result set bounds for model-written SQL. Rows are read through a server-side cursor
+# and encoded as they arrive, so memory stays bounded whatever the query returns.
+MAX_RESULT_ROWS = int(os.getenv("MAX_RESULT_ROWS", "500"))
+MAX_RESULT_BYTES = int(os.getenv("MAX_RESULT_BYTES", str(256 * 1024)))
+CURSOR_FETCH_SIZE = 100
+# Time allowed for counting the full result of a truncated query before giving up
+RESULT_COUNT_TIMEOUT_MS = int(os.getenv("RESULT_COUNT_TIMEOUT_MS", "2000"))
+
+# Typical sales questions used by main() to compare the result formats
+FORMAT_COMPARISON_QUERIES = [
+    (
+        "Monthly revenue by category (120 rows)",
+        f"""SELECT category_name, month, SUM(revenue) AS revenue, SUM(units_sold) AS units_sold
+            FROM {SCHEMA_NAME}.{SALES_BY_CATEGORY_MONTH_VIEW}
+            GROUP BY category_name, month ORDER BY month, category_name LIMIT 120""",
+    ),
+    (
+        "Top 20 products by revenue",
+        f"""SELECT product_name, SUM(revenue) AS revenue, SUM(units_sold) AS units_sold
+            FROM {SCHEMA_NAME}.{SALES_BY_PRODUCT_MONTH_VIEW}
+            GROUP BY product_name ORDER BY revenue DESC LIMIT 20""",
+    ),
+    (
+        "Recent orders (500 rows)",
+        f"""SELECT order_id, customer_id, store_id, order_date, item_count, total_amount
+            FROM {SCHEMA_NAME}.{ORDERS_TABLE} ORDER BY order_date DESC LIMIT 500""",
+    ),
+]
+
+# Relations a cached query result can read, mapped to the tables whose writes invalidate it.
+# RLS-filtered relations also depend on stores, which maps managers to their store.
+# The sales views change on REFRESH MATERIALIZED VIEW, which arrives as a schema change.
+RESULT_CACHE_DEPENDENCIES = {
+    STORES_TABLE: {STORES_TABLE},
+    CATEGORIES_TABLE: {CATEGORIES_TABLE},
+    PRODUCT_TYPES_TABLE: {PRODUCT_TYPES_TABLE},
+    PRODUCTS_TABLE: {PRODUCTS_TABLE},
+    CUSTOMERS_TABLE: {CUSTOMERS_TABLE, STORES_TABLE},
+    ORDERS_TABLE: {ORDERS_TABLE, STORES_TABLE},
+    ORDER_ITEMS_TABLE: {ORDER_ITEMS_TABLE, STORES_TABLE},
+    INVENTORY_TABLE: {INVENTORY_TABLE, STORES_TABLE},
+    "product_image_embeddings": {"product_image_embeddings"},
+    "product_description_embeddings": {"product_description_embeddings"},
+    SALES_BY_CATEGORY_MONTH_VIEW: {STORES_TABLE, CATEGORIES_TABLE, PRODUCT_TYPES_TABLE},
+    SALES_BY_PRODUCT_MONTH_VIEW: {STORES_TABLE, PRODUCTS_TABLE},
+}
+
+# Descriptions for relations that are not plain tables
+TABLE_DESCRIPTIONS = {
+    ORDERS_TABLE: (
+        "Order headers. item_count, subtotal, discount_total and total_amount are kept in step with order_items, "
+        "so order counts, revenue, average order value and basket size need no join to order_items"
+    ),
+    SALES_BY_CATEGORY_MONTH_VIEW: (
+        "Pre-aggregated monthly sales per store, category and product type (month is the first day of the month). "
+        "Prefer it over joining orders/order_items for revenue, units, discount or cost trends by category or type"
+    ),
+    SALES_BY_PRODUCT_MONTH_VIEW: (
+        "Pre-aggregated monthly sales per store and product (month is the first day of the month). "
+        "Prefer it over joining orders/order_items for top products and product revenue trends"
+    ),
+}
+
+
+# Column, primary key and foreign key metadata for a list of relations in one
+# round trip. Reads pg_catalog directly: the information_schema views are built
+# from many joins and privilege checks and are slow to query table by table.
+# $1 and $2 are parallel arrays of schema and table names.
+TABLE_METADATA_QUERY = """
+WITH requested AS (
+    SELECT r.schema_name, r.table_name
+    FROM unnest($1::text[], $2::text[]) AS r(schema_name, table_name)
+)
+SELECT
+    n.nspname AS schema_name,
+    c.relname AS table_name,
+    COALESCE((
+        SELECT json_agg(json_build_object(
+            'name', a.attname,
+            'type', format_type(a.atttypid, a.atttypmod),
+            'not_null', a.attnotnull,
+            'default_value', pg_get_expr(d.adbin, d.adrelid),
+            'primary_key', COALESCE(a.attnum = ANY (pk.conkey), false)
+        ) ORDER BY a.attnum)
+        FROM pg_attribute a
+        LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+        LEFT JOIN pg_constraint pk ON pk.conrelid = a.attrelid AND pk.contype = 'p'
+        WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    ), '[]') AS columns,
+    COALESCE((
+        SELECT json_agg(json_build_object(
+            'column', a.attname,
+            'references_table', rc.relname,
+            'references_column', ra.attname
+        ) ORDER BY fk.conname, k.ord)
+        FROM pg_constraint fk
+        CROSS JOIN LATERAL unnest(fk.conkey, fk.confkey) WITH ORDINALITY AS k(attnum, ref_attnum, ord)
+        JOIN pg_attribute a ON a.attrelid = fk.conrelid AND a.attnum = k.attnum
+        JOIN pg_class rc ON rc.oid = fk.confrelid
+        JOIN pg_attribute ra ON ra.attrelid = fk.confrelid AND ra.attnum = k.ref_attnum
+        -- Skip the clones PostgreSQL adds for each referenced partition, as psql does
+        WHERE fk.conrelid = c.oid AND fk.contype = 'f' AND fk.conparentid = 0
+    ), '[]') AS foreign_keys
+FROM requested
+JOIN pg_namespace n ON n.nspname = requested.schema_name
+JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = requested.table_name
+WHERE c.relkind IN ('r', 'p', 'v', 'm', 'f')
+    AND NOT c.relispartition
+    AND has_table_privilege(c.oid, 'SELECT, INSERT, UPDATE, DELETE, TRUNCATE, REFERENCES, TRIGGER')
+"""
+
+
+class TTLCache:
+    """Small in-memory cache whose entries expire a fixed number of seconds after they are stored."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Any, Tuple[float, Any]] = {}
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None when it is missing or has expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value for ttl_seconds."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self, predicate: Optional[Callable[[Any], bool]] = None) -> int:
+        """Drop every entry, or only those whose key matches predicate. Returns the number dropped."""
+        if predicate is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class PostgreSQLSchemaProvider:
     """Provides PostgreSQL database schema information in AI-friendly formats for dynamic query generation."""
@@ -55,8 +242,16 @@ class PostgreSQLSchemaProvider:
         self.postgres_config = postgres_config or POSTGRES_URL
         self.connection_pool: Optional[asyncpg.Pool] = None
         self.all_schemas: Optional[Dict[str, Dict[str, Any]]] = None
-        # In-memory cache for per-table schema look-ups
-        self._schema_cache: Dict[str, Any] = {}
+        # Table structure shared by all users, keyed by table name
+        self._structure_cache = TTLCache(SCHEMA_CACHE_TTL_SECONDS)
+        # RLS-filtered valid-value lists, keyed by (rls_user_id, table name)
+        self._enum_cache = TTLCache(ENUM_CACHE_TTL_SECONDS)
+        # Dedicated connection that LISTENs for schema and table change notifications
+        self._listener_conn: Optional[asyncpg.Connection] = None
+        # Background task reconnecting the listener after it was lost or could not connect
+        self._listener_reconnect: Optional[asyncio.Task] = None
+        # execute_query responses, only used while the listener is connected
+        self.result_cache = ResultCache()
 
     async def __aenter__(self) -> "PostgreSQLSchemaProvider":
         """Async context manager entry - just return self, don't auto-create pool."""
@@ -96,13 +291,130 @@ class PostgreSQLSchemaProvider:
 
     async def close_pool(self) -> None:
         """Close connection pool and cleanup."""
+        await self.stop_schema_listener()
         if self.connection_pool:
             await self.connection_pool.close()
             self.connection_pool = None
-            self.all_schemas = None
-            self._schema_cache = {}
+            self.invalidate_schema_cache()
+            self.result_cache.clear()
             logger.info("✅ PostgreSQL connection pool closed")
 
+    def invalidate_schema_cache(self) -> None:
+        """Forget all cached table structures and valid-value lists."""
+        self.all_schemas = None
+        self._structure_cache.invalidate()
+        self._enum_cache.invalidate()
+
+    async def start_schema_listener(self) -> None:
+        """LISTEN for schema and table change notifications so cached schemas and query results are dropped.
+
+        Uses its own connection so the pool keeps all of its slots for queries. While the
+        channels cannot be subscribed to, the schema cache falls back to its TTLs alone,
+        query results are not cached and the connection is retried in the background.
+        """
+        if self._listener_conn is not None or self._listener_reconnect is not None:
+            return
+
+        if not await self._connect_listener():
+            self._schedule_listener_reconnect()
+
+    async def stop_schema_listener(self) -> None:
+        """Stop reconnecting and close the schema change listener connection, if any."""
+        if self._listener_reconnect is not None:
+            task, self._listener_reconnect = self._listener_reconnect, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._listener_conn is not None:
+            conn, self._listener_conn = self._listener_conn, None
+            try:
+                await conn.close()
+            except Exception as e:
+                logger.debug(f"Failed to close schema listener connection: {e}")
+
+    def _on_schema_change(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        """Drop cached schemas when the event trigger reports DDL on the retail schema."""
+        # DDL is rare and the payload may name indexes, policies or columns, so drop everything
+        logger.info(f"🔄 Schema change notification ({payload}), clearing schema and result caches")
+        self.invalidate_schema_cache()
+        self.result_cache.clear()
+
+    def _on_table_change(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        """Drop cached query results that read a table the write counter trigger reported."""
+        table, _, count = payload.partition(":")
+        dropped = self.result_cache.table_changed(table, int(count) if count.isdigit() else None)
+        if dropped:
+            logger.debug(f"🔄 {table} written, dropped {dropped} cached results")
+
+    async def _connect_listener(self) -> bool:
+        """Open the listener connection and subscribe to both channels. Returns whether it succeeded."""
+        conn = None
+        try:
+            conn = await asyncpg.connect(self.postgres_config)
+            await conn.add_listener(SCHEMA_CHANGE_CHANNEL, self._on_schema_change)
+            await conn.add_listener(TABLE_CHANGE_CHANNEL, self._on_table_change)
+            conn.add_termination_listener(self._on_listener_terminated)
+        except Exception as e:
+            logger.warning(f"⚠️  Schema change listener unavailable, relying on cache TTL: {e}")
+            if conn is not None:
+                await conn.close()
+            return False
+        self._listener_conn = conn
+        logger.info(f"✅ Listening for changes on '{SCHEMA_CHANGE_CHANNEL}' and '{TABLE_CHANGE_CHANNEL}'")
+        return True
+
+    def _schedule_listener_reconnect(self) -> None:
+        if self._listener_reconnect is None:
+            self._listener_reconnect = asyncio.create_task(self._reconnect_listener())
+
+    async def _reconnect_listener(self) -> None:
+        """Retry the listener connection with exponential backoff until it succeeds."""
+        delay = LISTENER_RECONNECT_INITIAL_SECONDS
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                if await self._connect_listener():
+                    # Notifications sent while disconnected were lost
+                    logger.info("🔄 Change listener reconnected, clearing schema and result caches")
+                    self.invalidate_schema_cache()
+                    self.result_cache.clear()
+                    return
+                delay = min(delay * 2, LISTENER_RECONNECT_MAX_SECONDS)
+        finally:
+            if self._listener_reconnect is asyncio.current_task():
+                self._listener_reconnect = None
+
+    def _on_listener_terminated(self, connection: asyncpg.Connection) -> None:
+        """Notifications may have been missed while disconnected, so start from a clean cache and reconnect."""
+        if connection is not self._listener_conn:
+            # Closed by stop_schema_listener
+            return
+        logger.warning("⚠️  Change listener connection lost, clearing schema and result caches")
+        self._listener_conn = None
+        self.invalidate_schema_cache()
+        self.result_cache.clear()
+        self._schedule_listener_reconnect()
+
+    async def warm_schema_cache(self, table_names: List[str], rls_user_ids: Optional[List[str]] = None) -> None:
+        """Load table structures, and the valid-value lists of the given RLS users, into the cache."""
+        conn = None
+        try:
+            conn = await self.get_connection()
+            structures = await self._get_table_structures(conn, table_names)
+
+            for rls_user_id in rls_user_ids or []:
+                await conn.execute(
+                    "SELECT set_config('app.current_rls_user_id', $1, false)", rls_user_id)
+                await self._get_tables_metadata(conn, list(structures), rls_user_id)
+
+            logger.info(
+                f"✅ Schema cache warmed: {len(structures)} tables, {len(rls_user_ids or [])} RLS users")
+        finally:
+            if conn:
+                await self.release_connection(conn)
+
     async def get_connection(self) -> asyncpg.Connection:
         """Get a connection from pool."""
         if not self.connection_pool:
@@ -231,14 +543,12 @@ class PostgreSQLSchemaProvider:
 
     async def get_table_schema(self, table_name: str, rls_user_id: str) -> Dict[str, Any]:
         """Return schema information for a given table."""
-        # Return cached version if available
-        if table_name in self._schema_cache:
-            return self._schema_cache[table_name]
-
-        schema_name, parsed_table_name = self._parse_table_name(table_name)
+        self._parse_table_name(table_name)
 
-        if not await self.table_exists(table_name):
-            return {"error": f"Table '{table_name}' not found"}
+        # Return cached version if available
+        schema_data = self._get_cached_table_metadata(table_name, rls_user_id)
+        if schema_data is not None:
+            return schema_data
 
         conn = None
         try:
@@ -247,136 +557,10 @@ class PostgreSQLSchemaProvider:
             await conn.execute(
                 "SELECT set_config('app.current_rls_user_id', $1, false)", rls_user_id)
 
-            # Get column information
-            columns = await conn.fetch(
-                """SELECT 
-                    column_name,
-                    data_type,
-                    is_nullable,
-                    column_default,
-                    ordinal_position
-                FROM information_schema.columns 
-                WHERE table_schema = $1 AND table_name = $2
-                ORDER BY ordinal_position""",
-                schema_name,
-                parsed_table_name,
-            )
-
-            # Get primary key information
-            primary_keys = await conn.fetch(
-                """SELECT kcu.column_name
-                FROM information_schema.table_constraints tc
-                JOIN information_schema.key_column_usage kcu 
-                    ON tc.constraint_name = kcu.constraint_name
-                    AND tc.table_schema = kcu.table_schema
-                WHERE tc.constraint_type = 'PRIMARY KEY'
-                    AND tc.table_schema = $1 
-                    AND tc.table_name = $2""",
-                schema_name,
-                parsed_table_name,
-            )
-
-            pk_columns = {row["column_name"] for row in primary_keys}
-
-            # Get foreign key information
-            foreign_keys = await conn.fetch(
-                """SELECT 
-                    kcu.column_name,
-                    ccu.table_name AS foreign_table_name,
-                    ccu.column_name AS foreign_column_name
-                FROM information_schema.table_constraints tc
-                JOIN information_schema.key_column_usage kcu 
-                    ON tc.constraint_name = kcu.constraint_name
-                    AND tc.table_schema = kcu.table_schema
-                JOIN information_schema.constraint_column_usage ccu 
-                    ON ccu.constraint_name = tc.constraint_name
-                    AND ccu.table_schema = tc.table_schema
-                WHERE tc.constraint_type = 'FOREIGN KEY'
-                    AND tc.table_schema = $1 
-                    AND tc.table_name = $2""",
-                schema_name,
-                parsed_table_name,
-            )
-
-            columns_format = ", ".join(
-                f"{col['column_name']}:{col['data_type']}" for col in columns)
-            lower_table = parsed_table_name.lower()
-
-            # Define enum queries for each table to get unique values
-            enum_queries = {
-                STORES_TABLE: {"available_stores": ("store_name", f"{schema_name}.{STORES_TABLE}")},
-                CATEGORIES_TABLE: {"available_categories": ("category_name", f"{schema_name}.{CATEGORIES_TABLE}")},
-                PRODUCT_TYPES_TABLE: {"available_product_types": ("type_name", f"{schema_name}.{PRODUCT_TYPES_TABLE}")},
-                PRODUCTS_TABLE: {
-                    # Removed available_product_names to avoid lengthy output
-                },
-                ORDERS_TABLE: {
-                    "available_years": ("EXTRACT(YEAR FROM order_date)::text", f"{schema_name}.{ORDERS_TABLE}")
-                },
-                ORDER_ITEMS_TABLE: {
-                    # "price_range": ("unit_price", f"{schema_name}.{ORDER_ITEMS_TABLE}")
-                },
-            }
-
-            enum_data = {}
-            if lower_table in enum_queries:
-                for key, (column, qualified_table) in enum_queries[lower_table].items():
-                    try:
-                        if key == "price_range":
-                            # For price range, get min and max values
-                            result = await conn.fetchrow(
-                                f"SELECT MIN({column}) as min_price, MAX({column}) as max_price FROM {qualified_table}"
-                            )
-                            if result and result["min_price"] is not None:
-                                enum_data[key] = f"${result['min_price']:.2f} - ${result['max_price']:.2f}"
-                        elif key == "available_years":
-                            # Handle years specially
-                            rows = await conn.fetch(
-                                f"SELECT DISTINCT {column} as year FROM {qualified_table} WHERE order_date IS NOT NULL ORDER BY year"
-                            )
-                            years = [str(row["year"])
-                                     for row in rows if row["year"]]
-                            enum_data[key] = years
-                        else:
-                            enum_data[key] = await self.fetch_distinct_values(column, qualified_table)
-                    except Exception as e:
-                        logger.debug(
-                            f"Failed to fetch {key} for {qualified_table}: {e}")
-                        enum_data[key] = []
-
-            schema_data = {
-                # Keep the original input (may include schema)
-                "table_name": table_name,
-                "parsed_table_name": parsed_table_name,  # Just the table name
-                "schema_name": schema_name,  # The schema name
-                "description": f"Table containing {parsed_table_name} data",
-                "columns_format": columns_format,
-                "columns": [
-                    {
-                        "name": col["column_name"],
-                        "type": col["data_type"],
-                        "primary_key": col["column_name"] in pk_columns,
-                        "required": col["is_nullable"] == "NO",
-                        "default_value": col["column_default"],
-                    }
-                    for col in columns
-                ],
-                "foreign_keys": [
-                    {
-                        "column": fk["column_name"],
-                        "references_table": fk["foreign_table_name"],
-                        "references_column": fk["foreign_column_name"],
-                        "description": f"{fk['column_name']} links to {fk['foreign_table_name']}.{fk['foreign_column_name']}",
-                        "relationship_type": self.infer_relationship_type(f"{schema_name}.{fk['foreign_table_name']}"),
-                    }
-                    for fk in foreign_keys
-                ],
-            }
-
-            schema_data.update(enum_data)
-            # Cache result for future calls
-            self._schema_cache[table_name] = schema_data
-            return schema_data
+            schemas = await self._get_tables_metadata(conn, [table_name], rls_user_id)
+            if table_name not in schemas:
+                return {"error": f"Table '{table_name}' not found"}
+            return schemas[table_name]
 
         finally:
             if conn:
@@ -495,112 +679,79 @@ class PostgreSQLSchemaProvider:
         return self.format_schema_metadata_for_ai(schema)
 
     async def get_table_metadata_from_list(self, table_names: List[str], rls_user_id: str) -> str:
-        """Return formatted schema metadata strings for multiple tables efficiently using a single connection."""
+        """Return formatted schema metadata strings for multiple tables using one catalog query on a single connection."""
         if not table_names:
             return "Error: table_names parameter is required and cannot be empty"
 
-        conn = None
-        try:
-            conn = await self.get_connection()
-            
-            # Set rls_user_id once for the connection
-            await conn.execute(
-                "SELECT set_config('app.current_rls_user_id', $1, false)", rls_user_id)
-
-            schemas = []
-            for table_name in table_names:
-                try:
-                    # Check if table exists first
-                    schema_name, parsed_table_name = self._parse_table_name(table_name)
-                    table_exists_result = await conn.fetchval(
-                        """SELECT EXISTS (
-                            SELECT 1 FROM information_schema.tables 
-                            WHERE table_schema = $1 AND table_name = $2
-                        )""",
-                        schema_name,
-                        parsed_table_name,
-                    )
-                    
-                    if not table_exists_result:
-                        schemas.append(f"**ERROR:** Table '{table_name}' not found\n")
-                        continue
-
-                    # Get schema data efficiently within the same connection
-                    # Use the original method but with our existing connection
-                    schema_data = await self._get_table_metadata(conn, table_name)
-                    formatted_schema = self.format_schema_metadata_for_ai(schema_data)
-                    schemas.append(f"\n\n{formatted_schema}")
-                    
-                except Exception as e:
-                    schemas.append(f"Error retrieving {table_name} schema: {e!s}\n")
-
-            return "".join(schemas)
+        schemas_by_name = {}
+        missing = []
+        parse_errors = {}
+        for table_name in table_names:
+            try:
+                self._parse_table_name(table_name)
+            except ValueError as e:
+                parse_errors[table_name] = e
+                continue
+            schema_data = self._get_cached_table_metadata(table_name, rls_user_id)
+            if schema_data is None:
+                missing.append(table_name)
+            else:
+                schemas_by_name[table_name] = schema_data
+
+        # Only touch the database for tables that are not fully cached for this user
+        if missing:
+            conn = None
+            try:
+                conn = await self.get_connection()
 
-        finally:
-            if conn:
-                await self.release_connection(conn)
+                # Set rls_user_id once for the connection
+                await conn.execute(
+                    "SELECT set_config('app.current_rls_user_id', $1, false)", rls_user_id)
 
-    async def _get_table_metadata(self, conn: asyncpg.Connection, table_name: str) -> Dict[str, Any]:
-        """Get table schema using an existing connection for efficiency."""
-        # Return cached version if available
-        if table_name in self._schema_cache:
-            return self._schema_cache[table_name]
+                schemas_by_name.update(await self._get_tables_metadata(conn, missing, rls_user_id))
 
-        schema_name, parsed_table_name = self._parse_table_name(table_name)
+            finally:
+                if conn:
+                    await self.release_connection(conn)
 
-        # Get column information
-        columns = await conn.fetch(
-            """SELECT 
-                column_name,
-                data_type,
-                is_nullable,
-                column_default,
-                ordinal_position
-            FROM information_schema.columns 
-            WHERE table_schema = $1 AND table_name = $2
-            ORDER BY ordinal_position""",
-            schema_name,
-            parsed_table_name,
-        )
+        schemas = []
+        for table_name in table_names:
+            if table_name in parse_errors:
+                schemas.append(f"Error retrieving {table_name} schema: {parse_errors[table_name]!s}\n")
+            elif table_name not in schemas_by_name:
+                schemas.append(f"**ERROR:** Table '{table_name}' not found\n")
+            else:
+                formatted_schema = self.format_schema_metadata_for_ai(schemas_by_name[table_name])
+                schemas.append(f"\n\n{formatted_schema}")
+
+        return "".join(schemas)
+
+    async def _fetch_table_structures(
+        self, conn: asyncpg.Connection, table_names: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch columns, primary keys and foreign keys for all requested tables in one pg_catalog query."""
+        if not table_names:
+            return {}
 
-        # Get primary key information
-        primary_keys = await conn.fetch(
-            """SELECT kcu.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu 
-                ON tc.constraint_name = kcu.constraint_name
-                AND tc.table_schema = kcu.table_schema
-            WHERE tc.constraint_type = 'PRIMARY KEY'
-                AND tc.table_schema = $1 
-                AND tc.table_name = $2""",
-            schema_name,
-            parsed_table_name,
+        parsed = [self._parse_table_name(table_name) for table_name in table_names]
+        rows = await conn.fetch(
+            TABLE_METADATA_QUERY,
+            [schema_name for schema_name, _ in parsed],
+            [parsed_table_name for _, parsed_table_name in parsed],
         )
 
-        pk_columns = {row["column_name"] for row in primary_keys}
-
-        # Get foreign key information
-        foreign_keys = await conn.fetch(
-            """SELECT 
-                kcu.column_name,
-                ccu.table_name AS foreign_table_name,
-                ccu.column_name AS foreign_column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu 
-                ON tc.constraint_name = kcu.constraint_name
-                AND tc.table_schema = kcu.table_schema
-            JOIN information_schema.constraint_column_usage ccu 
-                ON ccu.constraint_name = tc.constraint_name
-                AND ccu.table_schema = tc.table_schema
-            WHERE tc.constraint_type = 'FOREIGN KEY'
-                AND tc.table_schema = $1 
-                AND tc.table_name = $2""",
-            schema_name,
-            parsed_table_name,
-        )
+        structures = {}
+        for row in rows:
+            structures[f"{row['schema_name']}.{row['table_name']}"] = {
+                "columns": json.loads(row["columns"]),
+                "foreign_keys": json.loads(row["foreign_keys"]),
+            }
+        return structures
 
-        columns_format = ", ".join(
-            f"{col['column_name']}:{col['data_type']}" for col in columns)
+    async def _fetch_enum_data(
+        self, conn: asyncpg.Connection, schema_name: str, parsed_table_name: str
+    ) -> Dict[str, Any]:
+        """Fetch the valid-value lists shown for a table, using the connection's RLS user."""
         lower_table = parsed_table_name.lower()
 
         # Define enum queries for each table to get unique values
@@ -623,7 +774,14 @@ class PostgreSQLSchemaProvider:
         if lower_table in enum_queries:
             for key, (column, qualified_table) in enum_queries[lower_table].items():
                 try:
-                    if key == "available_years":
+                    if key == "price_range":
+                        # For price range, get min and max values
+                        result = await conn.fetchrow(
+                            f"SELECT MIN({column}) as min_price, MAX({column}) as max_price FROM {qualified_table}"
+                        )
+                        if result and result["min_price"] is not None:
+                            enum_data[key] = f"${result['min_price']:.2f} - ${result['max_price']:.2f}"
+                    elif key == "available_years":
                         # Handle years specially
                         rows = await conn.fetch(
                             f"SELECT DISTINCT {column} as year FROM {qualified_table} WHERE order_date IS NOT NULL ORDER BY year"
@@ -632,7 +790,6 @@ class PostgreSQLSchemaProvider:
                                  for row in rows if row["year"]]
                         enum_data[key] = years
                     else:
-                        # Use existing connection for fetch_distinct_values-like operation
                         rows = await conn.fetch(
                             f"SELECT DISTINCT {column} FROM {qualified_table} WHERE {column} IS NOT NULL ORDER BY {column}"
                         )
@@ -642,42 +799,139 @@ class PostgreSQLSchemaProvider:
                         f"Failed to fetch {key} for {qualified_table}: {e}")
                     enum_data[key] = []
 
+        return enum_data
+
+    def _build_schema_data(
+        self, table_name: str, structure: Dict[str, Any], enum_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Assemble the schema dictionary consumed by format_schema_metadata_for_ai."""
+        schema_name, parsed_table_name = self._parse_table_name(table_name)
+        columns = structure["columns"]
+        foreign_keys = structure["foreign_keys"]
+
         schema_data = {
             # Keep the original input (may include schema)
             "table_name": table_name,
             "parsed_table_name": parsed_table_name,  # Just the table name
             "schema_name": schema_name,  # The schema name
-            "description": f"Table containing {parsed_table_name} data",
-            "columns_format": columns_format,
+            "description": TABLE_DESCRIPTIONS.get(parsed_table_name, f"Table containing {parsed_table_name} data"),
+            "columns_format": ", ".join(f"{col['name']}:{col['type']}" for col in columns),
             "columns": [
                 {
-                    "name": col["column_name"],
-                    "type": col["data_type"],
-                    "primary_key": col["column_name"] in pk_columns,
-                    "required": col["is_nullable"] == "NO",
-                    "default_value": col["column_default"],
+                    "name": col["name"],
+                    "type": col["type"],
+                    "primary_key": col["primary_key"],
+                    "required": col["not_null"],
+                    "default_value": col["default_value"],
                 }
                 for col in columns
             ],
             "foreign_keys": [
                 {
-                    "column": fk["column_name"],
-                    "references_table": fk["foreign_table_name"],
-                    "references_column": fk["foreign_column_name"],
-                    "description": f"{fk['column_name']} links to {fk['foreign_table_name']}.{fk['foreign_column_name']}",
-                    "relationship_type": self.infer_relationship_type(f"{schema_name}.{fk['foreign_table_name']}"),
+                    "column": fk["column"],
+                    "references_table": fk["references_table"],
+                    "references_column": fk["references_column"],
+                    "description": f"{fk['column']} links to {fk['references_table']}.{fk['references_column']}",
+                    "relationship_type": self.infer_relationship_type(f"{schema_name}.{fk['references_table']}"),
                 }
                 for fk in foreign_keys
             ],
         }
 
         schema_data.update(enum_data)
-        # Cache result for future calls
-        self._schema_cache[table_name] = schema_data
         return schema_data
 
-    async def execute_query(self, sql_query: str, rls_user_id: str) -> str:
-        """Execute a SQL query and return results in LLM-friendly JSON format."""
+    def _get_cached_table_metadata(self, table_name: str, rls_user_id: str) -> Optional[Dict[str, Any]]:
+        """Return the schema from memory when both its structure and this user's valid values are cached."""
+        structure = self._structure_cache.get(table_name)
+        if structure is None:
+            return None
+        enum_data = self._enum_cache.get((rls_user_id, table_name))
+        if enum_data is None:
+            return None
+        return self._build_schema_data(table_name, structure, enum_data)
+
+    async def _get_table_structures(self, conn: asyncpg.Connection, table_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return table structures keyed by table name, describing uncached tables with one catalog query.
+
+        Tables that do not exist are left out of the result.
+        """
+        result = {}
+        missing = []
+        for table_name in dict.fromkeys(table_names):
+            structure = self._structure_cache.get(table_name)
+            if structure is None:
+                missing.append(table_name)
+            else:
+                result[table_name] = structure
+
+        fetched = await self._fetch_table_structures(conn, missing)
+        for table_name in missing:
+            schema_name, parsed_table_name = self._parse_table_name(table_name)
+            structure = fetched.get(f"{schema_name}.{parsed_table_name}")
+            if structure is not None:
+                self._structure_cache.set(table_name, structure)
+                result[table_name] = structure
+
+        return result
+
+    async def _get_tables_metadata(
+        self, conn: asyncpg.Connection, table_names: List[str], rls_user_id: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get schemas for several tables on a connection already set to rls_user_id, keyed by table name.
+
+        Structures come from the shared cache, valid-value lists from this user's cache; whatever
+        is missing is fetched and cached. Tables that do not exist are left out of the result.
+        """
+        structures = await self._get_table_structures(conn, table_names)
+
+        result = {}
+        for table_name, structure in structures.items():
+            enum_data = self._enum_cache.get((rls_user_id, table_name))
+            if enum_data is None:
+                schema_name, parsed_table_name = self._parse_table_name(table_name)
+                enum_data = await self._fetch_enum_data(conn, schema_name, parsed_table_name)
+                self._enum_cache.set((rls_user_id, table_name), enum_data)
+            result[table_name] = self._build_schema_data(table_name, structure, enum_data)
+
+        return result
+
+    async def execute_query(
+        self,
+        sql_query: str,
+        rls_user_id: str,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        result_format: Optional[str] = None,
+    ) -> str:
+        """Execute a SQL query and return results in an LLM-friendly format (see result_format.py).
+
+        The query runs in a read-only transaction and is read through a server-side cursor.
+        Fetching stops at max_rows rows or max_bytes of encoded results; the response then
+        has "truncated": true and, when it can be counted quickly, "total_row_count".
+
+        Responses are served from result_cache when the same normalized query was already
+        answered for this RLS user and none of the tables it reads has been written since.
+        """
+        max_rows = MAX_RESULT_ROWS if max_rows is None else max_rows
+        max_bytes = MAX_RESULT_BYTES if max_bytes is None else max_bytes
+
+        cache_key = None
+        cache_tables = frozenset()
+        cache_snapshot = ()
+        if self._listener_conn is not None:
+            normalized = normalize_sql(sql_query)
+            cache_tables = self._result_cache_tables(normalized.words)
+            if cache_tables and not normalized.volatile:
+                cache_key = (normalized.text, rls_user_id, result_format or DEFAULT_RESULT_FORMAT, max_rows, max_bytes)
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+                # Taken before the query runs so a write that lands meanwhile keeps the result out of the cache
+                cache_snapshot = self.result_cache.snapshot(cache_tables)
+            else:
+                self.result_cache.record_bypass()
+
         conn = None
         try:
             conn = await self.get_connection()
@@ -686,26 +940,51 @@ class PostgreSQLSchemaProvider:
                 "SELECT set_config('app.current_rls_user_id', $1, false)", rls_user_id)
 
             # logger.info(f"\n🔍 Executing PostgreSQL query: {sql_query}\n")
-            rows = await conn.fetch(sql_query)
-
-            if not rows:
-                return json.dumps(
-                    {
-                        "results": [],
-                        "row_count": 0,
-                        "columns": [],
-                        "message": "The query returned no results. Try a different question.",
-                    }
+            async with conn.transaction(readonly=True):
+                statement = await conn.prepare(sql_query)
+                columns = [attribute.name for attribute in statement.get_attributes()]
+                encoder = ResultEncoder(columns, result_format)
+                cursor = await statement.cursor()
+
+                encoded_rows: List[str] = []
+                encoded_bytes = 0
+                truncated_reason = None
+                while truncated_reason is None:
+                    # Ask for one row past the cap so a result of exactly max_rows is not reported as truncated
+                    batch = await cursor.fetch(min(CURSOR_FETCH_SIZE, max_rows + 1 - len(encoded_rows)))
+                    if not batch:
+                        break
+                    for row in batch:
+                        if len(encoded_rows) >= max_rows:
+                            truncated_reason = "row_limit"
+                            break
+                        encoded = encoder.encode_row(row.values())
+                        row_bytes = len(encoded.encode("utf-8")) + 1
+                        if encoded_bytes + row_bytes > max_bytes:
+                            truncated_reason = "byte_limit"
+                            break
+                        encoded_rows.append(encoded)
+                        encoded_bytes += row_bytes
+
+                total_row_count = None
+                if truncated_reason is not None:
+                    total_row_count = await self._count_query_rows(conn, sql_query)
+
+            meta: Dict[str, Any] = {"row_count": len(encoded_rows), "truncated": truncated_reason is not None}
+            if not encoded_rows:
+                meta["message"] = "The query returned no results. Try a different question."
+            elif truncated_reason is not None:
+                meta["truncated_reason"] = truncated_reason
+                if total_row_count is not None:
+                    meta["total_row_count"] = total_row_count
+                meta["message"] = (
+                    f"Only the first {len(encoded_rows)} rows are shown. "
+                    "Aggregate the data or add a LIMIT to see a complete result."
                 )
-
-            # Convert asyncpg Records to list of dictionaries (much simpler!)
-            results = [dict(row) for row in rows]
-            columns = list(rows[0].keys()) if rows else []
-
-            # Return LLM-friendly format
-            return json.dumps(
-                {"results": results, "row_count": len(results), "columns": columns}, indent=2, default=str
-            )
+            response = encoder.render(encoded_rows, meta)
+            if cache_key is not None:
+                self.result_cache.put(cache_key, response, cache_tables, cache_snapshot)
+            return response
 
         except Exception as e:
             return json.dumps(
@@ -721,6 +1000,45 @@ class PostgreSQLSchemaProvider:
             if conn:
                 await self.release_connection(conn)
 
+    def _result_cache_tables(self, words: FrozenSet[str]) -> FrozenSet[str]:
+        """Tables whose writes invalidate a query naming these words; empty when it reads no known relation."""
+        tables = set()
+        for relation, dependencies in RESULT_CACHE_DEPENDENCIES.items():
+            if relation in words:
+                tables.update(dependencies)
+        return frozenset(tables)
+
+    async def compare_result_formats(self, sql_query: str, rls_user_id: str, runs: int = 20) -> List[Dict[str, Any]]:
+        """Fetch a query's rows once and measure payload size and encode time for each result format."""
+        conn = None
+        try:
+            conn = await self.get_connection()
+            await conn.execute(
+                "SELECT set_config('app.current_rls_user_id', $1, false)", rls_user_id)
+            statement = await conn.prepare(sql_query)
+            columns = [attribute.name for attribute in statement.get_attributes()]
+            rows = [tuple(row.values()) for row in await statement.fetch()]
+        finally:
+            if conn:
+                await self.release_connection(conn)
+        return compare_result_formats(columns, rows, runs)
+
+    async def _count_query_rows(self, conn: asyncpg.Connection, sql_query: str) -> Optional[int]:
+        """Count the rows a query returns, or None if that takes longer than RESULT_COUNT_TIMEOUT_MS.
+
+        Must be called inside a transaction; the count runs in a savepoint so a timeout
+        does not abort it.
+        """
+        inner_query = sql_query.strip().rstrip(";")
+        try:
+            async with conn.transaction():
+                await conn.execute(f"SET LOCAL statement_timeout = {RESULT_COUNT_TIMEOUT_MS}")
+                # The newline keeps a trailing -- comment from swallowing the closing parenthesis
+                return await conn.fetchval(f"SELECT COUNT(*) FROM ({inner_query}\n) AS bounded_query")
+        except Exception as e:
+            logger.debug(f"Skipped total row count for truncated query: {e}")
+            return None
+
 
 async def test_connection() -> bool:
     """Test PostgreSQL connection and return success status."""
@@ -798,20 +1116,16 @@ async def main() -> None:
 
             logger.info("\n✅ SQL Query tests completed!")
             logger.info("=" * 50)
+
+            print("\n📏 Result format comparison (payload bytes / median encode ms):\n")
+            for label, sql in FORMAT_COMPARISON_QUERIES:
+                print(f"{label}:")
+                for entry in await provider.compare_result_formats(sql, rls_user_id=MANAGER_ID):
+                    print(f"  {entry['format']:<28} {entry['bytes']:>10,} bytes  {entry['median_ms']:>8.2f} ms")
             print(f"\n📋 All table schemas in {SCHEMA_NAME} schema:\n")
 
             # --- Use the new efficient method for getting all schemas ---
-            all_table_names = [
-                f"{SCHEMA_NAME}.{STORES_TABLE}",
-                f"{SCHEMA_NAME}.{CATEGORIES_TABLE}",
-                f"{SCHEMA_NAME}.{PRODUCT_TYPES_TABLE}",
-                f"{SCHEMA_NAME}.{PRODUCTS_TABLE}",
-                f"{SCHEMA_NAME}.{CUSTOMERS_TABLE}",
-                f"{SCHEMA_NAME}.{ORDERS_TABLE}",
-                f"{SCHEMA_NAME}.{ORDER_ITEMS_TABLE}",
-                f"{SCHEMA_NAME}.{INVENTORY_TABLE}"
-            ]
-            print(await provider.get_table_metadata_from_list(all_table_names, rls_user_id=MANAGER_ID))
+            print(await provider.get_table_metadata_from_list(ALL_TABLES, rls_user_id=MANAGER_ID))
 
     except Exception as e:
         logger.error(f"❌ Error during analysis: {e}")
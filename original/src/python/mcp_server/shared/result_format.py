@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Compact result formats for the MCP query tools.
+
+Rows are encoded one at a time so callers can stop at a byte budget, then the
+encoded rows are assembled into the response. Formats:
+
+    columnar  - {"columns": [...], "rows": [[...], ...]} (column names sent once)
+    json      - {"columns": [...], "results": [{...}, ...]} (one object per row)
+    csv       - header line plus one line per row
+    markdown  - pipe table
+
+Numbers are rounded to RESULT_DECIMAL_PLACES, or further when needed to keep
+RESULT_SIGNIFICANT_DIGITS (so 0.004 stays 0.004), and dates are ISO strings.
+orjson is used for encoding when it is installed.
+
+Shared by the sales_analysis and customer_sales servers, which add this folder
+to sys.path.
+"""
+
+import csv
+import io
+import json
+import math
+import os
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # optional, the standard library encoder is used instead
+    orjson = None
+
+RESULT_FORMATS = ("columnar", "json", "csv", "markdown")
+DEFAULT_RESULT_FORMAT = os.getenv("RESULT_FORMAT", "columnar")
+RESULT_DECIMAL_PLACES = int(os.getenv("RESULT_DECIMAL_PLACES", "2"))
+# Small magnitudes get extra decimal places so they keep this many significant digits
+RESULT_SIGNIFICANT_DIGITS = int(os.getenv("RESULT_SIGNIFICANT_DIGITS", "3"))
+
+
+def dumps(obj: Any) -> str:
+    """Encode JSON compactly, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def normalize_value(value: Any, decimals: int = RESULT_DECIMAL_PLACES) -> Any:
+    """Convert a database value to a JSON-native value, rounding numbers to `decimals` places
+    (more for values too small to keep RESULT_SIGNIFICANT_DIGITS)."""
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, (Decimal, float)):
+        number = float(value)
+        if not math.isfinite(number):
+            return str(value)
+        if number:
+            decimals = max(decimals, RESULT_SIGNIFICANT_DIGITS - 1 - math.floor(math.log10(abs(number))))
+        rounded = round(number, decimals)
+        return int(rounded) if rounded.is_integer() else rounded
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [normalize_value(item, decimals) for item in value]
+    return str(value)
+
+
+class ResultEncoder:
+    """Encodes result rows one at a time in one of RESULT_FORMATS and assembles the response."""
+
+    def __init__(self, columns: List[str], result_format: Optional[str] = None,
+                 decimals: int = RESULT_DECIMAL_PLACES) -> None:
+        result_format = result_format or DEFAULT_RESULT_FORMAT
+        if result_format not in RESULT_FORMATS:
+            raise ValueError(f"Unknown result format '{result_format}'. Valid formats are: {', '.join(RESULT_FORMATS)}")
+        self.columns = columns
+        self.result_format = result_format
+        self.decimals = decimals
+        self._csv_buffer = io.StringIO()
+        self._csv_writer = csv.writer(self._csv_buffer, lineterminator="")
+
+    def encode_row(self, row: Sequence[Any]) -> str:
+        """Encode one row (values in column order)."""
+        values = [normalize_value(value, self.decimals) for value in row]
+        if self.result_format == "columnar":
+            return dumps(values)
+        if self.result_format == "json":
+            return dumps(dict(zip(self.columns, values)))
+        if self.result_format == "csv":
+            return self._csv_line(values)
+        return self._markdown_line(values)
+
+    def render(self, encoded_rows: List[str], meta: Dict[str, Any]) -> str:
+        """Assemble the response from encoded rows and metadata (row_count, truncated, message, ...)."""
+        if self.result_format in ("columnar", "json"):
+            rows_key = "rows" if self.result_format == "columnar" else "results"
+            header = dumps({"columns": self.columns, **meta})
+            return f'{header[:-1]},"{rows_key}":[{",".join(encoded_rows)}]}}'
+
+        if self.result_format == "csv":
+            lines = [self._csv_line(self.columns), *encoded_rows]
+        else:
+            lines = [
+                self._markdown_line(self.columns),
+                "|" + "|".join(" --- " for _ in self.columns) + "|",
+                *encoded_rows,
+            ]
+        notes = "\n".join(f"{key}: {value if isinstance(value, str) else dumps(value)}" for key, value in meta.items())
+        return "\n".join(lines) + "\n\n" + notes
+
+    def _csv_line(self, values: Sequence[Any]) -> str:
+        self._csv_buffer.seek(0)
+        self._csv_buffer.truncate()
+        self._csv_writer.writerow(["" if value is None else value for value in values])
+        return self._csv_buffer.getvalue()
+
+    @staticmethod
+    def _markdown_line(values: Sequence[Any]) -> str:
+        cells = ("" if value is None else str(value).replace("|", "\\|").replace("\n", " ") for value in values)
+        return "| " + " | ".join(cells) + " |"
+
+
+def compare_result_formats(columns: List[str], rows: List[Sequence[Any]], runs: int = 20) -> List[Dict[str, Any]]:
+    """Time each format (and the original indented list-of-dicts JSON) on the same rows.
+
+    Returns one entry per format with the payload size in bytes and the median encode time in ms.
+    """
+    def legacy(rows: List[Sequence[Any]]) -> str:
+        results = [dict(zip(columns, row)) for row in rows]
+        return json.dumps({"results": results, "row_count": len(results), "columns": columns}, indent=2, default=str)
+
+    def encode(result_format: str, rows: List[Sequence[Any]]) -> str:
+        encoder = ResultEncoder(columns, result_format)
+        return encoder.render([encoder.encode_row(row) for row in rows], {"row_count": len(rows)})
+
+    candidates = [("json (indent=2, original)", legacy)]
+    candidates += [(result_format, lambda rows, f=result_format: encode(f, rows)) for result_format in RESULT_FORMATS]
+
+    comparison = []
+    for name, func in candidates:
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            payload = func(rows)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        comparison.append({
+            "format": name,
+            "bytes": len(payload.encode("utf-8")),
+            "median_ms": timings[len(timings) // 2],
+        })
+    return comparison
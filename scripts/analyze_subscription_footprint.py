@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Ditto Subscription Footprint Analyzer
+Measures how many documents and how many bytes each documented Ditto DQL
+subscription pulls onto a device, per store and per time window.
+
+The subscription patterns come from SAMPLE_QUERIES.md and docs/DATA_MODEL.md
+(store inventory, recent orders, multi-collection store manager sync). Each
+one is translated to its equivalent MongoDB filter and evaluated with a
+$bsonSize aggregation, so the numbers reflect real document sizes rather than
+the estimates in the data model docs.
+
+For subscriptions keyed on order_date the analyzer also reports the average
+monthly growth over the 12 complete months before the as-of month and projects
+the footprint forward.
+Anything above the per-device budget is flagged, since oversized subscriptions
+are the main cause of slow initial sync.
+
+Requires MongoDB 4.4+ ($bsonSize).
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+# Colors for terminal output
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+GLOBAL_SCOPE = '*'
+
+# Documented subscriptions and their MongoDB equivalents.
+#   scope:       'store' = evaluated per store_id, 'global' = same for every device
+#   store_field: field holding the store id for 'store' scope
+#   date_field:  ISO-8601 string field used for time windows and growth
+#   window_days: subscription only covers the last N days (None = unbounded)
+SUBSCRIPTIONS = [
+    {
+        'name': 'store_inventory',
+        'dql': "SELECT * FROM inventory WHERE store_id = :storeId AND deleted = false",
+        'collection': 'inventory',
+        'scope': 'store',
+        'store_field': 'store_id',
+        'date_field': None,
+        'window_days': None,
+    },
+    {
+        'name': 'store_orders',
+        'dql': "SELECT * FROM orders WHERE store_id = :storeId",
+        'collection': 'orders',
+        'scope': 'store',
+        'store_field': 'store_id',
+        'date_field': 'order_date',
+        'window_days': None,
+    },
+    {
+        'name': 'store_order_items',
+        'dql': "SELECT * FROM order_items WHERE order_id IN (SELECT order_id FROM orders WHERE store_id = :storeId)",
+        'collection': 'order_items',
+        'scope': 'store',
+        'store_field': 'store_id',  # copied onto each item from its order
+        'date_field': 'order_date',
+        'window_days': None,
+    },
+    {
+        'name': 'store_orders_90d',
+        'dql': "store_id == :storeId && order_date >= :ninetyDaysAgo && deleted == false",
+        'collection': 'orders',
+        'scope': 'store',
+        'store_field': 'store_id',
+        'date_field': 'order_date',
+        'window_days': 90,
+    },
+    {
+        'name': 'recent_orders_30d',
+        'dql': "order_date >= :thirtyDaysAgo && deleted == false",
+        'collection': 'orders',
+        'scope': 'global',
+        'store_field': None,
+        'date_field': 'order_date',
+        'window_days': 30,
+    },
+    {
+        'name': 'store_customers',
+        'dql': "SELECT * FROM customers WHERE primary_store_id = :storeId",
+        'collection': 'customers',
+        'scope': 'store',
+        'store_field': 'primary_store_id',
+        'date_field': None,
+        'window_days': None,
+    },
+    {
+        'name': 'product_catalog',
+        'dql': "SELECT * FROM products WHERE deleted = false",
+        'collection': 'products',
+        'scope': 'global',
+        'store_field': None,
+        'date_field': None,
+        'window_days': None,
+    },
+    {
+        'name': 'categories',
+        'dql': "SELECT * FROM categories WHERE deleted = false",
+        'collection': 'categories',
+        'scope': 'global',
+        'store_field': None,
+        'date_field': None,
+        'window_days': None,
+    },
+]
+
+# Device profiles = the set of subscriptions one device registers together
+DEVICE_PROFILES = {
+    'store_manager': ['store_inventory', 'store_orders', 'store_order_items', 'product_catalog', 'categories'],
+    'store_manager_90d': ['product_catalog', 'store_inventory', 'store_orders_90d'],
+    'worker_app': ['store_inventory', 'store_orders', 'product_catalog'],
+}
+
+
+def build_pipeline(subscription: dict, as_of: datetime, growth_since: datetime) -> list:
+    """Build the $bsonSize aggregation for one subscription, grouped by (store, month, in-window)"""
+    # Line items carry store_id and order_date copied from their order, so every
+    # collection is filtered and grouped on its own fields
+    pipeline = [
+        {'$match': {'deleted': False}},
+        {'$addFields': {'_size': {'$bsonSize': '$$ROOT'}}},
+    ]
+
+    date_field = subscription['date_field']
+    window_days = subscription['window_days']
+    date_path = None
+    in_window = True
+    if date_field:
+        date_path = f'${date_field}'
+        # Documents dated after as_of (including later the same month) are not counted
+        pipeline.append({'$match': {date_field: {'$lte': as_of.isoformat()}}})
+        if window_days is not None:
+            window_start = (as_of - timedelta(days=window_days)).isoformat()
+            # Only the window itself and the growth window are needed
+            lower = min(growth_since.isoformat(), window_start)
+            pipeline.append({'$match': {date_field: {'$gte': lower}}})
+            in_window = {'$gte': [date_path, window_start]}
+
+    store_path = GLOBAL_SCOPE
+    if subscription['scope'] == 'store':
+        store_path = f"${subscription['store_field']}"
+
+    pipeline.append({'$group': {
+        '_id': {
+            'store': store_path,
+            'month': {'$substrBytes': [date_path, 0, 7]} if date_path else None,
+            'in_window': in_window,
+        },
+        'docs': {'$sum': 1},
+        'bytes': {'$sum': '$_size'},
+    }})
+    return pipeline
+
+
+def month_key(dt: datetime) -> str:
+    return dt.strftime('%Y-%m')
+
+
+def months_before(dt: datetime, months: int) -> datetime:
+    """First day of the month that lies `months` calendar months before dt's month"""
+    index = dt.year * 12 + dt.month - 1 - months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def measure_subscription(db, subscription: dict, as_of: datetime, growth_months: int) -> dict:
+    """Return {scope_key: {'docs', 'bytes', 'monthly_docs', 'monthly_bytes'}} for a subscription"""
+    # Growth covers exactly growth_months complete months, ending before the (partial) as-of month
+    growth_since = months_before(as_of, growth_months)
+    pipeline = build_pipeline(subscription, as_of, growth_since)
+    rows = db[subscription['collection']].aggregate(pipeline, allowDiskUse=True)
+
+    growth_start = month_key(growth_since)
+    as_of_month = month_key(as_of)
+
+    results = {}
+    for row in rows:
+        key = row['_id']['store'] or GLOBAL_SCOPE
+        month = row['_id']['month']
+        entry = results.setdefault(key, {'docs': 0, 'bytes': 0, 'growth_docs': 0, 'growth_bytes': 0})
+
+        if row['_id']['in_window']:
+            entry['docs'] += row['docs']
+            entry['bytes'] += row['bytes']
+        if month is not None and growth_start <= month < as_of_month:
+            entry['growth_docs'] += row['docs']
+            entry['growth_bytes'] += row['bytes']
+
+    for entry in results.values():
+        growth_docs = entry.pop('growth_docs')
+        growth_bytes = entry.pop('growth_bytes')
+        if subscription['date_field']:
+            entry['monthly_docs'] = growth_docs / growth_months
+            entry['monthly_bytes'] = growth_bytes / growth_months
+        else:
+            entry['monthly_docs'] = 0.0
+            entry['monthly_bytes'] = 0.0
+    return results
+
+
+def project(subscription: dict, entry: dict, horizon_months: int) -> float:
+    """Projected bytes after horizon_months of growth"""
+    if not subscription['date_field']:
+        return float(entry['bytes'])
+    if subscription['window_days'] is not None:
+        # A sliding window reaches steady state at (monthly rate x window length)
+        steady_state = entry['monthly_bytes'] * subscription['window_days'] / 30
+        return max(float(entry['bytes']), steady_state)
+    return entry['bytes'] + entry['monthly_bytes'] * horizon_months
+
+
+def resolve_as_of(db, as_of_arg):
+    """Use --as-of when given, otherwise the newest order_date (generated data lives in the past)"""
+    if as_of_arg:
+        return datetime.fromisoformat(as_of_arg)
+    latest = db.orders.find_one({'deleted': False}, {'order_date': 1}, sort=[('order_date', -1)])
+    if latest and latest.get('order_date'):
+        return datetime.fromisoformat(latest['order_date'].replace('Z', '')).replace(tzinfo=None)
+    return datetime.now()
+
+
+def format_bytes(num: float) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(num) < 1024:
+            return f"{num:,.1f} {unit}"
+        num /= 1024
+    return f"{num:,.1f} TB"
+
+
+def analyze(db, as_of: datetime, growth_months: int, horizon_months: int, budget_bytes: int) -> dict:
+    """Measure every subscription and device profile and flag budget overruns"""
+    store_ids = [s['store_id'] for s in db.stores.find({'deleted': False}, {'store_id': 1})]
+    report = {
+        'as_of': as_of.isoformat(),
+        'growth_months': growth_months,
+        'horizon_months': horizon_months,
+        'budget_bytes': budget_bytes,
+        'subscriptions': {},
+        'profiles': {},
+    }
+    by_name = {s['name']: s for s in SUBSCRIPTIONS}
+
+    for subscription in SUBSCRIPTIONS:
+        print(f"{BLUE}  Measuring {subscription['name']}...{RESET}")
+        measured = measure_subscription(db, subscription, as_of, growth_months)
+        scopes = store_ids if subscription['scope'] == 'store' else [GLOBAL_SCOPE]
+        per_scope = {}
+        for scope in scopes:
+            entry = measured.get(scope, {'docs': 0, 'bytes': 0, 'monthly_docs': 0.0, 'monthly_bytes': 0.0})
+            entry['projected_bytes'] = project(subscription, entry, horizon_months)
+            entry['over_budget'] = entry['bytes'] > budget_bytes
+            entry['projected_over_budget'] = entry['projected_bytes'] > budget_bytes
+            per_scope[scope] = entry
+        report['subscriptions'][subscription['name']] = {
+            'dql': subscription['dql'],
+            'collection': subscription['collection'],
+            'window_days': subscription['window_days'],
+            'scopes': per_scope,
+        }
+
+    # A device's footprint is the sum of everything it subscribes to
+    for profile, names in DEVICE_PROFILES.items():
+        per_store = {}
+        for store_id in store_ids:
+            total = {'docs': 0, 'bytes': 0, 'projected_bytes': 0.0}
+            for name in names:
+                scopes = report['subscriptions'][name]['scopes']
+                entry = scopes[store_id] if by_name[name]['scope'] == 'store' else scopes[GLOBAL_SCOPE]
+                total['docs'] += entry['docs']
+                total['bytes'] += entry['bytes']
+                total['projected_bytes'] += entry['projected_bytes']
+            total['over_budget'] = total['bytes'] > budget_bytes
+            total['projected_over_budget'] = total['projected_bytes'] > budget_bytes
+            per_store[store_id] = total
+        report['profiles'][profile] = {'subscriptions': names, 'stores': per_store}
+
+    return report
+
+
+def print_report(report: dict):
+    budget = report['budget_bytes']
+    print("\n" + "="*60)
+    print("Subscription Footprint")
+    print("="*60)
+    print(f"As of: {report['as_of']}   Budget/device: {format_bytes(budget)}   "
+          f"Projection: +{report['horizon_months']} months\n")
+
+    for name, sub in report['subscriptions'].items():
+        print(f"{BLUE}{name}{RESET}  ({sub['collection']})")
+        print(f"  {sub['dql']}")
+        print(f"  {'Scope':<22}{'Docs':>10}{'Size':>14}{'Growth/mo':>14}{'Projected':>14}")
+        for scope, entry in sub['scopes'].items():
+            color = RED if entry['over_budget'] else YELLOW if entry['projected_over_budget'] else GREEN
+            label = 'all devices' if scope == GLOBAL_SCOPE else scope
+            print(f"{color}  {label:<22}{entry['docs']:>10,}{format_bytes(entry['bytes']):>14}"
+                  f"{format_bytes(entry['monthly_bytes']):>14}{format_bytes(entry['projected_bytes']):>14}{RESET}")
+        print()
+
+    print("="*60)
+    print("Device Profiles")
+    print("="*60 + "\n")
+
+    flagged = 0
+    for profile, data in report['profiles'].items():
+        print(f"{BLUE}{profile}{RESET}: {', '.join(data['subscriptions'])}")
+        for store_id, total in data['stores'].items():
+            if total['over_budget']:
+                color, marker = RED, '✗ over budget'
+                flagged += 1
+            elif total['projected_over_budget']:
+                color, marker = YELLOW, '⚠ projected over budget'
+                flagged += 1
+            else:
+                color, marker = GREEN, '✓'
+            print(f"{color}  {store_id:<22}{total['docs']:>10,}{format_bytes(total['bytes']):>14}"
+                  f"{format_bytes(total['projected_bytes']):>14}  {marker}{RESET}")
+        print()
+
+    if flagged:
+        print(f"{YELLOW}⚠ {flagged} device footprint(s) exceed or will exceed the budget{RESET}")
+    else:
+        print(f"{GREEN}✓ All device footprints within budget{RESET}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure document count and bytes per Ditto subscription')
+    parser.add_argument('--budget-mb', type=float, default=float(os.getenv('DEVICE_SYNC_BUDGET_MB', '25')),
+                        help='Per-device sync budget in MB (default: 25)')
+    parser.add_argument('--as-of', type=str, default=None,
+                        help='Reference date for time windows, YYYY-MM-DD (default: newest order_date)')
+    parser.add_argument('--growth-months', type=int, default=12,
+                        help='Complete months before the as-of month used to compute growth rate (default: 12)')
+    parser.add_argument('--horizon-months', type=int, default=12,
+                        help='Months to project growth forward (default: 12)')
+    parser.add_argument('--json', type=Path, default=None,
+                        help='Also write the full report as JSON to this path')
+    args = parser.parse_args()
+    if args.growth_months < 1:
+        parser.error("--growth-months must be at least 1")
+
+    print("\n" + "="*60)
+    print("Ditto Subscription Footprint Analyzer")
+    print("="*60 + "\n")
+
+    # Load environment variables
+    env_path = Path(__file__).parent.parent / '.env'
+    load_dotenv(env_path)
+
+    connection_string = os.getenv('MONGODB_CONNECTION_STRING')
+    database_name = os.getenv('MONGODB_DATABASE', 'retail-demo')
+
+    if not connection_string:
+        print(f"{RED}✗ MONGODB_CONNECTION_STRING not found in .env{RESET}")
+        sys.exit(1)
+
+    print(f"{BLUE}ℹ Connecting to MongoDB...{RESET}")
+    client = MongoClient(connection_string)
+    db = client[database_name]
+
+    print(f"{GREEN}✓ Connected to database: {database_name}{RESET}\n")
+
+    try:
+        as_of = resolve_as_of(db, args.as_of)
+        budget_bytes = int(args.budget_mb * 1024 * 1024)
+        report = analyze(db, as_of, args.growth_months, args.horizon_months, budget_bytes)
+        print_report(report)
+
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"\n{GREEN}✓ JSON report written to: {args.json}{RESET}")
+
+        print("\n" + "="*60 + "\n")
+
+    except Exception as e:
+        print(f"\n{RED}✗ Error analyzing subscriptions: {e}{RESET}")
+        sys.exit(1)
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
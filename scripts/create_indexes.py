@@ -5,11 +5,14 @@ Creates all necessary indexes for optimal query performance
 """
 
 import os
+from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 from pymongo import MongoClient, ASCENDING, DESCENDING, TEXT
 import sys
 
+from sharding import SHARDED_COLLECTIONS, chunk_distribution, setup_sharded_collections
+
 # Colors for terminal output
 GREEN = '\033[92m'
 RED = '\033[91m'
@@ -28,6 +31,8 @@ def main():
 
     connection_string = os.getenv('MONGODB_CONNECTION_STRING')
     database_name = os.getenv('MONGODB_DATABASE', 'retail-demo')
+    sharded = os.getenv('MONGODB_SHARDED', 'false').lower() == 'true'
+    shard_key = os.getenv('MONGODB_SHARD_KEY', 'hashed')
 
     if not connection_string:
         print(f"{RED}✗ MONGODB_CONNECTION_STRING not found in .env{RESET}")
@@ -40,6 +45,17 @@ def main():
     print(f"{GREEN}✓ Connected to database: {database_name}{RESET}\n")
 
     try:
+        # ===================================================================
+        # 0. SHARDING (orders / order_items, before any data is loaded)
+        # ===================================================================
+        if sharded:
+            print(f"{BLUE}Sharding 'orders' and 'order_items' ({shard_key} shard key)...{RESET}")
+            store_ids = [s['store_id'] for s in db.stores.find({}, {'store_id': 1})]
+            start_date = datetime.strptime(os.getenv('START_DATE', '2022-12-09'), '%Y-%m-%d')
+            end_date = datetime.strptime(os.getenv('END_DATE', '2025-12-09'), '%Y-%m-%d')
+            setup_sharded_collections(client, database_name, shard_key, store_ids, start_date, end_date)
+            print(f"{GREEN}✓ sharded collections ready{RESET}\n")
+
         # ===================================================================
         # 1. STORES Collection
         # ===================================================================
@@ -117,7 +133,8 @@ def main():
         # 7. ORDERS Collection
         # ===================================================================
         print(f"{BLUE}Creating indexes for 'orders' collection...{RESET}")
-        db.orders.create_index([("order_id", ASCENDING)], unique=True, name="idx_order_id")
+        # Unique indexes must be prefixed by the shard key, so order_id is only unique unsharded
+        db.orders.create_index([("order_id", ASCENDING)], unique=not sharded, name="idx_order_id")
         db.orders.create_index([("customer_id", ASCENDING)], name="idx_customer_id")
         db.orders.create_index([("store_id", ASCENDING)], name="idx_store_id")
         db.orders.create_index([("order_date", DESCENDING)], name="idx_order_date_desc")
@@ -140,6 +157,8 @@ def main():
 
         # Compound index for order + product lookups
         db.order_items.create_index([("order_id", ASCENDING), ("product_id", ASCENDING)], name="idx_order_product")
+        # Compound index for recent items of a store (export_store_snapshots.py)
+        db.order_items.create_index([("store_id", ASCENDING), ("order_date", DESCENDING)], name="idx_store_items")
         print(f"{GREEN}✓ order_items indexes created{RESET}\n")
 
         # ===================================================================
@@ -163,6 +182,14 @@ def main():
                 print(f"  - {idx.get('name', 'unnamed')}: {{ {keys} }}")
             print()
 
+        if sharded:
+            print(f"{BLUE}Chunk distribution:{RESET}")
+            for coll_name in SHARDED_COLLECTIONS:
+                distribution = chunk_distribution(client, database_name, coll_name)
+                chunks = ', '.join(f"{shard}: {count}" for shard, count in sorted(distribution.items()))
+                print(f"  {coll_name}: {chunks or 'not sharded'}")
+            print()
+
         print("="*60)
         print(f"{GREEN}All indexes created successfully!{RESET}")
         print("="*60 + "\n")
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Per-Store Edge Bootstrap Snapshot Exporter
+Builds one compressed snapshot bundle per store so fresh POS / worker devices
+can bulk-load their subset locally and then sync only the deltas through Ditto.
+
+Each bundle contains (for a single store):
+- inventory for the store
+- products stocked by the store, and all categories
+- orders from the last N days, plus their order_items
+- customers whose primary_store_id is the store
+
+Every collection is read with ONE streaming cursor and fanned out by store_id,
+instead of running one query per store. A change stream resume token (or a
+timestamp, when change streams are unavailable) is captured BEFORE the export
+starts and written to each manifest so devices know where delta sync begins.
+
+Output layout:
+    snapshots/<snapshot_id>/<store_id>/<collection>.jsonl.gz
+    snapshots/<snapshot_id>/<store_id>/manifest.json
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytz
+from bson import json_util
+from dotenv import load_dotenv
+from pymongo import MongoClient
+from pymongo.errors import OperationFailure
+
+# Colors for terminal output
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+DEFAULT_OUTPUT_DIR = Path(__file__).parent.parent / 'snapshots'
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Cursor batch size for the streaming passes (documents per getMore)
+CURSOR_BATCH_SIZE = 5000
+
+
+class StoreBundleWriter:
+    """Writes gzip-compressed JSON Lines files for one store's snapshot bundle"""
+
+    def __init__(self, store_dir: Path):
+        self.store_dir = store_dir
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.handles = {}
+        self.files = {}
+
+    def open(self, collection_name: str):
+        path = self.store_dir / f"{collection_name}.jsonl.gz"
+        self.handles[collection_name] = gzip.open(path, 'wt', encoding='utf-8', compresslevel=6)
+        self.files[collection_name] = {'file': path.name, 'documents': 0}
+
+    def write(self, collection_name: str, doc: dict):
+        self.handles[collection_name].write(json_util.dumps(doc))
+        self.handles[collection_name].write('\n')
+        self.files[collection_name]['documents'] += 1
+
+    def close(self, collection_name: str):
+        self.handles.pop(collection_name).close()
+        entry = self.files[collection_name]
+        path = self.store_dir / entry['file']
+        entry['bytes'] = path.stat().st_size
+        entry['sha256'] = file_sha256(path)
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of a file (lets devices verify a download)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def capture_sync_checkpoint(client, db):
+    """
+    Capture the point devices should resume delta sync from.
+
+    Prefers a change stream resume token on the database; falls back to the
+    cluster time / wall clock when change streams are not available
+    (e.g. a standalone local mongod).
+    """
+    checkpoint = {'captured_at': datetime.now(pytz.UTC).isoformat()}
+    try:
+        with db.watch(max_await_time_ms=1) as stream:
+            stream.try_next()
+            checkpoint['resume_token'] = json.loads(json_util.dumps(stream.resume_token))
+    except OperationFailure as e:
+        print(f"{YELLOW}  ⚠ Change streams unavailable ({e.code}), using timestamp checkpoint{RESET}")
+        checkpoint['resume_token'] = None
+
+    try:
+        hello = client.admin.command('hello')
+        cluster_time = hello.get('$clusterTime', {}).get('clusterTime')
+        if cluster_time is not None:
+            checkpoint['cluster_time'] = {'t': cluster_time.time, 'i': cluster_time.inc}
+    except OperationFailure:
+        pass
+
+    return checkpoint
+
+
+def stream_collection(db, collection_name: str, query: dict, writers: dict, route, label: str):
+    """
+    Run ONE streaming pass over a collection and fan each document out to the
+    bundle(s) it belongs to.
+
+    route(doc) returns an iterable of store_ids the document should be written to.
+    """
+    for writer in writers.values():
+        writer.open(collection_name)
+
+    scanned = 0
+    written = 0
+    cursor = db[collection_name].find(query, batch_size=CURSOR_BATCH_SIZE)
+    try:
+        for doc in cursor:
+            scanned += 1
+            for store_id in route(doc):
+                writer = writers.get(store_id)
+                if writer is not None:
+                    writer.write(collection_name, doc)
+                    written += 1
+    finally:
+        cursor.close()
+
+    for writer in writers.values():
+        writer.close(collection_name)
+
+    print(f"{GREEN}  ✓ {label}: scanned {scanned:,}, wrote {written:,}{RESET}")
+    return scanned, written
+
+
+def export_snapshots(db, client, output_dir: Path, days: int, store_filter=None):
+    """Export per-store snapshot bundles and return the snapshot directory"""
+    stores = list(db.stores.find({'deleted': False}, {'store_id': 1, 'store_name': 1}))
+    if store_filter:
+        stores = [s for s in stores if s['store_id'] in store_filter]
+    if not stores:
+        print(f"{RED}✗ No matching stores found{RESET}")
+        return None
+
+    now = datetime.now(pytz.UTC)
+    snapshot_id = now.strftime('%Y%m%dT%H%M%SZ')
+    snapshot_dir = output_dir / snapshot_id
+    cutoff = (now - timedelta(days=days)).replace(tzinfo=None).isoformat()
+
+    print(f"{BLUE}ℹ Capturing sync checkpoint...{RESET}")
+    checkpoint = capture_sync_checkpoint(client, db)
+
+    writers = {s['store_id']: StoreBundleWriter(snapshot_dir / s['store_id']) for s in stores}
+    all_store_ids = list(writers.keys())
+
+    # Per-store state gathered during earlier passes and reused by later ones
+    store_products = {store_id: set() for store_id in all_store_ids}
+    order_store = {}  # order_id -> store_id (recent orders only)
+
+    print(f"\n{BLUE}Streaming collections (one pass each)...{RESET}")
+
+    # 1. Inventory: route by store_id, remember which products each store stocks
+    def route_inventory(doc):
+        store_id = doc.get('store_id')
+        if store_id in store_products:
+            store_products[store_id].add(doc.get('product_id'))
+        return (store_id,)
+
+    stream_collection(db, 'inventory', {'deleted': False}, writers, route_inventory, 'inventory')
+
+    # 2. Products: fan out to every store that stocks the product
+    product_stores = {}
+    for store_id, product_ids in store_products.items():
+        for product_id in product_ids:
+            product_stores.setdefault(product_id, []).append(store_id)
+
+    stream_collection(db, 'products', {'deleted': False}, writers,
+                      lambda doc: product_stores.get(doc.get('product_id'), ()), 'products')
+
+    # 3. Categories: small reference set, every store gets all of them
+    stream_collection(db, 'categories', {'deleted': False}, writers,
+                      lambda doc: all_store_ids, 'categories')
+
+    # 4. Customers: route by primary store assignment
+    stream_collection(db, 'customers', {'deleted': False}, writers,
+                      lambda doc: (doc.get('primary_store_id'),), 'customers')
+
+    # 5. Recent orders: route by store_id, remember order -> store for the items pass
+    def route_order(doc):
+        order_store[doc['order_id']] = doc.get('store_id')
+        return (doc.get('store_id'),)
+
+    recent = {'deleted': False, 'order_date': {'$gte': cutoff}, 'store_id': {'$in': all_store_ids}}
+    stream_collection(db, 'orders', recent, writers, route_order, f'orders (last {days} days)')
+
+    # 6. Order items: items carry their order's store_id and order_date, so the same filter selects
+    #    them server-side; routing through the recent-orders map keeps only items of exported orders
+    stream_collection(db, 'order_items', recent, writers,
+                      lambda doc: (order_store.get(doc.get('order_id')),), 'order_items')
+
+    # Manifests
+    for store in stores:
+        writer = writers[store['store_id']]
+        manifest = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'snapshot_id': snapshot_id,
+            'database': db.name,
+            'store_id': store['store_id'],
+            'store_name': store.get('store_name'),
+            'generated_at': now.isoformat(),
+            'orders_since': cutoff,
+            'order_window_days': days,
+            'checkpoint': checkpoint,
+            'collections': writer.files,
+        }
+        with open(writer.store_dir / 'manifest.json', 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    return snapshot_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export per-store bootstrap snapshots for offline devices')
+    parser.add_argument('--days', type=int, default=int(os.getenv('SNAPSHOT_ORDER_DAYS', '90')),
+                        help='Include orders from the last N days (default: 90)')
+    parser.add_argument('--output-dir', type=Path, default=DEFAULT_OUTPUT_DIR,
+                        help=f'Directory to write snapshots to (default: {DEFAULT_OUTPUT_DIR})')
+    parser.add_argument('--stores', nargs='*', default=None,
+                        help='Only export these store_ids (default: all stores)')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("Export Per-Store Bootstrap Snapshots")
+    print("="*60 + "\n")
+
+    # Load environment variables
+    env_path = Path(__file__).parent.parent / '.env'
+    load_dotenv(env_path)
+
+    connection_string = os.getenv('MONGODB_CONNECTION_STRING')
+    database_name = os.getenv('MONGODB_DATABASE', 'retail-demo')
+
+    if not connection_string:
+        print(f"{RED}✗ MONGODB_CONNECTION_STRING not found in .env{RESET}")
+        sys.exit(1)
+
+    print(f"{BLUE}ℹ Connecting to MongoDB...{RESET}")
+    client = MongoClient(connection_string)
+    db = client[database_name]
+
+    print(f"{GREEN}✓ Connected to database: {database_name}{RESET}\n")
+
+    try:
+        started = datetime.now()
+        snapshot_dir = export_snapshots(db, client, args.output_dir, args.days, args.stores)
+        if snapshot_dir is None:
+            sys.exit(1)
+        elapsed = (datetime.now() - started).total_seconds()
+
+        print("\n" + "="*60)
+        print("Snapshot Summary")
+        print("="*60 + "\n")
+
+        for manifest_path in sorted(snapshot_dir.glob('*/manifest.json')):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            total_bytes = sum(c['bytes'] for c in manifest['collections'].values())
+            counts = ', '.join(f"{name}: {c['documents']:,}" for name, c in manifest['collections'].items())
+            print(f"{GREEN}{manifest['store_id']}{RESET} ({total_bytes / 1024:,.1f} KB compressed)")
+            print(f"  {counts}")
+
+        print(f"\n{GREEN}✓ Snapshots written to: {snapshot_dir}{RESET}")
+        print(f"{GREEN}✓ Completed in {elapsed:.1f}s{RESET}")
+        print("="*60 + "\n")
+
+    except Exception as e:
+        print(f"\n{RED}✗ Error exporting snapshots: {e}{RESET}")
+        sys.exit(1)
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
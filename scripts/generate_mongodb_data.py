@@ -15,6 +15,10 @@ All data is CRDT-friendly:
 - UUID-based IDs for offline generation
 - Soft deletes (deleted: false)
 - Separate collections (no embedded arrays)
+
+Sharded clusters (MONGODB_SHARDED=true):
+- orders and order_items are sharded and pre-split before the load (see sharding.py)
+- each insert batch is grouped by the shard that owns its chunk
 """
 
 import asyncio
@@ -24,6 +28,7 @@ import os
 import random
 import sys
 import uuid
+from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -31,8 +36,11 @@ from typing import Dict, List, Tuple
 from dotenv import load_dotenv
 from faker import Faker
 from motor import motor_asyncio
+from pymongo import MongoClient
 import pytz
 
+from sharding import chunk_distribution, load_shard_router, setup_sharded_collections
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -57,6 +65,10 @@ NUM_ORDERS = int(os.getenv('NUM_ORDERS', '100000'))
 START_DATE = datetime.strptime(os.getenv('START_DATE', '2022-12-09'), '%Y-%m-%d')
 END_DATE = datetime.strptime(os.getenv('END_DATE', '2025-12-09'), '%Y-%m-%d')
 
+# Sharded cluster settings (hashed = store_id + hashed order_id, date = ranged order_date)
+MONGODB_SHARDED = os.getenv('MONGODB_SHARDED', 'false').lower() == 'true'
+MONGODB_SHARD_KEY = os.getenv('MONGODB_SHARD_KEY', 'hashed')
+
 # Paths to original data files
 DATA_DIR = Path(__file__).parent.parent / 'original' / 'data' / 'database'
 REFERENCE_DATA_PATH = DATA_DIR / 'reference_data.json'
@@ -76,6 +88,10 @@ class MongoDBDataGenerator:
         self.product_ids = {}  # sku -> product_id
         self.customer_ids = []  # list of customer_ids
 
+        # Shard routing for orders/order_items (None when not sharded)
+        self.order_router = None
+        self.shard_batches = Counter()  # shard -> insert batches
+
     async def connect(self):
         """Connect to MongoDB"""
         try:
@@ -349,12 +365,39 @@ class MongoDBDataGenerator:
         logger.info(f"✓ Inserted {len(inventory):,} inventory records")
         return len(inventory)
 
+    async def prepare_sharding(self):
+        """Declare shard keys and pre-split orders/order_items before the load"""
+        logger.info(f"\n🧩 Preparing sharded collections ({MONGODB_SHARD_KEY} shard key)...")
+
+        # Admin commands and config reads use a synchronous client off the event loop
+        sync_client = MongoClient(MONGODB_CONNECTION_STRING)
+        try:
+            await asyncio.to_thread(
+                setup_sharded_collections, sync_client, MONGODB_DATABASE, MONGODB_SHARD_KEY,
+                list(self.store_ids.values()), START_DATE, END_DATE, logger.info
+            )
+            self.order_router = await asyncio.to_thread(load_shard_router, sync_client, MONGODB_DATABASE, 'orders')
+            for coll_name in ('orders', 'order_items'):
+                distribution = await asyncio.to_thread(chunk_distribution, sync_client, MONGODB_DATABASE, coll_name)
+                logger.info(f"  ✓ {coll_name} chunks: {dict(sorted(distribution.items()))}")
+        finally:
+            sync_client.close()
+
+    async def insert_order_batch(self, shard, orders, order_items):
+        """Insert one batch of orders and their items (all owned by the same shard when sharded)"""
+        await self.db.orders.insert_many(orders, ordered=False)
+        await self.db.order_items.insert_many(order_items, ordered=False)
+        if shard is not None:
+            self.shard_batches[shard] += 1
+
     async def generate_orders_and_items(self):
         """Generate orders and order_items with seasonal patterns"""
         logger.info(f"\n🛒 Generating {NUM_ORDERS:,} orders with seasonal patterns...")
 
-        orders = []
-        order_items = []
+        # Pending batches keyed by owning shard (single None key when not sharded)
+        pending = {}
+        inserted_orders = 0
+        inserted_items = 0
         batch_size = 1000
 
         # Get year weights for growth
@@ -417,6 +460,9 @@ class MongoDBDataGenerator:
                     '_id': item_id,
                     'order_id': order_id,
                     'product_id': product_id,
+                    # Copied from the order so items share its shard key
+                    'store_id': store_id,
+                    'order_date': order_date.isoformat(),
                     'sku': f"SKU_{product_id}",  # Simplified
                     'product_name': f"Product {product_id}",  # Simplified
                     'quantity': quantity,
@@ -450,23 +496,28 @@ class MongoDBDataGenerator:
                 'deleted': False
             }
 
+            shard = self.order_router.shard_for(order_doc) if self.order_router else None
+            orders, order_items = pending.setdefault(shard, ([], []))
             orders.append(order_doc)
             order_items.extend(order_items_list)
 
-            # Insert in batches
+            # Insert in batches (per shard, so a batch never scatters across shards)
             if len(orders) >= batch_size:
-                await self.db.orders.insert_many(orders)
-                await self.db.order_items.insert_many(order_items)
-                logger.info(f"  ✓ Inserted batch: {len(orders):,} orders, {len(order_items):,} items")
-                orders = []
-                order_items = []
+                await self.insert_order_batch(shard, orders, order_items)
+                inserted_orders += len(orders)
+                inserted_items += len(order_items)
+                logger.info(f"  ✓ Inserted batch{f' [{shard}]' if shard else ''}: "
+                            f"{inserted_orders:,} orders, {inserted_items:,} items")
+                pending[shard] = ([], [])
 
         # Insert remaining
-        if orders:
-            await self.db.orders.insert_many(orders)
-            await self.db.order_items.insert_many(order_items)
+        for shard, (orders, order_items) in pending.items():
+            if orders:
+                await self.insert_order_batch(shard, orders, order_items)
 
         logger.info(f"✓ Inserted {NUM_ORDERS:,} orders with items")
+        if self.shard_batches:
+            logger.info(f"  Batches per shard: {dict(sorted(self.shard_batches.items()))}")
         return NUM_ORDERS
 
     async def run(self):
@@ -499,6 +550,10 @@ class MongoDBDataGenerator:
         # Generate inventory with location tracking
         await self.generate_inventory()
 
+        # Shard and pre-split orders/order_items before loading them
+        if MONGODB_SHARDED:
+            await self.prepare_sharding()
+
         # Generate orders and order items
         await self.generate_orders_and_items()
 
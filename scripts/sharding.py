@@ -0,0 +1,227 @@
+"""
+Sharded-Cluster Helpers for MongoDB
+Shared by generate_mongodb_data.py and create_indexes.py when MONGODB_SHARDED=true
+
+Shard key strategies (MONGODB_SHARD_KEY):
+- hashed: { store_id: 1, order_id: "hashed" }
+    One zone per shard, stores assigned round-robin, chunks pre-split inside
+    each zone with presplitHashedZones. A store's orders and order_items live
+    on the same shard and writes for one store never scatter.
+- date:   { order_date: 1, order_id: 1 }
+    Ranged key. The generation window is pre-split at month boundaries and
+    contiguous month blocks are moved to each shard, so year/month range
+    queries touch as few shards as possible.
+
+Both orders and order_items use the same key (order_items carry store_id and
+order_date for this), so a line item is always co-located with its order.
+
+Requires MongoDB 4.4+ and a connection to mongos.
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+
+from bson.max_key import MaxKey
+from bson.min_key import MinKey
+
+SHARDED_COLLECTIONS = ['orders', 'order_items']
+
+SHARD_KEYS = {
+    'hashed': {'store_id': 1, 'order_id': 'hashed'},
+    'date': {'order_date': 1, 'order_id': 1},
+}
+
+
+def get_shard_key(strategy: str) -> dict:
+    """Return the shard key document for a strategy"""
+    if strategy not in SHARD_KEYS:
+        raise ValueError(f"Unknown shard key strategy '{strategy}' (expected one of: {', '.join(SHARD_KEYS)})")
+    return SHARD_KEYS[strategy]
+
+
+def list_shards(client) -> list:
+    """Return shard names, raising if not connected to mongos"""
+    try:
+        result = client.admin.command('listShards')
+    except Exception as e:
+        raise RuntimeError(f"Not connected to a sharded cluster (mongos required): {e}") from e
+    return [shard['_id'] for shard in result['shards']]
+
+
+def is_sharded(client, namespace: str) -> bool:
+    """Check config.collections for an existing sharded namespace"""
+    doc = client.config.collections.find_one({'_id': namespace})
+    return bool(doc) and not doc.get('dropped', False)
+
+
+def month_boundaries(start_date: datetime, end_date: datetime) -> list:
+    """ISO strings for the first day of each month strictly inside (start_date, end_date]"""
+    boundaries = []
+    year, month = start_date.year, start_date.month
+    while True:
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+        boundary = datetime(year, month, 1)
+        if boundary > end_date:
+            break
+        boundaries.append(boundary.isoformat())
+    return boundaries
+
+
+def _setup_hashed(client, namespace: str, key: dict, shards: list, store_ids: list, log):
+    """Zone per shard, one key range per store, then presplit hashed chunks inside each zone"""
+    admin = client.admin
+    for shard in shards:
+        admin.command('addShardToZone', shard, zone=f"zava_{shard}")
+
+    for i, store_id in enumerate(sorted(store_ids)):
+        shard = shards[i % len(shards)]
+        admin.command(
+            'updateZoneKeyRange', namespace,
+            min={'store_id': store_id, 'order_id': MinKey()},
+            max={'store_id': store_id, 'order_id': MaxKey()},
+            zone=f"zava_{shard}",
+        )
+        log(f"    {store_id} → {shard}")
+
+    admin.command('shardCollection', namespace, key=key, presplitHashedZones=True)
+
+
+def _setup_date(client, namespace: str, key: dict, shards: list, start_date: datetime, end_date: datetime, log):
+    """Split at month boundaries and move contiguous month blocks to each shard"""
+    admin = client.admin
+    admin.command('shardCollection', namespace, key=key)
+
+    boundaries = month_boundaries(start_date, end_date)
+    for boundary in boundaries:
+        admin.command('split', namespace, middle={'order_date': boundary, 'order_id': MinKey()})
+
+    # Chunk i covers [lowers[i], lowers[i + 1]); first and last chunks are open-ended
+    lowers = [{'order_date': MinKey(), 'order_id': MinKey()}]
+    lowers += [{'order_date': b, 'order_id': MinKey()} for b in boundaries]
+    uppers = lowers[1:] + [{'order_date': MaxKey(), 'order_id': MaxKey()}]
+
+    per_shard = -(-len(lowers) // len(shards))  # ceil division
+    for i, (lower, upper) in enumerate(zip(lowers, uppers)):
+        target = shards[min(i // per_shard, len(shards) - 1)]
+        try:
+            admin.command('moveChunk', namespace, bounds=[lower, upper], to=target)
+        except Exception as e:
+            # Already on the target shard
+            if 'already' not in str(e).lower():
+                raise
+    log(f"    {len(lowers)} month chunks over {len(shards)} shards (~{per_shard} per shard)")
+
+
+def setup_sharded_collections(client, database_name: str, strategy: str, store_ids: list,
+                              start_date: datetime, end_date: datetime, log=print) -> bool:
+    """
+    Enable sharding, declare shard keys and pre-split/distribute chunks for
+    orders and order_items. Must run while the collections are empty.
+
+    Idempotent: collections that are already sharded are left untouched.
+    """
+    key = get_shard_key(strategy)
+    shards = list_shards(client)
+    log(f"  Sharded cluster: {len(shards)} shard(s): {', '.join(shards)}")
+
+    try:
+        client.admin.command('enableSharding', database_name)
+    except Exception as e:
+        # MongoDB 6.0+ no longer needs (or always accepts) enableSharding
+        if 'already' not in str(e).lower():
+            raise
+
+    for collection_name in SHARDED_COLLECTIONS:
+        namespace = f"{database_name}.{collection_name}"
+        if is_sharded(client, namespace):
+            log(f"  {namespace} already sharded, skipping")
+            continue
+
+        if client[database_name][collection_name].estimated_document_count() > 0:
+            raise RuntimeError(f"{namespace} must be empty before pre-splitting (run clear_mongodb_data.py)")
+
+        log(f"  Sharding {namespace} on {key} ({strategy})")
+        if strategy == 'hashed':
+            _setup_hashed(client, namespace, key, shards, store_ids, log)
+        else:
+            _setup_date(client, namespace, key, shards, start_date, end_date, log)
+
+    return True
+
+
+class ShardRouter:
+    """
+    Client-side map from a document to the shard that owns its chunk.
+
+    Built from config.chunks and keyed on the FIRST shard key field only
+    (store_id or order_date), which is enough to pick the owning shard for
+    both strategies above. It is a batching hint: mongos still routes every
+    write, so a stale map costs performance, never correctness.
+    """
+
+    def __init__(self, field: str, lowers: list, shards: list, default_shard: str):
+        self.field = field
+        self.lowers = lowers
+        self.shards = shards
+        self.default_shard = default_shard
+
+    def shard_for(self, doc: dict) -> str:
+        value = doc.get(self.field)
+        if value is None:
+            return self.default_shard
+        idx = bisect_right(self.lowers, value) - 1
+        return self.shards[idx] if idx >= 0 else self.default_shard
+
+
+def _chunk_query(coll_doc: dict, namespace: str) -> dict:
+    """config.chunks filter: MongoDB 5.0+ keys chunks by collection uuid, older versions by ns"""
+    if 'uuid' in coll_doc:
+        return {'$or': [{'uuid': coll_doc['uuid']}, {'ns': namespace}]}
+    return {'ns': namespace}
+
+
+def load_shard_router(client, database_name: str, collection_name: str):
+    """Build a ShardRouter for a sharded collection, or None if it is not sharded"""
+    namespace = f"{database_name}.{collection_name}"
+    coll_doc = client.config.collections.find_one({'_id': namespace})
+    if not coll_doc or coll_doc.get('dropped', False):
+        return None
+
+    field = next(iter(coll_doc['key']))
+    chunks = list(client.config.chunks.find(_chunk_query(coll_doc, namespace), {'min': 1, 'max': 1, 'shard': 1}))
+    if not chunks:
+        return None
+
+    default_shard = chunks[0]['shard']
+    owners = {}
+    for chunk in chunks:
+        value = chunk['min'][field]
+        if isinstance(value, (MinKey, MaxKey)):
+            if isinstance(value, MinKey):
+                default_shard = chunk['shard']
+            continue
+        # Several chunks can share the same first-field lower bound (hashed
+        # chunks inside one store); prefer one that stays inside that value
+        inside = chunk['max'][field] == value
+        if value not in owners or (inside and not owners[value][1]):
+            owners[value] = (chunk['shard'], inside)
+
+    lowers = sorted(owners)
+    return ShardRouter(field, lowers, [owners[v][0] for v in lowers], default_shard)
+
+
+def chunk_distribution(client, database_name: str, collection_name: str) -> dict:
+    """Return {shard: chunk_count} for a sharded collection"""
+    namespace = f"{database_name}.{collection_name}"
+    coll_doc = client.config.collections.find_one({'_id': namespace})
+    if not coll_doc:
+        return {}
+    distribution = {}
+    for row in client.config.chunks.aggregate([
+        {'$match': _chunk_query(coll_doc, namespace)},
+        {'$group': {'_id': '$shard', 'chunks': {'$sum': 1}}},
+    ]):
+        distribution[row['_id']] = row['chunks']
+    return distribution